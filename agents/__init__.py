@@ -14,8 +14,16 @@ Agents are designed to be:
 The shared module provides common utilities, schemas, and helper functions used across agents.
 """
 
-# Import shared modules for easier access
-from .shared import schemas, utils
+import importlib
+
+
+# Shared modules are available as attributes for easier access, but are only
+# imported when first used
+def __getattr__(name):
+    if name in ("schemas", "utils"):
+        return importlib.import_module(f".shared.{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Import agent modules
 try:
@@ -0,0 +1,20 @@
+"""
+Exceptions raised by agents in the WordPress Content Generator pipeline.
+
+Agents raise these instead of exiting the process, so a caller running many
+content pieces (the orchestrator, or an agent's own batch loop) can record a
+failure for one piece and carry on with the rest. Command-line entry points
+catch them, print the message and exit with a non-zero status.
+"""
+
+
+class AgentError(Exception):
+    """Base class for errors raised by agents."""
+
+
+class AgentDataError(AgentError, ValueError):
+    """Required data (a content piece, plan, keywords...) is missing or invalid."""
+
+
+class AgentConfigError(AgentError, EnvironmentError):
+    """The agent is misconfigured, e.g. a required environment variable is unset."""
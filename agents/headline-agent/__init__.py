@@ -5,6 +5,7 @@ from .index import (
     validate,
     generate_headline_options,
     score_headline,
+    score_headlines,
     select_best_headline,
 )
 
@@ -13,5 +14,6 @@ __all__ = [
     "validate",
     "generate_headline_options",
     "score_headline",
+    "score_headlines",
     "select_best_headline",
 ]
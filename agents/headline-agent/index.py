@@ -15,15 +15,22 @@ Output fields:
 
 from __future__ import annotations
 
-import logging
+import re
 from typing import Any, Dict, List
 
-from ..shared.utils import format_agent_response, log_agent_error
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
-logger = logging.getLogger("headline-agent")
-logging.basicConfig(level=logging.INFO)
+from ..shared.utils import format_agent_response, get_logger, log_agent_error
+
+logger = get_logger("headline-agent")
 
 CLICKABLE_WORDS = {"how", "why", "top", "best", "easy", "guide", "tips", "tricks"}
+_CLICKABLE_RE = re.compile(
+    r"\b(" + "|".join(sorted(CLICKABLE_WORDS)) + r")\b", re.IGNORECASE
+)
 
 
 def validate(input_data: Dict[str, Any]) -> bool:
@@ -55,28 +62,55 @@ def generate_headline_options(seed_title: str, focus_keyword: str) -> List[str]:
     ]
 
 
-def score_headline(headline: str, focus_keyword: str) -> int:
-    """Score a headline for clickability and SEO."""
-    score = 0
-    if focus_keyword.lower() in headline.lower():
-        score += 2
-    words = headline.split()
-    if 6 <= len(words) <= 12:
-        score += 2
-    elif 4 <= len(words) <= 14:
-        score += 1
-    if any(word in headline.lower() for word in CLICKABLE_WORDS):
+def _score(headline: str, keyword_lower: str) -> int:
+    """Score a headline against an already-lowercased focus keyword."""
+    low = headline.lower()
+    words = low.split()
+    n = len(words)
+    score = 2 if keyword_lower in low else 0
+    score += 2 if 6 <= n <= 12 else 1 if 4 <= n <= 14 else 0
+    if _CLICKABLE_RE.search(low):
         score += 1
     if "?" in headline or "!" in headline:
         score += 1
     return score
 
 
+def score_headline(headline: str, focus_keyword: str) -> int:
+    """Score a headline for clickability and SEO."""
+    return _score(headline, focus_keyword.lower())
+
+
+def score_headlines(candidates: List[str], focus_keyword: str) -> List[int]:
+    """Score many headlines at once using NumPy array arithmetic.
+
+    Produces the same scores as :func:`score_headline` but amortizes the
+    Python overhead across the whole candidate pool. Falls back to scoring
+    one headline at a time when NumPy is not installed.
+    """
+    keyword_lower = focus_keyword.lower()
+    if np is None:
+        return [_score(h, keyword_lower) for h in candidates]
+
+    count = len(candidates)
+    lengths = np.fromiter((len(h.split()) for h in candidates), dtype=np.int16, count=count)
+    kw_mask = np.fromiter((keyword_lower in h.lower() for h in candidates), dtype=bool, count=count)
+    click_mask = np.fromiter(
+        (_CLICKABLE_RE.search(h) is not None for h in candidates), dtype=bool, count=count
+    )
+    punct_mask = np.fromiter(("?" in h or "!" in h for h in candidates), dtype=bool, count=count)
+
+    length_score = np.where(
+        (lengths >= 6) & (lengths <= 12), 2, np.where((lengths >= 4) & (lengths <= 14), 1, 0)
+    )
+    scores = 2 * kw_mask + length_score + click_mask + punct_mask
+    return scores.tolist()
+
+
 def select_best_headline(options: List[str], focus_keyword: str) -> str:
     """Select the headline with the highest score."""
-    scored = [(score_headline(opt, focus_keyword), opt) for opt in options]
-    scored.sort(key=lambda t: t[0], reverse=True)
-    return scored[0][1]
+    keyword_lower = focus_keyword.lower()
+    return max(options, key=lambda opt: _score(opt, keyword_lower))
 
 
 def run(input_data: Dict[str, Any]) -> Dict[str, Any]:
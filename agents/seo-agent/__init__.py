@@ -14,13 +14,15 @@ Example usage:
     })
 """
 
-from .index import run, validate, generate_keyword_cluster
+from .index import run, run_batch, validate, generate_keyword_cluster, generate_keyword_clusters
 from .validate import validate_input, validate_output, validate_keyword_quality, validate_keyword_cluster
 
 __all__ = [
     'run',
+    'run_batch',
     'validate',
     'generate_keyword_cluster',
+    'generate_keyword_clusters',
     'validate_input',
     'validate_output',
     'validate_keyword_quality',
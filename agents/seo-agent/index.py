@@ -17,23 +17,31 @@ Output:
 """
 
 import json
-import logging
+import re
 import sys
 from typing import Dict, Any, List
 
+import orjson
+
 from ..shared.schemas import AgentTask, KeywordCluster
 from ..shared.utils import (
     generate_completion,
     format_agent_response,
     log_agent_error,
-    extract_keywords
+    extract_keywords,
+    get_logger
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("seo-agent")
+logger = get_logger("seo-agent")
+
+# JSON object inside a markdown code fence (with or without a json tag)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.S)
 
 # Define system prompt for keyword generation
+# The system prompt is sent first and never changes, so calls sharing this
+# cache key can reuse the provider's cached prefix
+SEO_PROMPT_CACHE_KEY = "seo-agent-v1"
+
 KEYWORD_SYSTEM_PROMPT = """
 You are an expert SEO strategist. Your task is to analyze a website domain and content niche,
 then generate a strategic keyword cluster for a new piece of content.
@@ -47,6 +55,29 @@ Focus on:
 Provide only JSON output with no additional text.
 """
 
+# Structured output schema for one keyword cluster
+KEYWORD_CLUSTER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "focus_keyword": {"type": "string"},
+        "supporting_keywords": {"type": "array", "items": {"type": "string"}},
+        "internal_links": {"type": "array", "items": {"type": "string"}},
+        "cluster_target": {"type": "string"},
+    },
+    "required": ["focus_keyword", "supporting_keywords", "internal_links", "cluster_target"],
+    "additionalProperties": False,
+}
+
+# Structured output schema for a batch of keyword clusters
+KEYWORD_CLUSTER_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "clusters": {"type": "array", "items": KEYWORD_CLUSTER_SCHEMA},
+    },
+    "required": ["clusters"],
+    "additionalProperties": False,
+}
+
 def validate(input_data: Dict[str, Any]) -> bool:
     """
     Validate the input data for the SEO agent.
@@ -101,18 +132,18 @@ def generate_keyword_cluster(domain: str, niche: str) -> Dict[str, Any]:
             prompt=prompt,
             system_message=KEYWORD_SYSTEM_PROMPT,
             temperature=0.7,
-            max_tokens=800
+            max_tokens=800,
+            prompt_cache_key=SEO_PROMPT_CACHE_KEY
         )
         
         # Parse the JSON response
         try:
             # Handle potential markdown code block formatting
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0].strip()
-                
-            keyword_data = json.loads(response)
+            match = _FENCE_RE.search(response)
+            payload = match.group(1) if match else response
+
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            keyword_data = orjson.loads(payload)
             
             # Validate required fields
             required_fields = ["focus_keyword", "supporting_keywords", "internal_links", "cluster_target"]
@@ -142,6 +173,74 @@ def generate_keyword_cluster(domain: str, niche: str) -> Dict[str, Any]:
         raise
 
 
+def generate_keyword_clusters(inputs: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Generate keyword clusters for several (domain, niche) pairs in one call.
+
+    Args:
+        inputs: List of dictionaries with 'domain' and 'niche' keys
+
+    Returns:
+        List: Keyword data for each input, in the same order
+
+    Raises:
+        ValueError: If the response does not hold exactly one cluster per input
+    """
+    numbered = "\n".join(
+        f"{i}. domain: {item['domain']}, niche: {item['niche']}"
+        for i, item in enumerate(inputs)
+    )
+    prompt = f"""
+    Please generate an SEO keyword cluster for a new article for each of the
+    {len(inputs)} sites below. Return a JSON object with a "clusters" array of
+    length {len(inputs)}, where clusters[i] corresponds to input i.
+
+    {numbered}
+
+    For each cluster I need:
+    1. A primary focus keyword (moderately competitive, good search intent)
+    2. 5-7 supporting keywords that enhance the article's semantic relevance
+    3. 3-5 internal link suggestions (topics that would make sense to link to)
+    4. A cluster/category name this content belongs to
+    """
+
+    response = generate_completion(
+        prompt=prompt,
+        model="gpt-4o",
+        system_message=KEYWORD_SYSTEM_PROMPT,
+        temperature=0.7,
+        max_tokens=400 * len(inputs),
+        prompt_cache_key=SEO_PROMPT_CACHE_KEY,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "keyword_clusters",
+                "schema": KEYWORD_CLUSTER_BATCH_SCHEMA,
+                "strict": True,
+            },
+        },
+    )
+
+    clusters = orjson.loads(response)["clusters"]
+    if len(clusters) != len(inputs):
+        raise ValueError(
+            f"Expected {len(inputs)} keyword clusters, got {len(clusters)}"
+        )
+    return clusters
+
+
+def _format_seo_output(keyword_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Format keyword data according to the standard output schema."""
+    return {
+        "seo": {
+            "focus_keyword": keyword_data["focus_keyword"],
+            "supporting_keywords": keyword_data["supporting_keywords"],
+            "internal_links": keyword_data["internal_links"],
+            "cluster_target": keyword_data["cluster_target"]
+        }
+    }
+
+
 def run(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Main entry point for the SEO agent.
@@ -167,14 +266,7 @@ def run(input_data: Dict[str, Any]) -> Dict[str, Any]:
         keyword_data = generate_keyword_cluster(domain, niche)
         
         # Format output according to the standard schema
-        output = {
-            "seo": {
-                "focus_keyword": keyword_data["focus_keyword"],
-                "supporting_keywords": keyword_data["supporting_keywords"],
-                "internal_links": keyword_data["internal_links"],
-                "cluster_target": keyword_data["cluster_target"]
-            }
-        }
+        output = _format_seo_output(keyword_data)
         
         return format_agent_response(agent_name, output)
         
@@ -188,6 +280,52 @@ def run(input_data: Dict[str, Any]) -> Dict[str, Any]:
         )
 
 
+def run_batch(inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run the SEO agent for several inputs with a single LLM call.
+
+    Invalid inputs get an error response of their own. If the batched call
+    fails, each valid input falls back to a separate run().
+
+    Args:
+        inputs: List of dictionaries with 'domain' and 'niche' keys
+
+    Returns:
+        List: Agent responses, in the same order as the inputs
+    """
+    agent_name = "seo-agent"
+    results: List[Any] = [None] * len(inputs)
+    pending = []
+
+    for i, input_data in enumerate(inputs):
+        try:
+            validate(input_data)
+            pending.append(i)
+        except Exception as e:
+            log_agent_error(agent_name, e)
+            results[i] = format_agent_response(
+                agent_name,
+                {},
+                status="error",
+                errors=[f"SEO_GENERATION_FAIL: {str(e)}"]
+            )
+
+    if pending:
+        try:
+            logger.info(f"Generating {len(pending)} keyword clusters in one request")
+            clusters = generate_keyword_clusters([inputs[i] for i in pending])
+            for i, keyword_data in zip(pending, clusters):
+                results[i] = format_agent_response(
+                    agent_name, _format_seo_output(keyword_data)
+                )
+        except Exception as e:
+            logger.warning(f"Batched keyword generation failed, running individually: {e}")
+            for i in pending:
+                results[i] = run(inputs[i])
+
+    return results
+
+
 if __name__ == "__main__":
     """
     Command-line interface for testing the agent.
@@ -5,13 +5,37 @@ This module provides validation functions for the SEO agent's input and output d
 It ensures that all required fields are present and properly formatted.
 """
 
-import logging
-import re
+import string
 from typing import Dict, Any, List, Optional, Union
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("seo-agent-validator")
+from ..shared.utils import get_logger
+
+logger = get_logger("seo-agent-validator")
+
+# Translation tables that delete the characters allowed in a host label,
+# and digits; anything left over after translate() is disallowed
+_DELETE_LABEL_CHARS = str.maketrans("", "", string.ascii_letters + string.digits + "-")
+_DELETE_DIGITS = str.maketrans("", "", string.digits)
+
+
+def _is_valid_domain(domain: str) -> bool:
+    """
+    Basic domain validation (simplified).
+
+    Accepts a host label of 1-63 letters, digits and hyphens that starts and
+    ends with a letter or digit, followed by one or more alphabetic labels of
+    at least 2 letters (e.g. "fitness-blog.com", "example.co.uk").
+    """
+    if not domain or len(domain) > 253 or not domain.isascii():
+        return False
+
+    host, *suffixes = domain.split(".")
+    if not suffixes or not 1 <= len(host) <= 63:
+        return False
+    if not (host[0].isalnum() and host[-1].isalnum()) or host.translate(_DELETE_LABEL_CHARS):
+        return False
+
+    return all(len(label) >= 2 and label.isalpha() for label in suffixes)
 
 
 def validate_input(input_data: Dict[str, Any]) -> bool:
@@ -39,9 +63,7 @@ def validate_input(input_data: Dict[str, Any]) -> bool:
     if not isinstance(domain, str):
         raise ValueError("Domain must be a string")
     
-    # Basic domain validation (simplified)
-    domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z]{2,})+$'
-    if not re.match(domain_pattern, domain):
+    if not _is_valid_domain(domain):
         raise ValueError(f"Invalid domain format: {domain}")
     
     # Validate niche
@@ -136,7 +158,8 @@ def validate_keyword_quality(keyword: str) -> Dict[str, Any]:
     metrics = {
         "length": len(keyword),
         "word_count": len(keyword.split()),
-        "has_numbers": any(char.isdigit() for char in keyword),
+        # Deleting the digits shortens the string only if it had any
+        "has_numbers": len(keyword.translate(_DELETE_DIGITS)) != len(keyword),
         "quality_score": 0  # Default score
     }
     
@@ -185,20 +208,21 @@ def validate_keyword_cluster(
         "suggestions": []
     }
     
-    # Check if supporting keywords are too similar to each other
-    for i, kw1 in enumerate(supporting_keywords):
-        for j, kw2 in enumerate(supporting_keywords[i+1:], i+1):
-            if kw1.lower() == kw2.lower():
-                results["is_valid"] = False
-                results["warnings"].append(f"Duplicate supporting keywords: '{kw1}' and '{kw2}'")
-    
-    # Check if supporting keywords contain the focus keyword
+    # In one pass, flag duplicate supporting keywords (case-insensitive) and
+    # count those that contain every word of the focus keyword
     focus_words = set(focus_keyword.lower().split())
     supporting_contains_focus = 0
+    seen = {}
     
     for kw in supporting_keywords:
-        kw_words = set(kw.lower().split())
-        if focus_words.issubset(kw_words):
+        kw_lower = kw.lower()
+        if kw_lower in seen:
+            results["is_valid"] = False
+            results["warnings"].append(f"Duplicate supporting keywords: '{seen[kw_lower]}' and '{kw}'")
+        else:
+            seen[kw_lower] = kw
+        
+        if focus_words.issubset(kw_lower.split()):
             supporting_contains_focus += 1
     
     # If too many supporting keywords contain the exact focus keyword
@@ -3,10 +3,88 @@ WordPress Content Generator - Shared Package
 
 This package contains shared utilities, schemas, and helper functions
 used across all agents in the content generation pipeline.
+
+Names from the schemas and utils submodules are re-exported lazily: the
+submodule (and pydantic, OpenAI, Supabase behind it) is only imported the
+first time one of its names is looked up on this package.
 """
 
+import importlib
+
 from .markdown_utils import markdown_to_html
-from .schemas import *
-from .utils import *
 
-__all__ = []
+_SCHEMAS_EXPORTS = (
+    "TaskStatus",
+    "ContentStatus",
+    "ResearchType",
+    "AgentTask",
+    "StrategicPlan",
+    "KeywordCluster",
+    "ResearchCitation",
+    "Hook",
+    "ContentSection",
+    "ContentImage",
+    "ContentPiece",
+    "HeadlineOptions",
+    "EditingFeedback",
+    "PublishingMetadata",
+)
+
+_UTILS_EXPORTS = (
+    "get_logger",
+    "Settings",
+    "get_settings",
+    "get_supabase_client",
+    "get_openai_client",
+    "get_async_openai_client",
+    "setup_openai",
+    "clear_client_cache",
+    "generate_completion",
+    "count_tokens",
+    "count_tokens_batch",
+    "slugify",
+    "create_slug",
+    "extract_keywords",
+    "truncate_text",
+    "log_agent_error",
+    "format_agent_response",
+    "get_http_session",
+    "RetryableHTTPError",
+    "retry_transient_http_errors",
+    "wordpress_api_request",
+    "download_image",
+    "search_stock_images",
+    "search_stock_images_many",
+    "download_images",
+    "get_content_piece",
+    "update_agent_status",
+    "create_agent_task",
+    "create_agent_tasks",
+)
+
+# Exported name -> submodule defining it
+_LAZY_EXPORTS = {
+    **{name: "schemas" for name in _SCHEMAS_EXPORTS},
+    **{name: "utils" for name in _UTILS_EXPORTS},
+}
+
+_SUBMODULES = ("llm_cache", "schemas", "utils")
+
+__all__ = ["markdown_to_html", *_SCHEMAS_EXPORTS, *_UTILS_EXPORTS]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
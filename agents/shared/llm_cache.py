@@ -0,0 +1,251 @@
+"""
+Semantic cache for LLM completions.
+
+Results are stored in a local SQLite database keyed by a tuple of request
+fields (e.g. title, focus keyword, niche, audience). A lookup first tries an
+exact match on the hash of the tuple; on a miss it embeds the tuple and
+returns the closest cached result whose cosine similarity reaches the
+threshold, so near-identical requests skip the paid completion call.
+
+get_or_set is the exact-match counterpart for outputs that must not be shared
+between merely similar requests (e.g. full article drafts): the key is the
+complete request payload and entries expire after a TTL.
+
+The cache location is read from LLM_CACHE_PATH on every call; setting
+LLM_CACHE_DISABLED=1 bypasses it.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+logger = logging.getLogger("wordpress-content-generator")
+
+DEFAULT_CACHE_PATH = ".llm_cache.sqlite3"
+EMBEDDING_MODEL = "text-embedding-3-small"
+DEFAULT_TTL_DAYS = 7
+
+
+def _cache_path() -> str:
+    return os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+
+
+@contextmanager
+def _connect():
+    """Open the cache database, committing and closing it afterwards."""
+    conn = sqlite3.connect(_cache_path())
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            namespace TEXT NOT NULL,
+            embedding BLOB,
+            value TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_llm_cache_namespace ON llm_cache(namespace)"
+    )
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def cache_key(namespace: str, key: Sequence[Any]) -> str:
+    """Hash a request tuple into the exact-match cache key."""
+    payload = json.dumps([namespace, list(key)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def embed_text(client, text: str) -> List[float]:
+    """Embed text with the OpenAI embeddings endpoint."""
+    response = client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    return [float(x) for x in response.data[0].embedding]
+
+
+def _most_similar(query: List[float], rows) -> tuple:
+    """Return (similarity, value) of the row closest to the query vector."""
+    vectors = [array("f", blob) for _, blob in rows]
+    if np is not None:
+        matrix = np.array(vectors, dtype=np.float32)
+        q = np.asarray(query, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(q)
+        sims = (matrix @ q) / np.where(norms == 0, 1, norms)
+        best = int(np.argmax(sims))
+        return float(sims[best]), rows[best][0]
+
+    q_norm = math.sqrt(sum(x * x for x in query)) or 1.0
+    best_sim, best_value = -1.0, None
+    for (value, _), vec in zip(rows, vectors):
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        sim = sum(a * b for a, b in zip(query, vec)) / (norm * q_norm)
+        if sim > best_sim:
+            best_sim, best_value = sim, value
+    return best_sim, best_value
+
+
+def semantic_cache(
+    key_fn: Callable[..., Sequence[Any]],
+    threshold: float = 0.92,
+    namespace: Optional[str] = None,
+):
+    """
+    Cache the JSON-serializable result of an LLM call.
+
+    The decorated function must take the OpenAI client as its first argument;
+    it is reused for embeddings. key_fn receives the remaining arguments and
+    returns the tuple identifying the request. Exceptions raised by the
+    decorated function are not cached; cache database errors are logged and
+    the call proceeds as a miss.
+
+    Args:
+        key_fn: Maps the call's arguments (minus the client) to a key tuple
+        threshold: Minimum cosine similarity for a semantic hit
+        namespace: Cache partition (defaults to the function's qualified name)
+    """
+
+    def decorator(func):
+        ns = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(client, *args, **kwargs):
+            if os.getenv("LLM_CACHE_DISABLED"):
+                return func(client, *args, **kwargs)
+
+            key = key_fn(*args, **kwargs)
+            digest = cache_key(ns, key)
+
+            try:
+                with _connect() as conn:
+                    row = conn.execute(
+                        "SELECT value FROM llm_cache WHERE key = ?", (digest,)
+                    ).fetchone()
+                if row:
+                    result = json.loads(row[0])
+                    logger.info(f"LLM cache hit (exact) for {ns}")
+                    return result
+            except Exception as e:
+                logger.warning(f"Skipping LLM cache lookup for {ns}: {e}")
+
+            embedding = None
+            try:
+                embedding = embed_text(client, json.dumps(list(key), default=str))
+            except Exception as e:
+                logger.warning(f"Skipping semantic cache lookup: {e}")
+
+            if embedding is not None:
+                try:
+                    with _connect() as conn:
+                        rows = conn.execute(
+                            "SELECT value, embedding FROM llm_cache "
+                            "WHERE namespace = ? AND embedding IS NOT NULL",
+                            (ns,),
+                        ).fetchall()
+                    if rows:
+                        similarity, value = _most_similar(embedding, rows)
+                        if similarity >= threshold:
+                            result = json.loads(value)
+                            logger.info(
+                                f"LLM cache hit (similarity {similarity:.3f}) for {ns}"
+                            )
+                            return result
+                except Exception as e:
+                    logger.warning(f"Skipping semantic cache lookup for {ns}: {e}")
+
+            result = func(client, *args, **kwargs)
+
+            # A failed store must not discard the paid result
+            blob = array("f", embedding).tobytes() if embedding is not None else None
+            try:
+                with _connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache "
+                        "(key, namespace, embedding, value, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (digest, ns, blob, json.dumps(result), time.time()),
+                    )
+            except Exception as e:
+                logger.warning(f"Could not store LLM result for {ns}: {e}")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def get_or_set(
+    key: Any,
+    fetch_fn: Callable[[], Any],
+    ttl_days: float = DEFAULT_TTL_DAYS,
+    namespace: str = "responses",
+    cacheable: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    Return the cached result for an exact key, calling fetch_fn on a miss.
+
+    Cache read and write failures are logged and otherwise ignored, so a
+    broken cache never discards a paid completion.
+
+    Args:
+        key: JSON-serializable request payload (e.g. model, messages, params)
+        fetch_fn: Zero-argument callable producing a JSON-serializable result;
+            exceptions propagate and nothing is cached
+        ttl_days: Age after which a cached result is fetched again
+        namespace: Cache partition
+        cacheable: Optional predicate on the fetched result; results it
+            rejects (e.g. truncated or malformed replies) are returned but
+            not stored
+
+    Returns:
+        The cached or freshly fetched result
+    """
+    if os.getenv("LLM_CACHE_DISABLED"):
+        return fetch_fn()
+
+    digest = cache_key(namespace, [key])
+    try:
+        with _connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (digest, time.time() - ttl_days * 86400),
+            ).fetchone()
+        if row:
+            result = json.loads(row[0])
+            logger.info(f"LLM cache hit (exact) for {namespace}")
+            return result
+    except Exception as e:
+        logger.warning(f"Skipping LLM cache lookup for {namespace}: {e}")
+
+    result = fetch_fn()
+    if cacheable is not None and not cacheable(result):
+        logger.info(f"Not caching rejected LLM result for {namespace}")
+        return result
+
+    try:
+        with _connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, namespace, embedding, value, created_at) "
+                "VALUES (?, ?, NULL, ?, ?)",
+                (digest, namespace, json.dumps(result), time.time()),
+            )
+    except Exception as e:
+        logger.warning(f"Could not store LLM result for {namespace}: {e}")
+    return result
@@ -1,7 +1,30 @@
 """Utility functions for Markdown conversion."""
 
 import html
-import re
+import io
+
+# Heading tag by number of leading '#' (levels 1-3 are supported)
+_HEADING_TAGS = ("", "h1", "h2", "h3")
+
+
+def _render_inline(text: str) -> str:
+    """Escape a line of Markdown text and convert **bold** runs to <strong>."""
+    start = text.find("**")
+    if start == -1:
+        return html.escape(text)
+
+    parts = []
+    pos = 0
+    while start != -1:
+        end = text.find("**", start + 2)
+        if end == -1:
+            break
+        parts.append(html.escape(text[pos:start]))
+        parts.append(f"<strong>{html.escape(text[start + 2:end])}</strong>")
+        pos = end + 2
+        start = text.find("**", pos)
+    parts.append(html.escape(text[pos:]))
+    return "".join(parts)
 
 
 def markdown_to_html(markdown_text: str) -> str:
@@ -9,35 +32,37 @@ def markdown_to_html(markdown_text: str) -> str:
     if not markdown_text:
         return ""
 
-    lines = markdown_text.splitlines()
-    html_lines = []
+    # Each output line is written with a trailing newline straight into the
+    # buffer; the final newline is dropped at the end
+    out = io.StringIO()
+    write = out.write
     list_open = False
-    for line in lines:
-        if line.startswith("### "):
-            html_lines.append(f"<h3>{html.escape(line[4:].strip())}</h3>")
-        elif line.startswith("## "):
-            html_lines.append(f"<h2>{html.escape(line[3:].strip())}</h2>")
-        elif line.startswith("# "):
-            html_lines.append(f"<h1>{html.escape(line[2:].strip())}</h1>")
-        elif line.startswith("- "):
+    for line in markdown_text.splitlines():
+        if line[:1] == "#":
+            level = len(line) - len(line.lstrip("#"))
+            if level < len(_HEADING_TAGS) and line[level:level + 1] == " ":
+                tag = _HEADING_TAGS[level]
+                text = html.escape(line[level + 1:].strip())
+                write(f"<{tag}>{text}</{tag}>\n")
+                continue
+
+        if line.startswith("- "):
             if not list_open:
-                html_lines.append("<ul>")
+                write("<ul>\n")
                 list_open = True
-            item = html.escape(line[2:].strip())
-            item = re.sub(r"\*\*(.*?)\*\*", r"<strong>\1</strong>", item)
-            html_lines.append(f"<li>{item}</li>")
+            write(f"<li>{_render_inline(line[2:].strip())}</li>\n")
         else:
             if list_open:
-                html_lines.append("</ul>")
+                write("</ul>\n")
                 list_open = False
-            escaped = html.escape(line.strip())
-            escaped = re.sub(r"\*\*(.*?)\*\*", r"<strong>\1</strong>", escaped)
+            escaped = _render_inline(line.strip())
             if escaped:
-                html_lines.append(f"<p>{escaped}</p>")
+                write(f"<p>{escaped}</p>\n")
             else:
-                html_lines.append("")
+                write("\n")
 
     if list_open:
-        html_lines.append("</ul>")
+        write("</ul>\n")
 
-    return "\n".join(html_lines)
+    out.truncate(out.tell() - 1)
+    return out.getvalue()
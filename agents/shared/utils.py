@@ -4,68 +4,186 @@ Shared Utility Functions for WordPress Content Generator
 This module provides utility functions used across all agents in the content
 generation pipeline. It includes helpers for database interactions, LLM API calls,
 text processing, error handling, and more.
+
+The OpenAI, Supabase, tiktoken and slugify packages are imported inside the
+functions that use them, so importing this module stays cheap for agents
+that only need part of it.
 """
 
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib.util
 import json
 import logging
 import os
 import re
+import shutil
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import Counter
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-import openai
 import requests
-import tiktoken
 from dotenv import load_dotenv
-from slugify import slugify as _slugify
-from supabase import Client, create_client
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+from urllib3.exceptions import NewConnectionError
+
+from ..exceptions import AgentConfigError
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
-)
-logger = logging.getLogger("wordpress-content-generator")
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Return a named logger that writes to stderr.
+
+    A handler is attached (at LOG_LEVEL, default INFO) only if neither this
+    logger nor the root logger has one, so an application that configures
+    logging itself keeps control and the root logger is never touched.
+
+    Args:
+        name: Logger name
+
+    Returns:
+        logging.Logger: The configured logger
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+        logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+    return logger
+
+
+logger = get_logger("wordpress-content-generator")
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Matches supabase-py's default PostgREST timeout
+SUPABASE_HTTP_TIMEOUT = 120
+
+# Buffer size for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Timeout (seconds) for concurrent stock image searches and downloads
+IMAGE_HTTP_TIMEOUT = 30
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment configuration, read once per process by get_settings()."""
+
+    supabase_url: Optional[str] = None
+    supabase_key: Optional[str] = None
+    openai_api_key: Optional[str] = None
+    wp_api_url: Optional[str] = None
+    wp_username: Optional[str] = None
+    wp_app_password: Optional[str] = None
+    pexels_api_key: Optional[str] = None
+    unsplash_api_key: Optional[str] = None
+
+    def require(self, *names: str) -> None:
+        """
+        Raise AgentConfigError unless every named setting is set.
+
+        Args:
+            names: Settings field names, e.g. "supabase_url"
+        """
+        missing = [name.upper() for name in names if not getattr(self, name)]
+        if missing:
+            variables = "environment variables" if len(missing) > 1 else "environment variable"
+            raise AgentConfigError(f"{' and '.join(missing)} {variables} must be set")
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings from environment variables (each named after its field in
+    upper case). Cached; clear_client_cache() forces a reload.
+    """
+    return Settings(**{f.name: os.getenv(f.name.upper()) for f in fields(Settings)})
 
 
 # Initialize Supabase client
+@functools.lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
     """
     Create and return a Supabase client using environment variables.
 
+    The client is cached, and its PostgREST and Storage sub-clients share one
+    keep-alive (HTTP/2 when available) connection pool, so repeated calls
+    within a process reuse open connections instead of reconnecting.
+
     Returns:
         Client: Configured Supabase client
     """
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
+    import httpx
+    from supabase import ClientOptions, create_client
 
-    if not url or not key:
-        raise EnvironmentError(
-            "SUPABASE_URL and SUPABASE_KEY environment variables must be set"
-        )
+    settings = get_settings()
+    settings.require("supabase_url", "supabase_key")
 
-    return create_client(url, key)
+    http_client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        timeout=SUPABASE_HTTP_TIMEOUT,
+    )
+    return create_client(
+        settings.supabase_url,
+        settings.supabase_key,
+        options=ClientOptions(httpx_client=http_client),
+    )
 
 
 # OpenAI/LLM utilities
+@functools.lru_cache(maxsize=1)
 def get_openai_client():
     """
     Create and return an OpenAI client using environment variables.
 
+    The client is cached so repeated calls reuse its connection pool.
+
     Returns:
         OpenAI client instance
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise EnvironmentError("OPENAI_API_KEY environment variable must be set")
+    import openai
 
-    return openai.OpenAI(api_key=api_key)
+    settings = get_settings()
+    settings.require("openai_api_key")
+
+    return openai.OpenAI(api_key=settings.openai_api_key)
+
+
+def get_async_openai_client():
+    """
+    Create and return an AsyncOpenAI client using environment variables.
+
+    Returns:
+        AsyncOpenAI client instance
+    """
+    import openai
+
+    settings = get_settings()
+    settings.require("openai_api_key")
+
+    return openai.AsyncOpenAI(api_key=settings.openai_api_key)
 
 
 def setup_openai():
@@ -73,6 +191,14 @@ def setup_openai():
     return get_openai_client()
 
 
+def clear_client_cache():
+    """Drop the cached settings and clients (e.g. after changing credentials)."""
+    get_settings.cache_clear()
+    get_supabase_client.cache_clear()
+    get_openai_client.cache_clear()
+    get_http_session.cache_clear()
+
+
 @retry(wait=wait_exponential(min=1, max=60), stop=stop_after_attempt(5))
 def generate_completion(
     prompt: str,
@@ -80,6 +206,8 @@ def generate_completion(
     temperature: float = 0.7,
     max_tokens: int = 1000,
     system_message: str = "You are a helpful assistant.",
+    response_format: Optional[Dict[str, Any]] = None,
+    prompt_cache_key: Optional[str] = None,
 ) -> str:
     """
     Generate text completion using OpenAI's API with retry logic.
@@ -90,12 +218,19 @@ def generate_completion(
         temperature: Controls randomness (0-1)
         max_tokens: Maximum tokens in the response
         system_message: System message for context
+        response_format: Optional OpenAI response_format (e.g. a json_schema)
+        prompt_cache_key: Optional key grouping calls that share a prompt
+            prefix, so the provider can reuse its cached prefill
 
     Returns:
         str: Generated text response
     """
     client = get_openai_client()
 
+    extra = {"response_format": response_format} if response_format else {}
+    if prompt_cache_key:
+        # Sent as a raw body field so older pinned SDKs accept it too
+        extra["extra_body"] = {"prompt_cache_key": prompt_cache_key}
     try:
         response = client.chat.completions.create(
             model=model,
@@ -105,6 +240,7 @@ def generate_completion(
             ],
             temperature=temperature,
             max_tokens=max_tokens,
+            **extra,
         )
         return response.choices[0].message.content
     except Exception as e:
@@ -112,6 +248,14 @@ def generate_completion(
         raise
 
 
+@functools.lru_cache(maxsize=8)
+def _encoding_for_model(model: str):
+    """Load the tiktoken encoding for a model once per process."""
+    import tiktoken
+
+    return tiktoken.encoding_for_model(model)
+
+
 def count_tokens(text: str, model: str = "gpt-4") -> int:
     """
     Count the number of tokens in a text string for a specific model.
@@ -124,17 +268,46 @@ def count_tokens(text: str, model: str = "gpt-4") -> int:
         int: Number of tokens
     """
     try:
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(text))
-    except Exception as e:
+        encoding = _encoding_for_model(model)
+    except (KeyError, OSError) as e:
+        # Unknown model, or the BPE file could not be fetched
         logger.warning(f"Error counting tokens: {e}. Using approximate count.")
         # Fallback to approximate count (1 token ≈ 4 chars)
         return len(text) // 4
 
+    return len(encoding.encode(text))
+
+
+def count_tokens_batch(texts: List[str], model: str = "gpt-4") -> List[int]:
+    """
+    Count the tokens in several texts with one call into tiktoken.
+
+    The texts are encoded in parallel by tiktoken's thread pool. As with
+    count_tokens, an approximate count is used if the encoding is unavailable.
+
+    Args:
+        texts: The texts to count tokens for
+        model: The model to use for counting
+
+    Returns:
+        List[int]: Number of tokens in each text, in order
+    """
+    try:
+        encoding = _encoding_for_model(model)
+    except (KeyError, OSError) as e:
+        logger.warning(f"Error counting tokens: {e}. Using approximate count.")
+        return [len(text) // 4 for text in texts]
+
+    encoded = encoding.encode_ordinary_batch(texts, num_threads=os.cpu_count() or 4)
+    return [len(tokens) for tokens in encoded]
+
 
 # Text processing utilities
+@functools.lru_cache(maxsize=1024)
 def slugify(text: str) -> str:
-    """Convert text to a URL-friendly slug."""
+    """Convert text to a URL-friendly slug (cached, titles repeat within a run)."""
+    from slugify import slugify as _slugify
+
     return _slugify(text)
 
 
@@ -151,6 +324,13 @@ def create_slug(text: str) -> str:
     return slugify(text)
 
 
+# Candidate keywords for extract_keywords, and very basic stopwords to skip
+_KEYWORD_RE = re.compile(r"\b[a-zA-Z]{3,15}\b")
+_KEYWORD_STOPWORDS = frozenset(
+    {"the", "and", "is", "in", "to", "of", "for", "with", "on", "at", "from", "by"}
+)
+
+
 def extract_keywords(text: str, max_keywords: int = 5) -> List[str]:
     """
     Extract potential keywords from a text.
@@ -164,38 +344,14 @@ def extract_keywords(text: str, max_keywords: int = 5) -> List[str]:
     """
     # This is a simple implementation
     # In a real system, you might use NLP libraries or LLM APIs
-    words = re.findall(r"\b[a-zA-Z]{3,15}\b", text.lower())
-    word_freq = {}
-
-    for word in words:
-        if word not in word_freq:
-            word_freq[word] = 0
-        word_freq[word] += 1
-
-    # Filter out common words (very basic stopwords)
-    stopwords = {
-        "the",
-        "and",
-        "is",
-        "in",
-        "to",
-        "of",
-        "for",
-        "with",
-        "on",
-        "at",
-        "from",
-        "by",
-    }
-    word_freq = {
-        word: freq for word, freq in word_freq.items() if word not in stopwords
-    }
-
-    # Sort by frequency
-    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    word_freq = Counter(
+        word
+        for word in _KEYWORD_RE.findall(text.lower())
+        if word not in _KEYWORD_STOPWORDS
+    )
 
-    # Return top keywords
-    return [word for word, _ in sorted_words[:max_keywords]]
+    # Return the most frequent words (ties keep first-seen order)
+    return [word for word, _ in word_freq.most_common(max_keywords)]
 
 
 def truncate_text(text: str, max_length: int = 100, add_ellipsis: bool = True) -> str:
@@ -221,6 +377,14 @@ def truncate_text(text: str, max_length: int = 100, add_ellipsis: bool = True) -
 
 
 # Error handling and logging
+_UTC = timezone.utc
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string with second precision."""
+    return datetime.now(_UTC).isoformat(timespec="seconds")
+
+
 def log_agent_error(
     agent_name: str, error: Exception, content_id: str = None
 ) -> Dict[str, Any]:
@@ -239,7 +403,7 @@ def log_agent_error(
         "agent": agent_name,
         "error": str(error),
         "error_type": type(error).__name__,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _utc_timestamp(),
     }
 
     if content_id:
@@ -272,11 +436,89 @@ def format_agent_response(
         "output": output,
         "status": status,
         "errors": errors or [],
-        "updated_at": datetime.now().isoformat(),
+        "updated_at": _utc_timestamp(),
     }
 
 
+# HTTP utilities
+@functools.lru_cache(maxsize=1)
+def get_http_session() -> requests.Session:
+    """
+    Return the shared requests session for WordPress and stock image calls.
+
+    The session keeps connections alive per host, so repeated calls skip the
+    TCP and TLS handshakes. It does not retry by itself; the request helpers
+    below retry through retry_transient_http_errors.
+
+    Returns:
+        requests.Session: Shared session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class RetryableHTTPError(requests.exceptions.HTTPError):
+    """A 5xx response, which is worth retrying."""
+
+
+def _raise_for_status(response: requests.Response) -> None:
+    """Like response.raise_for_status(), but 5xx raises RetryableHTTPError."""
+    if 500 <= response.status_code < 600:
+        raise RetryableHTTPError(
+            f"{response.status_code} Server Error: {response.reason} "
+            f"for url: {response.url}",
+            response=response,
+        )
+    response.raise_for_status()
+
+
+# Methods that can be resent without creating a second resource
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def _is_transient_http_error(error: BaseException) -> bool:
+    """
+    Whether a failed request is safe to send again.
+
+    Requests that never reached the server (connect timeout or refused
+    connection) can always be resent. Other network failures and 5xx
+    responses are only retried for idempotent methods: the server may already
+    have committed a POST, and resending it would e.g. duplicate a post.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        if isinstance(reason, NewConnectionError):
+            return True
+    if not isinstance(
+        error,
+        (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            RetryableHTTPError,
+        ),
+    ):
+        return False
+    method = getattr(error.request, "method", None) or ""
+    return method.upper() in IDEMPOTENT_METHODS
+
+
+# Retry transient network failures and server errors, re-raising the last
+# error once the attempts run out
+retry_transient_http_errors = retry(
+    wait=wait_exponential(min=1, max=30),
+    stop=stop_after_attempt(4),
+    retry=retry_if_exception(_is_transient_http_error),
+    reraise=True,
+)
+
+
 # WordPress API utilities
+@retry_transient_http_errors
 def wordpress_api_request(
     endpoint: str,
     method: str = "GET",
@@ -295,24 +537,23 @@ def wordpress_api_request(
     Returns:
         Dict: API response
     """
-    wp_api_url = os.getenv("WP_API_URL")
-    if not wp_api_url:
-        raise EnvironmentError("WP_API_URL environment variable must be set")
+    settings = get_settings()
+    settings.require("wp_api_url")
 
-    url = f"{wp_api_url}/{endpoint.lstrip('/')}"
+    url = f"{settings.wp_api_url}/{endpoint.lstrip('/')}"
 
-    if not auth and os.getenv("WP_USERNAME") and os.getenv("WP_APP_PASSWORD"):
-        auth = (os.getenv("WP_USERNAME"), os.getenv("WP_APP_PASSWORD"))
+    if not auth and settings.wp_username and settings.wp_app_password:
+        auth = (settings.wp_username, settings.wp_app_password)
 
     try:
-        response = requests.request(
+        response = get_http_session().request(
             method=method,
             url=url,
             json=data,
             auth=auth,
             headers={"Content-Type": "application/json"},
         )
-        response.raise_for_status()
+        _raise_for_status(response)
         return response.json()
     except requests.exceptions.RequestException as e:
         logger.error(f"WordPress API error: {e}")
@@ -320,32 +561,101 @@ def wordpress_api_request(
 
 
 # Image utilities
-def download_image(url: str, save_path: str = None) -> bytes:
+@retry_transient_http_errors
+def download_image(url: str, save_path: str = None) -> Union[bytes, str]:
     """
     Download an image from a URL.
 
+    With save_path the image is streamed straight to disk and never held in
+    memory as a whole.
+
     Args:
         url: Image URL
         save_path: Path to save the image (if provided)
 
     Returns:
-        bytes: Image data
+        bytes: Image data, or str: save_path if the image was saved
     """
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
+        # The context manager returns the connection to the pool
+        with get_http_session().get(url, stream=True) as response:
+            _raise_for_status(response)
 
-        if save_path:
+            if not save_path:
+                return response.content
+
+            # Undo any gzip/deflate transfer encoding while copying
+            response.raw.decode_content = True
             with open(save_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
 
-        return response.content
+        return save_path
     except Exception as e:
         logger.error(f"Error downloading image: {e}")
         raise
 
 
+def _stock_image_request(
+    query: str, provider: str, per_page: int
+) -> Tuple[str, Dict[str, str]]:
+    """Build the search URL and headers for a stock image provider."""
+    settings = get_settings()
+
+    if provider.lower() == "pexels":
+        settings.require("pexels_api_key")
+        api_key = settings.pexels_api_key
+
+        url = f"https://api.pexels.com/v1/search?query={query}&per_page={per_page}"
+        headers = {"Authorization": api_key}
+
+    elif provider.lower() == "unsplash":
+        settings.require("unsplash_api_key")
+        api_key = settings.unsplash_api_key
+
+        url = (
+            f"https://api.unsplash.com/search/photos?query={query}&per_page={per_page}"
+        )
+        headers = {"Authorization": f"Client-ID {api_key}"}
+
+    else:
+        raise ValueError("Provider must be 'pexels' or 'unsplash'")
+
+    return url, headers
+
+
+def _normalize_stock_images(provider: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Normalize a provider's search response to a common format."""
+    if provider.lower() == "pexels":
+        return [
+            {
+                "id": photo["id"],
+                "url": photo["src"]["original"],
+                "width": photo["width"],
+                "height": photo["height"],
+                "alt": photo.get("alt", ""),
+                "photographer": photo["photographer"],
+                "source": "pexels",
+                "thumbnail": photo["src"]["medium"],
+            }
+            for photo in data.get("photos", [])
+        ]
+    else:  # unsplash
+        return [
+            {
+                "id": photo["id"],
+                "url": photo["urls"]["full"],
+                "width": photo["width"],
+                "height": photo["height"],
+                "alt": photo.get("alt_description", ""),
+                "photographer": photo["user"]["name"],
+                "source": "unsplash",
+                "thumbnail": photo["urls"]["thumb"],
+            }
+            for photo in data.get("results", [])
+        ]
+
+
+@retry_transient_http_errors
 def search_stock_images(
     query: str, provider: str = "pexels", per_page: int = 5
 ) -> List[Dict[str, Any]]:
@@ -360,67 +670,84 @@ def search_stock_images(
     Returns:
         List of image data dictionaries
     """
-    if provider.lower() == "pexels":
-        api_key = os.getenv("PEXELS_API_KEY")
-        if not api_key:
-            raise EnvironmentError("PEXELS_API_KEY environment variable must be set")
+    url, headers = _stock_image_request(query, provider, per_page)
 
-        url = f"https://api.pexels.com/v1/search?query={query}&per_page={per_page}"
-        headers = {"Authorization": api_key}
+    try:
+        response = get_http_session().get(url, headers=headers)
+        _raise_for_status(response)
+        return _normalize_stock_images(provider, response.json())
 
-    elif provider.lower() == "unsplash":
-        api_key = os.getenv("UNSPLASH_API_KEY")
-        if not api_key:
-            raise EnvironmentError("UNSPLASH_API_KEY environment variable must be set")
+    except Exception as e:
+        logger.error(f"Error searching stock images: {e}")
+        raise
 
-        url = (
-            f"https://api.unsplash.com/search/photos?query={query}&per_page={per_page}"
-        )
-        headers = {"Authorization": f"Client-ID {api_key}"}
 
-    else:
-        raise ValueError("Provider must be 'pexels' or 'unsplash'")
+def _async_image_client():
+    """Create an httpx.AsyncClient for concurrent image requests."""
+    import httpx
 
-    try:
-        response = requests.get(url, headers=headers)
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE, timeout=IMAGE_HTTP_TIMEOUT, follow_redirects=True
+    )
+
+
+async def search_stock_images_many(
+    queries: List[str], provider: str = "pexels", per_page: int = 5
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run several stock image searches concurrently.
+
+    Args:
+        queries: Search queries
+        provider: "pexels" or "unsplash"
+        per_page: Number of results to return per query
+
+    Returns:
+        List of image data lists, one per query, in order
+    """
+    searches = [_stock_image_request(query, provider, per_page) for query in queries]
+
+    async def search(client, url, headers):
+        response = await client.get(url, headers=headers)
         response.raise_for_status()
-        data = response.json()
-
-        # Normalize response format
-        if provider.lower() == "pexels":
-            return [
-                {
-                    "id": photo["id"],
-                    "url": photo["src"]["original"],
-                    "width": photo["width"],
-                    "height": photo["height"],
-                    "alt": photo.get("alt", ""),
-                    "photographer": photo["photographer"],
-                    "source": "pexels",
-                    "thumbnail": photo["src"]["medium"],
-                }
-                for photo in data.get("photos", [])
-            ]
-        else:  # unsplash
-            return [
-                {
-                    "id": photo["id"],
-                    "url": photo["urls"]["full"],
-                    "width": photo["width"],
-                    "height": photo["height"],
-                    "alt": photo.get("alt_description", ""),
-                    "photographer": photo["user"]["name"],
-                    "source": "unsplash",
-                    "thumbnail": photo["urls"]["thumb"],
-                }
-                for photo in data.get("results", [])
-            ]
+        return _normalize_stock_images(provider, response.json())
 
+    try:
+        async with _async_image_client() as client:
+            return list(
+                await asyncio.gather(
+                    *(search(client, url, headers) for url, headers in searches)
+                )
+            )
     except Exception as e:
         logger.error(f"Error searching stock images: {e}")
         raise
 
 
+async def download_images(urls: List[str]) -> List[bytes]:
+    """
+    Download several images concurrently over one pooled connection set.
+
+    Args:
+        urls: Image URLs
+
+    Returns:
+        List[bytes]: Image data for each URL, in order
+    """
+
+    async def download(client, url):
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+    try:
+        async with _async_image_client() as client:
+            return list(await asyncio.gather(*(download(client, url) for url in urls)))
+    except Exception as e:
+        logger.error(f"Error downloading images: {e}")
+        raise
+
+
 # Database interaction helpers
 def get_content_piece(content_id: str, supabase: Client = None) -> Dict[str, Any]:
     """
@@ -452,7 +779,8 @@ def update_agent_status(
     output: Dict = None,
     errors: List[str] = None,
     supabase: Client = None,
-) -> Dict[str, Any]:
+    return_row: bool = True,
+) -> Optional[Dict[str, Any]]:
     """
     Update the status of an agent task in the database.
 
@@ -462,14 +790,17 @@ def update_agent_status(
         output: Task output data
         errors: List of error messages
         supabase: Supabase client (optional)
+        return_row: Whether to fetch the updated row back; when False only
+            the matched row count is returned by PostgREST
 
     Returns:
-        Dict: Updated task data
+        Dict: Updated task data, or None if return_row is False
     """
     if supabase is None:
         supabase = get_supabase_client()
 
-    update_data = {"status": status, "updated_at": datetime.now().isoformat()}
+    # updated_at is refreshed by the update_agent_status_timestamp trigger
+    update_data = {"status": status}
 
     if output is not None:
         update_data["output"] = output
@@ -477,6 +808,17 @@ def update_agent_status(
     if errors is not None:
         update_data["errors"] = errors
 
+    if not return_row:
+        response = (
+            supabase.table("agent_status")
+            .update(update_data, count="exact", returning="minimal")
+            .eq("id", task_id)
+            .execute()
+        )
+        if not response.count:
+            raise ValueError(f"Agent task with ID {task_id} not found")
+        return None
+
     response = (
         supabase.table("agent_status").update(update_data).eq("id", task_id).execute()
     )
@@ -487,9 +829,23 @@ def update_agent_status(
     return response.data[0]
 
 
+def _agent_task_row(agent: str, content_id: str, input_data: Dict[str, Any]) -> Dict:
+    """Build a queued agent_status row (the timestamps default to now)."""
+    return {
+        "agent": agent,
+        "content_id": content_id,
+        "input": input_data,
+        "status": "queued",
+    }
+
+
 def create_agent_task(
-    agent: str, content_id: str, input_data: Dict[str, Any], supabase: Client = None
-) -> Dict[str, Any]:
+    agent: str,
+    content_id: str,
+    input_data: Dict[str, Any],
+    supabase: Client = None,
+    return_row: bool = True,
+) -> Optional[Dict[str, Any]]:
     """
     Create a new agent task in the database.
 
@@ -498,22 +854,54 @@ def create_agent_task(
         content_id: ID of the content piece
         input_data: Task input data
         supabase: Supabase client (optional)
+        return_row: Whether to fetch the created row back
 
     Returns:
-        Dict: Created task data
+        Dict: Created task data, or None if return_row is False
     """
     if supabase is None:
         supabase = get_supabase_client()
 
-    task_data = {
-        "agent": agent,
-        "content_id": content_id,
-        "input": input_data,
-        "status": "queued",
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-    }
+    task_data = _agent_task_row(agent, content_id, input_data)
+
+    if not return_row:
+        supabase.table("agent_status").insert(
+            task_data, returning="minimal"
+        ).execute()
+        return None
 
     response = supabase.table("agent_status").insert(task_data).execute()
 
     return response.data[0]
+
+
+def create_agent_tasks(
+    tasks: List[Tuple[str, str, Dict[str, Any]]],
+    supabase: Client = None,
+    return_rows: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Create several agent tasks with a single insert.
+
+    PostgREST writes all rows in one transaction, so either every task is
+    queued or none is.
+
+    Args:
+        tasks: (agent, content_id, input_data) for each task
+        supabase: Supabase client (optional)
+        return_rows: Whether to fetch the created rows back
+
+    Returns:
+        List: Created task data (empty if return_rows is False)
+    """
+    if not tasks:
+        return []
+
+    if supabase is None:
+        supabase = get_supabase_client()
+
+    rows = [_agent_task_row(*task) for task in tasks]
+    returning = "representation" if return_rows else "minimal"
+    response = supabase.table("agent_status").insert(rows, returning=returning).execute()
+
+    return response.data if return_rows else []
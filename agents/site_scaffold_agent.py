@@ -14,21 +14,32 @@ Usage:
 """
 
 import argparse
+import asyncio
 import json
 import os
 import sys
-import time
 import uuid
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 
 # Import shared utilities
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from agents.shared.utils import create_agent_task, update_agent_status
+from agents.shared.utils import (
+    create_agent_task, create_agent_tasks, get_http_session, update_agent_status
+)
+from agents.shared.utils import get_supabase_client as get_shared_supabase_client
+
+# Load environment variables once, unless they are already set (e.g. by tests)
+if not os.environ.get("SUPABASE_URL"):
+    load_dotenv()
+
+_SUPABASE_URL = os.getenv("SUPABASE_URL")
+_SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 # ANSI colors for terminal output
 GREEN = "\033[92m"
@@ -116,6 +127,12 @@ EEAT_PAGES = [
     }
 ]
 
+# WordPress's batch endpoint accepts at most 25 sub-requests per call
+WP_BATCH_LIMIT = 25
+
+# Timeout (seconds) for WordPress REST calls
+WP_BATCH_TIMEOUT = 60
+
 # Default categories if none specified
 DEFAULT_CATEGORIES = [
     "Guides & Tutorials",
@@ -123,20 +140,27 @@ DEFAULT_CATEGORIES = [
     "Case Studies"
 ]
 
+# Default categories with their slugs, computed once
+DEFAULT_CATEGORIES_PREPARED = [
+    {"name": name, "slug": name.lower().replace(" & ", "-").replace(" ", "-")}
+    for name in DEFAULT_CATEGORIES
+]
+
 
+@lru_cache(maxsize=1)
 def get_supabase_client() -> Client:
-    """Create and return a Supabase client."""
-    # Load environment variables
-    load_dotenv()
-    
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
+    """
+    Create the Supabase client once and reuse it for the whole process.
     
-    if not url or not key:
+    This is the shared agents client, whose pooled httpx connection uses
+    HTTP/2 when available, so the concurrent scaffold requests multiplex
+    over one connection.
+    """
+    if not _SUPABASE_URL or not _SUPABASE_KEY:
         print(f"{RED}Error: SUPABASE_URL and SUPABASE_KEY must be set in .env file{ENDC}")
         sys.exit(1)
     
-    return create_client(url, key)
+    return get_shared_supabase_client()
 
 
 def get_wordpress_site(site_id: str, supabase: Client) -> Dict[str, Any]:
@@ -168,48 +192,86 @@ def update_scaffold_status(site_id: str, status: str, supabase: Client,
         print(f"{RED}Error updating scaffold status: {e}{ENDC}")
 
 
+def has_wp_credentials(wp_site: Dict[str, Any]) -> bool:
+    """Whether the site record carries REST API credentials (otherwise simulate)."""
+    return bool(wp_site.get("username") and wp_site.get("app_password"))
+
+
+def wp_batch_request(wp_site: Dict[str, Any], sub_requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Send sub-requests through the WordPress batch endpoint (WP 5.6+).
+    
+    Each call to /wp-json/batch/v1 goes through the shared keep-alive
+    session, carries up to WP_BATCH_LIMIT sub-requests and uses
+    "require-all-validate", so nothing is written unless every sub-request
+    in it validates.
+    
+    Returns the sub-responses ({"status", "body", ...}) in request order.
+    """
+    url = f"{wp_site['url'].rstrip('/')}/wp-json/batch/v1"
+    auth = (wp_site['username'], wp_site['app_password'])
+    
+    responses = []
+    for start in range(0, len(sub_requests), WP_BATCH_LIMIT):
+        response = get_http_session().post(
+            url,
+            auth=auth,
+            json={
+                "validation": "require-all-validate",
+                "requests": sub_requests[start:start + WP_BATCH_LIMIT]
+            },
+            timeout=WP_BATCH_TIMEOUT
+        )
+        response.raise_for_status()
+        result = response.json()
+        
+        if result.get("failed") == "validation":
+            errors = [r["body"].get("message", "") for r in result["responses"] if r.get("status", 200) >= 400]
+            raise ValueError(f"WordPress batch validation failed: {'; '.join(errors)}")
+        
+        responses.extend(result["responses"])
+    
+    return responses
+
+
 def install_plugins(wp_site: Dict[str, Any], use_ai: bool = True) -> bool:
     """
     Install and activate the default plugins.
     
-    In a real implementation, this would make REST API calls to WordPress.
-    For now, we'll simulate the process with logs.
+    The plugins endpoint is not batch-enabled in WordPress core, so each
+    plugin is its own request. Without site credentials the process is
+    simulated with logs.
     """
     print(f"{BLUE}Installing and activating plugins for {wp_site['domain']}{ENDC}")
     
     for plugin in DEFAULT_PLUGINS:
         print(f"{YELLOW}Installing plugin: {plugin['name']}{ENDC}")
         
-        # Simulate API call to install plugin
-        # In production, this would be:
-        # response = requests.post(
-        #     f"{wp_site['url']}/wp-json/wp/v2/plugins",
-        #     auth=(wp_site['username'], wp_site['app_password']),
-        #     json={"slug": plugin['slug'], "status": "active"}
-        # )
-        
-        # Simulate success/failure
         success = True
+        if has_wp_credentials(wp_site):
+            try:
+                response = get_http_session().post(
+                    f"{wp_site['url'].rstrip('/')}/wp-json/wp/v2/plugins",
+                    auth=(wp_site['username'], wp_site['app_password']),
+                    json={"slug": plugin['slug'], "status": "active"},
+                    timeout=WP_BATCH_TIMEOUT
+                )
+                success = response.ok
+            except requests.exceptions.RequestException as e:
+                print(f"{RED}Error installing plugin {plugin['name']}: {e}{ENDC}")
+                success = False
+        
         if success:
             print(f"{GREEN}Successfully installed and activated: {plugin['name']}{ENDC}")
         else:
             print(f"{RED}Failed to install plugin: {plugin['name']}{ENDC}")
             return False
-        
-        # Simulate a delay for realism
-        time.sleep(0.5)
     
     return True
 
 
-def create_eeat_pages(wp_site: Dict[str, Any], use_ai: bool = True) -> bool:
-    """
-    Create EEAT pages (About, Contact, Privacy, Terms, Author, Sitemap).
-    
-    In a real implementation, this would make REST API calls to WordPress.
-    """
-    print(f"{BLUE}Creating EEAT pages for {wp_site['domain']}{ENDC}")
-    
+def eeat_page_requests(wp_site: Dict[str, Any], supabase: Client) -> List[Dict[str, Any]]:
+    """Build the batch sub-requests that create the EEAT pages."""
     # Get site name from domain
     site_name = wp_site['domain'].split('.')[0].title()
     
@@ -219,223 +281,294 @@ def create_eeat_pages(wp_site: Dict[str, Any], use_ai: bool = True) -> bool:
     
     # Try to get a strategic plan for this site
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("strategic_plans").select("niche,audience").eq("wordpress_site_id", wp_site['id']).execute()
-        if response.data:
-            niche = response.data[0].get("niche", niche)
-            audience = response.data[0].get("audience", audience)
+        plan = _get_strategic_plan(supabase, wp_site['id'])
+        if plan:
+            niche = plan.get("niche", niche)
+            audience = plan.get("audience", audience)
     except Exception:
         # Use defaults if we can't get the strategic plan
         pass
     
-    for page in EEAT_PAGES:
-        print(f"{YELLOW}Creating page: {page['title']}{ENDC}")
-        
-        # Format content template with site info
-        content = page['content_template'].format(
-            site_name=site_name,
-            niche=niche,
-            audience=audience
-        )
-        
-        # Simulate API call to create page
-        # In production, this would be:
-        # response = requests.post(
-        #     f"{wp_site['url']}/wp-json/wp/v2/pages",
-        #     auth=(wp_site['username'], wp_site['app_password']),
-        #     json={
-        #         "title": page['title'],
-        #         "slug": page['slug'],
-        #         "content": content,
-        #         "status": "publish"
-        #     }
-        # )
-        
-        # Simulate success
-        print(f"{GREEN}Created page: {page['title']}{ENDC}")
-        
-        # Simulate a delay for realism
-        time.sleep(0.5)
-    
-    return True
+    return list(_render_eeat(site_name, niche, audience))
 
 
-def create_categories(wp_site: Dict[str, Any], use_ai: bool = True) -> List[Dict[str, Any]]:
+@lru_cache(maxsize=64)
+def _render_eeat(site_name: str, niche: str, audience: str) -> Tuple[Dict[str, Any], ...]:
+    """Render the EEAT page sub-requests for one site identity (treat as read-only)."""
+    site_info = {"site_name": site_name, "niche": niche, "audience": audience}
+    return tuple(
+        {
+            "method": "POST",
+            "path": "/wp/v2/pages",
+            "body": {
+                "title": page['title'],
+                "slug": page['slug'],
+                # Format content template with site info
+                "content": page['content_template'].format_map(site_info),
+                "status": "publish"
+            }
+        }
+        for page in EEAT_PAGES
+    )
+
+
+def category_requests() -> List[Dict[str, Any]]:
+    """Build the batch sub-requests that create the default categories."""
+    return [
+        {
+            "method": "POST",
+            "path": "/wp/v2/categories",
+            "body": category
+        }
+        for category in DEFAULT_CATEGORIES_PREPARED
+    ]
+
+
+def create_site_structure(wp_site: Dict[str, Any], supabase: Client,
+                          use_ai: bool = True) -> Tuple[bool, List[Dict[str, Any]]]:
     """
-    Create default categories.
+    Create the EEAT pages (About, Contact, Privacy, Terms, Author, Sitemap)
+    and the default categories with a single WordPress batch request.
+    
+    Without site credentials the requests are simulated with logs.
     
-    In a real implementation, this would make REST API calls to WordPress.
-    Returns a list of created category objects.
+    Returns (whether every page was created, list of created category objects).
     """
-    print(f"{BLUE}Creating categories for {wp_site['domain']}{ENDC}")
+    print(f"{BLUE}Creating EEAT pages and categories for {wp_site['domain']}{ENDC}")
     
-    categories = []
+    page_requests = eeat_page_requests(wp_site, supabase)
+    sub_requests = page_requests + category_requests()
     
-    for category_name in DEFAULT_CATEGORIES:
-        print(f"{YELLOW}Creating category: {category_name}{ENDC}")
-        
-        # Simulate API call to create category
-        # In production, this would be:
-        # response = requests.post(
-        #     f"{wp_site['url']}/wp-json/wp/v2/categories",
-        #     auth=(wp_site['username'], wp_site['app_password']),
-        #     json={
-        #         "name": category_name,
-        #         "slug": category_name.lower().replace(" & ", "-").replace(" ", "-")
-        #     }
-        # )
+    if has_wp_credentials(wp_site):
+        try:
+            responses = wp_batch_request(wp_site, sub_requests)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"{RED}Error creating pages and categories: {e}{ENDC}")
+            return False, []
+    else:
+        # Simulate responses, with category IDs numbered from 1
+        responses = [{"status": 201, "body": {}} for _ in page_requests] + [
+            {"status": 201, "body": {"id": i}}
+            for i, _ in enumerate(DEFAULT_CATEGORIES, 1)
+        ]
+    
+    # Fan the batch responses back out to the individual pages and categories
+    page_responses = responses[:len(page_requests)]
+    category_responses = responses[len(page_requests):]
+    
+    # Collect the per-item log lines and write them in one go
+    lines = []
+    
+    pages_created = True
+    for page, result in zip(EEAT_PAGES, page_responses):
+        if result.get("status", 500) < 400:
+            lines.append(f"{GREEN}Created page: {page['title']}{ENDC}")
+        else:
+            lines.append(f"{RED}Failed to create page: {page['title']}{ENDC}")
+            pages_created = False
+    
+    categories = []
+    for prepared, result in zip(DEFAULT_CATEGORIES_PREPARED, category_responses):
+        category_name = prepared["name"]
+        if result.get("status", 500) >= 400:
+            lines.append(f"{RED}Failed to create category: {category_name}{ENDC}")
+            continue
         
-        # Simulate response with category ID
-        category_id = len(categories) + 1
         category = {
-            "id": category_id,
+            "id": result["body"]["id"],
             "name": category_name,
-            "slug": category_name.lower().replace(" & ", "-").replace(" ", "-")
+            "slug": prepared["slug"]
         }
         categories.append(category)
-        
-        print(f"{GREEN}Created category: {category_name} (ID: {category_id}){ENDC}")
-        
-        # Simulate a delay for realism
-        time.sleep(0.5)
+        lines.append(f"{GREEN}Created category: {category_name} (ID: {category['id']}){ENDC}")
+    
+    print("\n".join(lines))
     
-    return categories
+    return pages_created, categories
 
 
-def generate_pillar_post(category: Dict[str, Any], wp_site: Dict[str, Any], 
-                         supabase: Client, use_ai: bool = True) -> str:
+@lru_cache(maxsize=128)
+def _get_strategic_plan(supabase: Client, site_id: str) -> Optional[Dict[str, Any]]:
     """
-    Generate a pillar post (2500-3000 words) for a category.
+    Look up a site's strategic plan, caching the result for the process.
     
-    In a real implementation, this would:
-    1. Create a strategic plan if needed
-    2. Create a content_piece record
-    3. Queue the content generation pipeline
-    
-    Returns the content_piece ID.
+    Call _get_strategic_plan.cache_clear() after inserting a strategic plan.
+    """
+    response = supabase.table("strategic_plans").select("id,niche,audience").eq("wordpress_site_id", site_id).execute()
+    return response.data[0] if response.data else None
+
+
+def strategic_plan_data(wp_site: Dict[str, Any], niche: str) -> Dict[str, Any]:
+    """Build the default strategic plan for a site without one."""
+    return {
+        "domain": wp_site['domain'],
+        "audience": "general audience",
+        "tone": "informative",
+        "niche": niche,
+        "goal": "educate readers",
+        "wordpress_site_id": wp_site['id']
+    }
+
+
+def get_strategic_plan_id(wp_site: Dict[str, Any], niche: str, supabase: Client) -> str:
+    """
+    Get the site's strategic plan ID, creating a plan for the given niche if
+    the site has none yet.
     """
-    print(f"{BLUE}Generating pillar post for category: {category['name']}{ENDC}")
-    
-    # Get or create a strategic plan for this site
-    strategic_plan_id = None
     try:
-        response = supabase.table("strategic_plans").select("id").eq("wordpress_site_id", wp_site['id']).execute()
-        if response.data:
-            strategic_plan_id = response.data[0]["id"]
-        else:
-            # Create a new strategic plan
-            site_name = wp_site['domain'].split('.')[0].title()
-            plan_data = {
-                "domain": wp_site['domain'],
-                "audience": "general audience",
-                "tone": "informative",
-                "niche": category['name'],
-                "goal": "educate readers",
-                "wordpress_site_id": wp_site['id']
-            }
-            response = supabase.table("strategic_plans").insert(plan_data).execute()
-            strategic_plan_id = response.data[0]["id"]
+        plan = _get_strategic_plan(supabase, wp_site['id'])
+        if plan:
+            return plan["id"]
+        
+        # Create a new strategic plan
+        plan_data = strategic_plan_data(wp_site, niche)
+        response = supabase.table("strategic_plans").insert(plan_data).execute()
+        _get_strategic_plan.cache_clear()
+        return response.data[0]["id"]
     except Exception as e:
         print(f"{RED}Error with strategic plan: {e}{ENDC}")
         # Generate a UUID for testing purposes
-        strategic_plan_id = str(uuid.uuid4())
-    
-    # Create a content piece for the pillar post
-    content_id = str(uuid.uuid4())
-    title = f"Ultimate Guide to {category['name']}"
-    slug = f"ultimate-guide-{category['slug']}"
-    
-    try:
-        content_data = {
-            "id": content_id,
-            "title": title,
-            "slug": slug,
+        return str(uuid.uuid4())
+
+
+def pillar_post_row(category: Dict[str, Any], strategic_plan_id: Optional[str]) -> Dict[str, Any]:
+    """Build the content_pieces row for a category's pillar post (2500-3000 words)."""
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Ultimate Guide to {category['name']}",
+        "slug": f"ultimate-guide-{category['slug']}",
+        "status": "draft",
+        "strategic_plan_id": strategic_plan_id,
+        "created_at": datetime.now().isoformat(),
+        "is_pillar": True,
+        "category_id": category['id']
+    }
+
+
+def supporting_post_rows(pillar_id: str, category: Dict[str, Any], strategic_plan_id: Optional[str],
+                         count: int = 5) -> List[Dict[str, Any]]:
+    """Build the content_pieces rows for a pillar's supporting posts."""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Supporting Article #{i} for {category['name']}",
+            "slug": f"supporting-{i}-{category['slug']}",
             "status": "draft",
             "strategic_plan_id": strategic_plan_id,
             "created_at": datetime.now().isoformat(),
-            "is_pillar": True,
+            "is_pillar": False,
+            "pillar_id": pillar_id,
             "category_id": category['id']
         }
-        
-        supabase.table("content_pieces").insert(content_data).execute()
-        print(f"{GREEN}Created pillar post: {title} (ID: {content_id}){ENDC}")
-        
-        # Queue the SEO agent to start the content pipeline
-        agent_task_id = str(uuid.uuid4())
-        create_agent_task("seo-agent", content_id, {"plan_id": strategic_plan_id}, supabase)
-        
-    except Exception as e:
-        print(f"{YELLOW}Simulating content creation due to error: {e}{ENDC}")
+        for i in range(1, count + 1)
+    ]
+
+
+def content_cluster_rows(category: Dict[str, Any], strategic_plan_id: Optional[str],
+                         count: int = 5) -> List[Dict[str, Any]]:
+    """Build a category's pillar post row followed by its supporting post rows."""
+    # Content IDs are generated locally, so the supporting posts can reference
+    # the pillar before anything is inserted
+    pillar = pillar_post_row(category, strategic_plan_id)
+    return [pillar] + supporting_post_rows(pillar["id"], category, strategic_plan_id, count)
+
+
+def scaffold_content(supabase: Client, wp_site: Dict[str, Any], niche: str,
+                     rows: List[Dict[str, Any]]) -> str:
+    """
+    Store the content pieces and queue their SEO agent tasks in one
+    transaction with the scaffold_content RPC, which also creates the site's
+    strategic plan if it has none.
     
-    return content_id
+    Returns the strategic plan ID.
+    """
+    response = supabase.rpc(
+        "scaffold_content",
+        {
+            "p_site_id": wp_site['id'],
+            "p_plan": strategic_plan_data(wp_site, niche),
+            "p_rows": rows
+        }
+    ).execute()
+    _get_strategic_plan.cache_clear()
+    return response.data
 
 
-def generate_supporting_posts(pillar_id: str, category: Dict[str, Any], 
-                             wp_site: Dict[str, Any], supabase: Client,
-                             count: int = 5, use_ai: bool = True) -> List[str]:
+def _save_content_separately(supabase: Client, wp_site: Dict[str, Any], niche: str,
+                             rows: List[Dict[str, Any]]) -> bool:
     """
-    Generate supporting posts for a pillar post.
+    Fallback for scaffold_content: resolve the plan, bulk insert the rows and
+    bulk insert the SEO agent tasks as separate requests.
     
-    Returns a list of content_piece IDs.
+    Returns whether the content pieces were stored.
     """
-    print(f"{BLUE}Generating {count} supporting posts for pillar in {category['name']}{ENDC}")
+    strategic_plan_id = get_strategic_plan_id(wp_site, niche, supabase)
+    for row in rows:
+        row["strategic_plan_id"] = strategic_plan_id
     
-    content_ids = []
+    try:
+        supabase.table("content_pieces").insert(rows, returning="minimal").execute()
+    except Exception as e:
+        print(f"{YELLOW}Simulating content creation due to error: {e}{ENDC}")
+        return False
     
-    # Get the strategic plan ID from the pillar post
-    strategic_plan_id = None
+    # Queue the SEO agent to start the content pipeline for every post
+    seo_tasks = [("seo-agent", row["id"], {"plan_id": strategic_plan_id}) for row in rows]
     try:
-        response = supabase.table("content_pieces").select("strategic_plan_id").eq("id", pillar_id).execute()
-        if response.data:
-            strategic_plan_id = response.data[0]["strategic_plan_id"]
-    except Exception:
-        # Generate a UUID for testing purposes
-        strategic_plan_id = str(uuid.uuid4())
+        create_agent_tasks(seo_tasks, supabase, return_rows=False)
+    except Exception as e:
+        print(f"{YELLOW}Simulating SEO task creation due to error: {e}{ENDC}")
     
-    for i in range(1, count + 1):
-        content_id = str(uuid.uuid4())
-        title = f"Supporting Article #{i} for {category['name']}"
-        slug = f"supporting-{i}-{category['slug']}"
-        
-        try:
-            content_data = {
-                "id": content_id,
-                "title": title,
-                "slug": slug,
-                "status": "draft",
-                "strategic_plan_id": strategic_plan_id,
-                "created_at": datetime.now().isoformat(),
-                "is_pillar": False,
-                "pillar_id": pillar_id,
-                "category_id": category['id']
-            }
-            
-            supabase.table("content_pieces").insert(content_data).execute()
-            print(f"{GREEN}Created supporting post: {title} (ID: {content_id}){ENDC}")
-            
-            # Queue the SEO agent to start the content pipeline
-            create_agent_task("seo-agent", content_id, {"plan_id": strategic_plan_id}, supabase)
-            
-            content_ids.append(content_id)
-            
-        except Exception as e:
-            print(f"{YELLOW}Simulating supporting content creation due to error: {e}{ENDC}")
-            content_ids.append(content_id)
-        
-        # Simulate a delay for realism
-        time.sleep(0.2)
+    return True
+
+
+async def generate_content_clusters(categories: List[Dict[str, Any]], wp_site: Dict[str, Any],
+                                    supabase: Client, use_ai: bool = True) -> List[str]:
+    """
+    Generate pillar + supporting posts for every category and queue the SEO
+    agent for each of them.
+    
+    Everything is written in one scaffold_content RPC call; if the function
+    is unavailable, with one bulk insert per table.
+    
+    Returns the content piece IDs.
+    """
+    all_rows = []
+    for category in categories:
+        # The strategic plan ID is filled in when the rows are stored
+        all_rows.extend(content_cluster_rows(category, None))
+    
+    print("\n".join(
+        f"{BLUE}Generating pillar post and 5 supporting posts for category: {category['name']}{ENDC}"
+        for category in categories
+    ))
+    
+    # The site shares one strategic plan, named after the first category
+    niche = categories[0]['name']
+    try:
+        await asyncio.to_thread(scaffold_content, supabase, wp_site, niche, all_rows)
+        stored = True
+    except Exception as e:
+        print(f"{YELLOW}scaffold_content RPC failed ({e}); saving with separate requests{ENDC}")
+        stored = await asyncio.to_thread(_save_content_separately, supabase, wp_site, niche, all_rows)
+    
+    if stored:
+        print("\n".join(
+            f"{GREEN}Created {'pillar post' if row['is_pillar'] else 'supporting post'}: "
+            f"{row['title']} (ID: {row['id']}){ENDC}"
+            for row in all_rows
+        ))
     
-    return content_ids
+    return [row["id"] for row in all_rows]
 
 
-def scaffold_wordpress_site(site_id: str, use_ai: bool = True) -> bool:
+async def scaffold_wordpress_site_async(site_id: str, use_ai: bool = True) -> bool:
     """
     Main function to scaffold a WordPress site.
     
     1. Install/activate plugins
-    2. Create EEAT pages
-    3. Create categories
-    4. Generate pillar + supporting posts
+    2. Create EEAT pages and 3. categories (one batch request)
+    4. Generate pillar + supporting posts (one RPC call)
     """
     print(f"{BOLD}WordPress Site Scaffold Agent{ENDC}")
     print("=" * 60)
@@ -444,72 +577,50 @@ def scaffold_wordpress_site(site_id: str, use_ai: bool = True) -> bool:
     supabase = get_supabase_client()
     
     # Get WordPress site details
-    wp_site = get_wordpress_site(site_id, supabase)
+    wp_site = await asyncio.to_thread(get_wordpress_site, site_id, supabase)
     print(f"{GREEN}Scaffolding WordPress site: {wp_site['domain']} ({wp_site['url']}){ENDC}")
     
     # Create agent status record
     agent_task_id = str(uuid.uuid4())
-    create_agent_task("site-scaffold-agent", site_id, {}, supabase)
-    update_agent_status(agent_task_id, "processing", supabase=supabase)
+    await asyncio.to_thread(create_agent_task, "site-scaffold-agent", site_id, {}, supabase)
+    await asyncio.to_thread(update_agent_status, agent_task_id, "processing", supabase=supabase)
     
     # Update scaffold status to in_progress
-    update_scaffold_status(site_id, "in_progress", supabase)
+    await asyncio.to_thread(update_scaffold_status, site_id, "in_progress", supabase)
+    
+    async def fail(error: str) -> bool:
+        await asyncio.to_thread(
+            update_agent_status, agent_task_id, "error", errors=[error], supabase=supabase
+        )
+        await asyncio.to_thread(update_scaffold_status, site_id, "failed", supabase)
+        return False
     
     try:
         # Step 1: Install and activate plugins
-        if not install_plugins(wp_site, use_ai):
-            update_agent_status(
-                agent_task_id, 
-                "error", 
-                errors=["plugin_installation_failed"], 
-                supabase=supabase
-            )
-            update_scaffold_status(site_id, "failed", supabase)
-            return False
+        if not await asyncio.to_thread(install_plugins, wp_site, use_ai):
+            return await fail("plugin_installation_failed")
         
-        # Step 2: Create EEAT pages
-        if not create_eeat_pages(wp_site, use_ai):
-            update_agent_status(
-                agent_task_id, 
-                "error", 
-                errors=["eeat_pages_creation_failed"], 
-                supabase=supabase
-            )
-            update_scaffold_status(site_id, "failed", supabase)
-            return False
+        # Steps 2 and 3: Create EEAT pages and categories in one batch
+        pages_created, categories = await asyncio.to_thread(
+            create_site_structure, wp_site, supabase, use_ai
+        )
+        if not pages_created:
+            return await fail("eeat_pages_creation_failed")
         
-        # Step 3: Create categories
-        categories = create_categories(wp_site, use_ai)
         if not categories:
-            update_agent_status(
-                agent_task_id, 
-                "error", 
-                errors=["categories_creation_failed"], 
-                supabase=supabase
-            )
-            update_scaffold_status(site_id, "failed", supabase)
-            return False
+            return await fail("categories_creation_failed")
         
         # Step 4: Generate pillar posts + supporting content for each category
-        for category in categories:
-            # Create pillar post
-            pillar_id = generate_pillar_post(category, wp_site, supabase, use_ai)
-            
-            # Create 5 supporting posts
-            supporting_ids = generate_supporting_posts(
-                pillar_id, category, wp_site, supabase, count=5, use_ai=use_ai
-            )
-            
-            print(f"{GREEN}Created content cluster for {category['name']}: " 
-                  f"1 pillar + {len(supporting_ids)} supporting posts{ENDC}")
+        await generate_content_clusters(categories, wp_site, supabase, use_ai)
         
         # Update scaffold status to done
-        update_scaffold_status(
-            site_id, "done", supabase, scaffolded_at=datetime.now()
+        await asyncio.to_thread(
+            update_scaffold_status, site_id, "done", supabase, scaffolded_at=datetime.now()
         )
         
         # Update agent status to done
-        update_agent_status(
+        await asyncio.to_thread(
+            update_agent_status,
             agent_task_id, 
             "done", 
             output={"message": f"Successfully scaffolded WordPress site {wp_site['domain']}"},
@@ -521,14 +632,12 @@ def scaffold_wordpress_site(site_id: str, use_ai: bool = True) -> bool:
         
     except Exception as e:
         print(f"{RED}Error scaffolding WordPress site: {e}{ENDC}")
-        update_agent_status(
-            agent_task_id, 
-            "error", 
-            errors=[str(e)], 
-            supabase=supabase
-        )
-        update_scaffold_status(site_id, "failed", supabase)
-        return False
+        return await fail(str(e))
+
+
+def scaffold_wordpress_site(site_id: str, use_ai: bool = True) -> bool:
+    """Synchronous entry point for scaffold_wordpress_site_async."""
+    return asyncio.run(scaffold_wordpress_site_async(site_id, use_ai))
 
 
 def main():
@@ -539,7 +648,7 @@ def main():
     
     args = parser.parse_args()
     
-    return 0 if scaffold_wordpress_site(args.site_id, not args.no_ai) else 1
+    return 0 if asyncio.run(scaffold_wordpress_site_async(args.site_id, not args.no_ai)) else 1
 
 
 if __name__ == "__main__":
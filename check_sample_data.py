@@ -6,8 +6,10 @@ This script checks the sample data in all Supabase tables.
 """
 
 import os
-import json
 import sys
+from functools import lru_cache
+
+import orjson
 from dotenv import load_dotenv
 from supabase import create_client
 
@@ -19,51 +21,85 @@ BLUE = "\033[94m"
 ENDC = "\033[0m"
 BOLD = "\033[1m"
 
-# Load environment variables
-load_dotenv()
+# Columns to fetch per table; content_pieces skips the large draft_text and
+# final_text fields so they never leave the database. Only columns present in
+# every schema (simple_tables.sql and before any migration) are listed, since
+# selecting a missing column fails the whole query. Other tables use "*".
+TABLE_COLUMNS = {
+    "content_pieces": "id,strategic_plan_id,title,slug,status,created_at,updated_at",
+}
+
+# Cell formatters for display_table_data, by value type (default: str)
+_FORMATTERS = {
+    dict: lambda value: orjson.dumps(value).decode(),
+    list: lambda value: orjson.dumps(value).decode(),
+    type(None): lambda value: f"{YELLOW}NULL{ENDC}",
+}
+
+# Load environment variables, unless they are already set
+if not os.environ.get("SUPABASE_URL"):
+    load_dotenv()
 
+_SUPABASE_URL = os.getenv("SUPABASE_URL")
+_SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+@lru_cache(maxsize=1)
 def get_supabase_client():
-    """Create and return a Supabase client."""
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
-    
-    if not url or not key:
+    """Create the Supabase client once and reuse it."""
+    if not _SUPABASE_URL or not _SUPABASE_KEY:
         print(f"{RED}Error: SUPABASE_URL and SUPABASE_KEY must be set in .env file{ENDC}")
         sys.exit(1)
     
-    return create_client(url, key)
+    return create_client(_SUPABASE_URL, _SUPABASE_KEY)
+
+def iter_table_rows(supabase, table_name, limit=None, page_size=100):
+    """
+    Yield rows from a table page by page, fetching only TABLE_COLUMNS.
+    
+    Stops after `limit` rows when given.
+    """
+    columns = TABLE_COLUMNS.get(table_name, "*")
+    offset = 0
+    while limit is None or offset < limit:
+        size = page_size if limit is None else min(page_size, limit - offset)
+        response = (
+            supabase.table(table_name)
+            .select(columns)
+            .range(offset, offset + size - 1)
+            .execute()
+        )
+        yield from response.data
+        
+        if len(response.data) < size:
+            return
+        offset += size
 
 def display_table_data(supabase, table_name, limit=5):
     """Display data from a table."""
     try:
-        response = supabase.table(table_name).select("*").limit(limit).execute()
-        print(f"{BOLD}{table_name}{ENDC} ({len(response.data)} records):")
+        rows = list(iter_table_rows(supabase, table_name, limit))
+        print(f"{BOLD}{table_name}{ENDC} ({len(rows)} records):")
         
-        if not response.data:
+        if not rows:
             print(f"  {YELLOW}No data found{ENDC}")
             return
         
-        # Determine columns to display (skip large text fields)
-        skip_columns = ["draft_text", "final_text"]
-        sample_record = response.data[0]
-        columns = [col for col in sample_record.keys() if col not in skip_columns]
+        columns = list(rows[0].keys())
         
         # Display each record
-        for i, record in enumerate(response.data):
-            print(f"\n  {BLUE}Record #{i+1}:{ENDC}")
+        for i, record in enumerate(rows):
+            lines = [f"\n  {BLUE}Record #{i+1}:{ENDC}"]
             for col in columns:
                 # Format the value nicely
                 value = record.get(col)
-                if isinstance(value, dict) or isinstance(value, list):
-                    value = json.dumps(value)
-                elif value is None:
-                    value = f"{YELLOW}NULL{ENDC}"
+                value = _FORMATTERS.get(type(value), str)(value)
                 
                 # Truncate long values
-                if isinstance(value, str) and len(value) > 50:
+                if len(value) > 50:
                     value = value[:47] + "..."
-                    
-                print(f"    {col}: {value}")
+                
+                lines.append(f"    {col}: {value}")
+            print("\n".join(lines))
     
     except Exception as e:
         print(f"  {RED}Error: {e}{ENDC}")
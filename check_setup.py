@@ -15,7 +15,8 @@ Options:
 """
 
 import argparse
-import importlib
+import asyncio
+import importlib.util
 import os
 import subprocess
 import sys
@@ -30,7 +31,7 @@ ENDC = "\033[0m"
 BOLD = "\033[1m"
 
 # Required packages (from requirements.txt)
-REQUIRED_PACKAGES = [
+REQUIRED_PACKAGES = (
     "supabase",
     "openai",
     "pydantic",
@@ -42,7 +43,26 @@ REQUIRED_PACKAGES = [
     "python-slugify",
     "tenacity",
     "tiktoken",
-]
+    "httpx",
+)
+
+# Files a complete checkout should contain
+EXPECTED_FILES = (
+    "agents/shared/schemas.py",
+    "agents/shared/utils.py",
+    "agents/seo-agent/index.py",
+    "run_agent.py",
+    "orchestrator.py",
+    "requirements.txt",
+    ".env.example",
+    "supabase_schema.sql",
+)
+
+# Import names of required packages that differ from the distribution name
+PACKAGE_MODULES = {
+    "python-dotenv": "dotenv",
+    "python-slugify": "slugify",
+}
 
 # Required environment variables
 REQUIRED_ENV_VARS = {
@@ -63,27 +83,45 @@ OPTIONAL_ENV_VARS = {
 }
 
 
+# Preformatted, color-coded label for each status
+_STATUS_LABELS = {
+    status: f"[{color}{status}{ENDC}]"
+    for status, color in [
+        ("OK", GREEN),
+        ("WARNING", YELLOW),
+        ("ERROR", RED),
+        ("INFO", BLUE),
+        ("SKIPPED", ""),
+    ]
+}
+
+# Status lines waiting for flush_status()
+_STATUS_LINES: List[str] = []
+
+
 def print_status(message: str, status: str, verbose: bool = False, details: str = None):
     """
-    Print a status message with color coding.
+    Buffer a status message with color coding; flush_status() prints it.
     
     Args:
         message: The message to print
-        status: "OK", "WARNING", "ERROR", or "INFO"
+        status: "OK", "WARNING", "ERROR", "INFO" or "SKIPPED"
         verbose: Whether to show detailed information
         details: Additional details to show if verbose is True
     """
-    status_color = {
-        "OK": GREEN,
-        "WARNING": YELLOW,
-        "ERROR": RED,
-        "INFO": BLUE
-    }.get(status, "")
-    
-    print(f"{message:<50} [{status_color}{status}{ENDC}]")
+    label = _STATUS_LABELS.get(status) or f"[{status}{ENDC}]"
+    _STATUS_LINES.append(f"{message:<50} {label}")
     
     if verbose and details:
-        print(f"  {details}")
+        _STATUS_LINES.append(f"  {details}")
+
+
+def flush_status():
+    """Write the buffered status lines to stdout in one go."""
+    if _STATUS_LINES:
+        sys.stdout.write("\n".join(_STATUS_LINES) + "\n")
+        sys.stdout.flush()
+        _STATUS_LINES.clear()
 
 
 def check_python_version() -> bool:
@@ -93,7 +131,7 @@ def check_python_version() -> bool:
     Returns:
         bool: True if the Python version is compatible, False otherwise
     """
-    major, minor, _ = sys.version_info
+    major, minor = sys.version_info[:2]
     
     if major >= 3 and minor >= 10:
         print_status("Python version", "OK", details=f"Python {major}.{minor}")
@@ -113,11 +151,12 @@ def check_packages() -> Tuple[List[str], List[str]]:
     installed = []
     missing = []
     
+    # find_spec locates each module without importing (executing) it
     for package in REQUIRED_PACKAGES:
-        try:
-            importlib.import_module(package.replace("-", "_"))
+        module = PACKAGE_MODULES.get(package, package.replace("-", "_"))
+        if importlib.util.find_spec(module) is not None:
             installed.append(package)
-        except ImportError:
+        else:
             missing.append(package)
     
     return installed, missing
@@ -156,66 +195,101 @@ def check_env_vars() -> Tuple[List[str], List[str], List[str]]:
     return set_vars, missing_vars, optional_vars_set
 
 
-def check_supabase_connection() -> bool:
+async def check_supabase_connection(client) -> Tuple[str, str]:
     """
     Check if we can connect to Supabase.
     
+    Counts strategic_plans with a HEAD request to the REST API, so the
+    supabase SDK does not have to be imported.
+    
+    Args:
+        client: httpx.AsyncClient to send the request with
+    
     Returns:
-        bool: True if connection successful, False otherwise
+        Tuple of (status, details)
     """
-    if not os.environ.get("SUPABASE_URL") or not os.environ.get("SUPABASE_KEY"):
-        print_status("Supabase connection", "SKIPPED", details="Missing credentials")
-        return False
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY")
+    if not url or not key:
+        return "SKIPPED", "Missing credentials"
     
     try:
-        from supabase import create_client
-        
-        supabase = create_client(
-            os.environ.get("SUPABASE_URL"),
-            os.environ.get("SUPABASE_KEY")
+        response = await client.head(
+            f"{url.rstrip('/')}/rest/v1/strategic_plans",
+            params={"select": "id"},
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+                "Prefer": "count=exact"
+            }
         )
+        response.raise_for_status()
         
-        # Try a simple query
-        response = supabase.table("strategic_plans").select("count", count="exact").execute()
-        
-        print_status("Supabase connection", "OK", details=f"Connected, found {response.count} strategic plans")
-        return True
+        # Content-Range looks like "*/12" or "0-11/12"
+        count = response.headers.get("content-range", "*/?").rsplit("/", 1)[-1]
+        return "OK", f"Connected, found {count} strategic plans"
     except Exception as e:
-        print_status("Supabase connection", "ERROR", details=str(e))
-        return False
+        return "ERROR", str(e)
 
 
-def check_openai_connection() -> bool:
+async def check_openai_connection(client) -> Tuple[str, str]:
     """
     Check if we can connect to OpenAI API.
     
+    Lists the available models, which costs no tokens, and warns if the
+    key cannot use any GPT model.
+    
+    Args:
+        client: httpx.AsyncClient to send the request with
+    
     Returns:
-        bool: True if connection successful, False otherwise
+        Tuple of (status, details)
     """
-    if not os.environ.get("OPENAI_API_KEY"):
-        print_status("OpenAI connection", "SKIPPED", details="Missing API key")
-        return False
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return "SKIPPED", "Missing API key"
     
     try:
-        import openai
-        
-        client = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-        
-        # Try a simple completion
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant."},
-                {"role": "user", "content": "Say 'Connection successful' in 5 words or less."}
-            ],
-            max_tokens=10
+        response = await client.get(
+            "https://api.openai.com/v1/models",
+            headers={"Authorization": f"Bearer {api_key}"}
         )
+        response.raise_for_status()
         
-        print_status("OpenAI connection", "OK", details=f"Response: {response.choices[0].message.content}")
-        return True
+        models = response.json()["data"]
+        if not any(model["id"].startswith("gpt") for model in models):
+            return "WARNING", f"Connected, but none of the {len(models)} models is a GPT model"
+        return "OK", f"Connected, {len(models)} models available"
     except Exception as e:
-        print_status("OpenAI connection", "ERROR", details=str(e))
-        return False
+        return "ERROR", str(e)
+
+
+async def check_connections(supabase: bool, openai: bool) -> Dict[str, Tuple[str, str]]:
+    """
+    Run the selected connection checks concurrently.
+    
+    Args:
+        supabase: Whether to check the Supabase connection
+        openai: Whether to check the OpenAI connection
+    
+    Returns:
+        Dict mapping the check name to its (status, details)
+    """
+    if not (supabase or openai):
+        return {}
+    
+    import httpx
+    
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        checks = {}
+        if supabase:
+            checks["Supabase connection"] = check_supabase_connection(client)
+        if openai:
+            checks["OpenAI connection"] = check_openai_connection(client)
+        
+        results = await asyncio.gather(*checks.values())
+    
+    return dict(zip(checks, results))
 
 
 def check_file_structure() -> Tuple[List[str], List[str]]:
@@ -225,22 +299,21 @@ def check_file_structure() -> Tuple[List[str], List[str]]:
     Returns:
         Tuple of (existing_files, missing_files)
     """
-    expected_files = [
-        "agents/shared/schemas.py",
-        "agents/shared/utils.py",
-        "agents/seo-agent/index.py",
-        "run_agent.py",
-        "orchestrator.py",
-        "requirements.txt",
-        ".env.example",
-        "supabase_schema.sql"
-    ]
-    
     existing = []
     missing = []
     
-    for file_path in expected_files:
-        if os.path.exists(file_path):
+    # List each parent directory once instead of stat-ing every file
+    directory_entries = {}
+    for file_path in EXPECTED_FILES:
+        directory, name = os.path.split(file_path)
+        if directory not in directory_entries:
+            try:
+                with os.scandir(directory or ".") as entries:
+                    directory_entries[directory] = {entry.name for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                directory_entries[directory] = set()
+        
+        if name in directory_entries[directory]:
             existing.append(file_path)
         else:
             missing.append(file_path)
@@ -323,6 +396,7 @@ def main():
     if missing_packages:
         print_status(f"Missing packages ({len(missing_packages)})", "ERROR", 
                     True, ", ".join(missing_packages))
+        flush_status()
         
         if args.fix:
             install_missing_packages(missing_packages)
@@ -337,6 +411,7 @@ def main():
     if missing_vars:
         print_status(f"Missing environment variables ({len(missing_vars)})", "ERROR", 
                     True, ", ".join(missing_vars))
+        flush_status()
         
         if args.fix:
             create_env_file()
@@ -357,11 +432,15 @@ def main():
                     True, ", ".join(missing_files))
     
     # Check connections only if required packages are installed
-    if "supabase" in installed_packages and "SUPABASE_URL" in set_vars:
-        check_supabase_connection()
-    
-    if "openai" in installed_packages and "OPENAI_API_KEY" in set_vars:
-        check_openai_connection()
+    http_ok = "httpx" in installed_packages
+    connections = asyncio.run(check_connections(
+        supabase=http_ok and "supabase" in installed_packages and "SUPABASE_URL" in set_vars,
+        openai=http_ok and "openai" in installed_packages and "OPENAI_API_KEY" in set_vars
+    ))
+    for name, (status, details) in connections.items():
+        print_status(name, status, details=details)
+    
+    flush_status()
     
     # Summary
     print("\n" + "=" * 60)
@@ -2,7 +2,8 @@
 
 import os
 from dotenv import load_dotenv
-from supabase import create_client
+
+from agents.shared.utils import get_supabase_client
 
 # Load environment variables
 load_dotenv()
@@ -22,7 +23,7 @@ print(f"URL: {url}")
 
 try:
     # Connect to Supabase
-    supabase = create_client(url, key)
+    supabase = get_supabase_client()
     
     # Try to get strategic_plans table to confirm it exists
     response = supabase.table("strategic_plans").select("id").limit(1).execute()
@@ -7,8 +7,6 @@ This script uses the service role key to create tables in Supabase.
 
 import os
 import sys
-from dotenv import load_dotenv
-from supabase import create_client
 import json
 
 # ANSI colors
@@ -19,11 +17,15 @@ BLUE = "\033[94m"
 ENDC = "\033[0m"
 BOLD = "\033[1m"
 
-# Load environment variables
-load_dotenv()
-
 def get_admin_supabase_client():
     """Create and return a Supabase client with admin privileges."""
+    # Imported here so the script only loads supabase when it connects
+    from dotenv import load_dotenv
+    from supabase import create_client
+    
+    # Load environment variables
+    load_dotenv()
+    
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_KEY")  # Use service key for admin privileges
     
@@ -34,26 +36,49 @@ def get_admin_supabase_client():
     print(f"Connecting to {url} with service role key")
     return create_client(url, key)
 
+def count_table_rows(supabase, tables):
+    """
+    Return {table: row count} for the given tables, with None for missing ones.
+    
+    Uses the check_tables_exist RPC (one request) when it is installed and
+    falls back to probing each table.
+    """
+    try:
+        response = supabase.rpc("check_tables_exist", {"names": tables}).execute()
+        return {
+            row["table_name"]: row["row_count"] if row["table_exists"] else None
+            for row in response.data
+        }
+    except Exception as e:
+        print(f"{YELLOW}check_tables_exist RPC failed ({e}); probing tables one by one{ENDC}")
+    
+    counts = {}
+    for table in tables:
+        try:
+            response = supabase.table(table).select("count", count="exact").execute()
+            counts[table] = response.count
+        except Exception:
+            counts[table] = None
+    return counts
+
 def check_available_tables(supabase):
     """Check what tables are currently available."""
-    try:
-        # Query for strategic_plans to verify connection
-        response = supabase.table("strategic_plans").select("count", count="exact").execute()
-        print(f"{GREEN}Successfully connected to strategic_plans table{ENDC}")
-        print(f"Found {response.count} records")
-        
-        print(f"\n{BLUE}Checking for other tables...{ENDC}")
-        tables_to_check = ["content_pieces", "keywords", "agent_status"]
-        
-        for table in tables_to_check:
-            try:
-                response = supabase.table(table).select("count", count="exact").execute()
-                print(f"  {table}: {GREEN}exists{ENDC} ({response.count} rows)")
-            except Exception as e:
-                print(f"  {table}: {RED}does not exist{ENDC}")
+    counts = count_table_rows(supabase, ["strategic_plans", "content_pieces", "keywords", "agent_status"])
     
-    except Exception as e:
-        print(f"{RED}Error checking tables: {e}{ENDC}")
+    # strategic_plans verifies the connection
+    plan_count = counts.pop("strategic_plans")
+    if plan_count is None:
+        print(f"{RED}Error checking tables: strategic_plans is not reachable{ENDC}")
+        return
+    
+    print(f"{GREEN}Successfully connected to strategic_plans table{ENDC}")
+    print(f"Found {plan_count} records")
+    print(f"\n{BLUE}Checking for other tables...{ENDC}")
+    for table, count in counts.items():
+        if count is None:
+            print(f"  {table}: {RED}does not exist{ENDC}")
+        else:
+            print(f"  {table}: {GREEN}exists{ENDC} ({count} rows)")
 
 def create_tables(supabase):
     """Create necessary tables using direct SQL."""
@@ -98,39 +123,49 @@ def create_tables(supabase):
         """
     ]
     
-    # Try different methods of executing SQL
-    try:
-        # Method 1: Using RPC with SQL
-        for i, sql in enumerate(tables_sql):
-            table_name = sql.split("CREATE TABLE IF NOT EXISTS public.")[1].split(" ")[0]
-            print(f"Creating {table_name}...")
-            
-            try:
-                # First try directly using a raw PostgreSQL query
-                response = supabase.postgrest.schema("public").execute(sql)
-                print(f"  {GREEN}Table created successfully (Method 1){ENDC}")
-            except Exception as e1:
-                print(f"  {YELLOW}Method 1 failed: {e1}{ENDC}")
-                
-                try:
-                    # Try using the pg_execute RPC function if available
-                    response = supabase.rpc("pg_execute", {"command": sql}).execute()
-                    print(f"  {GREEN}Table created successfully (Method 2){ENDC}")
-                except Exception as e2:
-                    print(f"  {YELLOW}Method 2 failed: {e2}{ENDC}")
-                    
-                    try:
-                        # Try using a custom RPC function (if you've created one)
-                        response = supabase.rpc("execute_sql", {"sql": sql}).execute()
-                        print(f"  {GREEN}Table created successfully (Method 3){ENDC}")
-                    except Exception as e3:
-                        print(f"  {RED}Failed to create table using all methods{ENDC}")
-                        print(f"  Error details: {e1}, {e2}, {e3}")
-    
-    except Exception as e:
-        print(f"{RED}Error executing SQL: {e}{ENDC}")
+    # Find a working way to execute SQL once, then use it for every table
+    executor = _detect_sql_executor(supabase)
+    if executor is None:
+        print(f"{RED}No SQL execution method is available{ENDC}")
         print("This suggests that direct SQL execution might not be allowed.")
         print("Try creating tables through the Supabase dashboard SQL Editor.")
+        return
+    
+    method, execute_sql = executor
+    for sql in tables_sql:
+        table_name = sql.split("CREATE TABLE IF NOT EXISTS public.")[1].split(" ")[0]
+        print(f"Creating {table_name}...")
+        
+        try:
+            execute_sql(sql)
+            print(f"  {GREEN}Table created successfully ({method}){ENDC}")
+        except Exception as e:
+            print(f"  {RED}Failed to create table: {e}{ENDC}")
+
+def _detect_sql_executor(supabase):
+    """
+    Probe the SQL execution methods with a no-op query.
+    
+    Returns (method name, callable taking SQL) for the first method that
+    works, or None if none do.
+    """
+    methods = [
+        # A raw PostgreSQL query through PostgREST
+        ("Method 1", lambda sql: supabase.postgrest.schema("public").execute(sql)),
+        # The pg_execute RPC function, if available
+        ("Method 2", lambda sql: supabase.rpc("pg_execute", {"command": sql}).execute()),
+        # A custom execute_sql RPC function (if you've created one)
+        ("Method 3", lambda sql: supabase.rpc("execute_sql", {"sql": sql}).execute()),
+    ]
+    
+    for method, execute_sql in methods:
+        try:
+            execute_sql("SELECT 1;")
+            return method, execute_sql
+        except Exception as e:
+            print(f"  {YELLOW}{method} unavailable: {e}{ENDC}")
+    
+    return None
 
 def main():
     print(f"{BOLD}WordPress Content Generator - Create Tables with Admin Privileges{ENDC}")
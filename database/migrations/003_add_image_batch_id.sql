@@ -0,0 +1,13 @@
+-- Migration: 003_add_image_batch_id.sql
+-- Description: Track OpenAI Batch API submissions for the image generator agent
+
+-- Add batch tracking column to content_pieces table
+ALTER TABLE public.content_pieces
+    ADD COLUMN image_batch_id TEXT;
+
+-- Add comment for documentation
+COMMENT ON COLUMN public.content_pieces.image_batch_id IS 'OpenAI batch ID while the featured image is pending (status image_batch_submitted)';
+
+-- Create index for resuming submitted batches
+CREATE INDEX content_pieces_image_batch_id_idx ON public.content_pieces (image_batch_id)
+    WHERE image_batch_id IS NOT NULL;
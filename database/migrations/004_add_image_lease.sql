@@ -0,0 +1,12 @@
+-- Migration: 004_add_image_lease.sql
+-- Description: Lease column so only one image generator worker pays for each image
+
+-- Add lease tracking column to content_pieces table
+ALTER TABLE public.content_pieces
+    ADD COLUMN lease_expires_at TIMESTAMPTZ;
+
+-- Add comment for documentation
+COMMENT ON COLUMN public.content_pieces.lease_expires_at IS 'While status is image_generating, the time after which another worker may reclaim the piece';
+
+-- Create index for finding expired leases
+CREATE INDEX content_pieces_status_lease_idx ON public.content_pieces (status, lease_expires_at);
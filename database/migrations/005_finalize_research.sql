@@ -0,0 +1,33 @@
+-- Migration: 005_finalize_research.sql
+-- Description: Save research results in one round-trip and one transaction
+
+-- Insert research rows, mark the content piece as researched and record the
+-- agent status entry atomically
+CREATE OR REPLACE FUNCTION public.finalize_research(
+    p_content_id UUID,
+    p_rows JSONB,
+    p_agent_input JSONB,
+    p_agent_output JSONB
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF jsonb_array_length(p_rows) > 0 THEN
+        INSERT INTO public.research (content_id, excerpt, url, type, confidence)
+        SELECT p_content_id, r.excerpt, r.url, r.type, COALESCE(r.confidence, 1.0)
+        FROM jsonb_to_recordset(p_rows)
+            AS r(excerpt TEXT, url TEXT, type TEXT, confidence FLOAT);
+    END IF;
+
+    UPDATE public.content_pieces
+    SET status = 'researched'
+    WHERE id = p_content_id;
+
+    INSERT INTO public.agent_status (agent, content_id, status, input, output)
+    VALUES ('research-agent', p_content_id, 'done', p_agent_input, p_agent_output);
+END;
+$$;
+
+-- Add comment for documentation
+COMMENT ON FUNCTION public.finalize_research(UUID, JSONB, JSONB, JSONB) IS 'Called by the research agent to store research points, set the content piece status and log the agent run in one transaction';
@@ -0,0 +1,17 @@
+-- Migration: 006_agent_status_timestamp_trigger.sql
+-- Description: Let the database stamp agent_status.updated_at, so agents no longer send it
+
+-- Same function as supabase_schema.sql; recreated for databases built from supabase_tables.sql
+CREATE OR REPLACE FUNCTION public.update_timestamp()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh updated_at on every status update (created_at/updated_at already default to now on insert)
+DROP TRIGGER IF EXISTS update_agent_status_timestamp ON public.agent_status;
+CREATE TRIGGER update_agent_status_timestamp
+BEFORE UPDATE ON public.agent_status
+FOR EACH ROW EXECUTE FUNCTION public.update_timestamp();
@@ -0,0 +1,66 @@
+-- Migration: 007_scaffold_content.sql
+-- Description: Save scaffolded content pieces and their SEO tasks in one round-trip and one transaction
+
+-- Pillar/cluster columns written by the site scaffold agent
+ALTER TABLE public.content_pieces
+    ADD COLUMN IF NOT EXISTS is_pillar BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS pillar_id UUID REFERENCES public.content_pieces(id) ON DELETE SET NULL,
+    ADD COLUMN IF NOT EXISTS category_id INTEGER;
+
+-- Add comments for documentation
+COMMENT ON COLUMN public.content_pieces.is_pillar IS 'Whether this piece is the pillar post of its topic cluster';
+COMMENT ON COLUMN public.content_pieces.pillar_id IS 'Pillar post that a supporting post links back to';
+COMMENT ON COLUMN public.content_pieces.category_id IS 'WordPress category ID the post is filed under';
+
+-- Create index for loading a pillar's supporting posts
+CREATE INDEX IF NOT EXISTS content_pieces_pillar_id_idx ON public.content_pieces (pillar_id)
+    WHERE pillar_id IS NOT NULL;
+
+-- Resolve (or create) the site's strategic plan, insert the content pieces
+-- and queue an seo-agent task for each of them atomically
+CREATE OR REPLACE FUNCTION public.scaffold_content(
+    p_site_id UUID,
+    p_plan JSONB,
+    p_rows JSONB
+)
+RETURNS UUID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_plan UUID;
+BEGIN
+    SELECT id INTO v_plan
+    FROM public.strategic_plans
+    WHERE wordpress_site_id = p_site_id
+    LIMIT 1;
+
+    IF NOT FOUND THEN
+        INSERT INTO public.strategic_plans (domain, audience, tone, niche, goal, wordpress_site_id)
+        VALUES (
+            p_plan->>'domain',
+            p_plan->>'audience',
+            p_plan->>'tone',
+            p_plan->>'niche',
+            p_plan->>'goal',
+            p_site_id
+        )
+        RETURNING id INTO v_plan;
+    END IF;
+
+    -- Column types come from content_pieces itself
+    INSERT INTO public.content_pieces
+        (id, title, slug, status, strategic_plan_id, created_at, is_pillar, pillar_id, category_id)
+    SELECT r.id, r.title, r.slug, r.status, v_plan, COALESCE(r.created_at, NOW()),
+           COALESCE(r.is_pillar, FALSE), r.pillar_id, r.category_id
+    FROM jsonb_populate_recordset(NULL::public.content_pieces, p_rows) AS r;
+
+    INSERT INTO public.agent_status (agent, content_id, status, input)
+    SELECT 'seo-agent', r.id, 'queued', jsonb_build_object('plan_id', v_plan)
+    FROM jsonb_populate_recordset(NULL::public.content_pieces, p_rows) AS r;
+
+    RETURN v_plan;
+END;
+$$;
+
+-- Add comment for documentation
+COMMENT ON FUNCTION public.scaffold_content(UUID, JSONB, JSONB) IS 'Called by the site scaffold agent to store pillar and supporting posts and queue their SEO agent tasks in one transaction';
@@ -0,0 +1,28 @@
+-- Migration: 008_check_tables_exist.sql
+-- Description: Report which tables exist, with their row counts, in one round-trip
+
+-- One row per requested name; row_count is NULL when the table is missing
+CREATE OR REPLACE FUNCTION public.check_tables_exist(names TEXT[])
+RETURNS TABLE (table_name TEXT, table_exists BOOLEAN, row_count BIGINT)
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_name TEXT;
+BEGIN
+    FOREACH v_name IN ARRAY names LOOP
+        table_name := v_name;
+        table_exists := to_regclass(format('public.%I', v_name)) IS NOT NULL;
+        row_count := NULL;
+
+        IF table_exists THEN
+            EXECUTE format('SELECT count(*) FROM public.%I', v_name) INTO row_count;
+        END IF;
+
+        RETURN NEXT;
+    END LOOP;
+END;
+$$;
+
+-- Add comment for documentation
+COMMENT ON FUNCTION public.check_tables_exist(TEXT[]) IS 'Called by create_tables_admin.py to check the core tables and count their rows in one request';
@@ -0,0 +1,32 @@
+-- Migration: 009_save_final_and_log.sql
+-- Description: Save the assembled draft and its agent status entry in one round-trip and one transaction
+
+-- Store the final text, mark the content piece as assembled and record the
+-- draft assembly agent run atomically
+CREATE OR REPLACE FUNCTION public.save_final_and_log(
+    p_content_id UUID,
+    p_final_text TEXT
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE public.content_pieces
+    SET final_text = p_final_text,
+        status = 'assembled',
+        updated_at = NOW()
+    WHERE id = p_content_id;
+
+    INSERT INTO public.agent_status (content_id, agent, status, input, output)
+    VALUES (
+        p_content_id,
+        'draft-assembly-agent',
+        'done',
+        jsonb_build_object('content_id', p_content_id),
+        jsonb_build_object('length', char_length(p_final_text))
+    );
+END;
+$$;
+
+-- Add comment for documentation
+COMMENT ON FUNCTION public.save_final_and_log(UUID, TEXT) IS 'Called by the draft assembly agent to store the final text, set the content piece status and log the agent run in one transaction';
@@ -7,45 +7,48 @@ import argparse
 import os
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, Optional
-
-from dotenv import load_dotenv
-
-from agents.shared.utils import get_supabase_client
-
-# Load environment variables
-load_dotenv()
+from typing import Any, Dict, Optional, Tuple
 
 GREEN = "\033[92m"
 RED = "\033[91m"
+YELLOW = "\033[93m"
 BOLD = "\033[1m"
 ENDC = "\033[0m"
 
 
-def get_content_piece(supabase, content_id: str) -> Dict[str, Any]:
-    """Fetch content piece data."""
-    result = supabase.table("content_pieces").select("*").eq("id", content_id).execute()
-    if not result.data:
-        print(f"{RED}Content piece {content_id} not found{ENDC}")
-        sys.exit(1)
-    return result.data[0]
+def get_content_piece(supabase, content_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch content piece data, or None if it does not exist."""
+    result = supabase.table("content_pieces").select("id,title,draft_text").eq("id", content_id).execute()
+    return result.data[0] if result.data else None
 
 
 def get_headline(supabase, content_id: str) -> Optional[Dict[str, Any]]:
     """Fetch headline record if available."""
     result = (
-        supabase.table("headlines").select("*").eq("content_id", content_id).execute()
+        supabase.table("headlines").select("selected_title").eq("content_id", content_id).execute()
     )
     return result.data[0] if result.data else None
 
 
 def get_hooks(supabase, content_id: str) -> Optional[Dict[str, Any]]:
     """Fetch hook record if available."""
-    result = supabase.table("hooks").select("*").eq("content_id", content_id).execute()
+    result = supabase.table("hooks").select("main_hook,micro_hooks").eq("content_id", content_id).execute()
     return result.data[0] if result.data else None
 
 
+def fetch_assembly_inputs(
+    supabase, content_id: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Fetch the content piece, headline and hooks concurrently."""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        piece = executor.submit(get_content_piece, supabase, content_id)
+        headline = executor.submit(get_headline, supabase, content_id)
+        hooks = executor.submit(get_hooks, supabase, content_id)
+    return piece.result(), headline.result(), hooks.result()
+
+
 def assemble_content(
     piece: Dict[str, Any],
     headline: Optional[Dict[str, Any]],
@@ -55,20 +58,36 @@ def assemble_content(
     title = piece.get("title", "")
     if headline and headline.get("selected_title"):
         title = headline["selected_title"]
-    final = f"# {title}\n\n"
+    parts = [f"# {title}\n\n"]
     if hooks and hooks.get("main_hook"):
-        final += f"> {hooks['main_hook']}\n\n"
-    final += piece.get("draft_text", "")
+        parts.append(f"> {hooks['main_hook']}\n\n")
+    parts.append(piece.get("draft_text", ""))
     if hooks and hooks.get("micro_hooks"):
-        final += "\n\n<!-- START: hook-agent.micro-hooks -->\n"
-        for h in hooks["micro_hooks"]:
-            final += f"- {h}\n"
-        final += "<!-- END: hook-agent.micro-hooks -->\n"
-    return final
+        parts.append("\n\n<!-- START: hook-agent.micro-hooks -->\n")
+        parts.extend(f"- {h}\n" for h in hooks["micro_hooks"])
+        parts.append("<!-- END: hook-agent.micro-hooks -->\n")
+    return "".join(parts)
 
 
 def save_final_text(supabase, content_id: str, text: str) -> None:
-    """Persist final article to database and log status."""
+    """Persist final article to database and log status in one transaction."""
+    try:
+        supabase.rpc(
+            "save_final_and_log",
+            {"p_content_id": content_id, "p_final_text": text},
+        ).execute()
+        return
+    except Exception as e:
+        print(
+            f"{YELLOW}save_final_and_log RPC failed ({e}); "
+            f"saving with separate requests{ENDC}"
+        )
+
+    _save_final_text_separately(supabase, content_id, text)
+
+
+def _save_final_text_separately(supabase, content_id: str, text: str) -> None:
+    """Fallback for save_final_and_log: update the piece, then log status."""
     supabase.table("content_pieces").update(
         {
             "final_text": text,
@@ -92,7 +111,7 @@ def save_final_text(supabase, content_id: str, text: str) -> None:
 def save_final_to_file(content_id: str, text: str) -> str:
     """Write final article to disk."""
     filename = f"final_{content_id[:8]}.md"
-    with open(filename, "w") as f:
+    with open(filename, "w", encoding="utf-8") as f:
         f.write(text)
     print(f"{GREEN}Saved final draft to {filename}{ENDC}")
     return filename
@@ -103,14 +122,26 @@ def main() -> int:
     parser.add_argument("--content-id", required=True, help="Content piece ID")
     args = parser.parse_args()
 
+    # Imported here so --help and argument errors skip loading supabase
+    from dotenv import load_dotenv
+
+    from agents.shared.utils import get_supabase_client
+
+    # Load environment variables
+    load_dotenv()
+
     supabase = get_supabase_client()
-    piece = get_content_piece(supabase, args.content_id)
-    headline = get_headline(supabase, args.content_id)
-    hooks = get_hooks(supabase, args.content_id)
+    piece, headline, hooks = fetch_assembly_inputs(supabase, args.content_id)
+    if piece is None:
+        print(f"{RED}Content piece {args.content_id} not found{ENDC}")
+        return 1
 
     final_text = assemble_content(piece, headline, hooks)
-    save_final_text(supabase, piece["id"], final_text)
-    save_final_to_file(piece["id"], final_text)
+    # Write the local copy while the database save is in flight
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        saved_file = executor.submit(save_final_to_file, piece["id"], final_text)
+        save_final_text(supabase, piece["id"], final_text)
+    saved_file.result()
 
     print(f"{BOLD}Draft assembly complete{ENDC}")
     return 0
@@ -16,6 +16,7 @@ from typing import Any, Dict, List
 
 from dotenv import load_dotenv
 
+from agents.shared.llm_cache import get_or_set
 from agents.shared.utils import get_supabase_client, setup_openai
 
 # ANSI colors
@@ -146,92 +147,177 @@ def get_seo_agent_output(supabase, content_id):
         return None
 
 
-def write_draft_with_ai(
-    openai_client, content_piece, keywords, research, strategic_plan, seo_output
-):
-    """
-    Write a complete draft for a content piece using OpenAI.
-    """
-    print(f"{BLUE}Writing draft for content piece: {content_piece['title']}{ENDC}")
+# Each article needs roughly this many completion tokens, so batches are
+# capped to keep the combined output within a single gpt-4o response.
+DRAFT_MAX_TOKENS = 4000
+MAX_BATCH_SIZE = 4
+
+# Constant instructions are sent first as the system message, byte-for-byte
+# identical on every call, so the provider can reuse the cached prefix for
+# requests sharing this cache key. The style guide makes that prefix long
+# enough (caching starts at 1024 prompt tokens) to be worth reusing; the user
+# message carries only the per-article brief.
+DRAFT_PROMPT_CACHE_KEY = "draft-writer-v1"
+
+DRAFT_SYSTEM_PROMPT = """
+You are a professional content writer specialized in creating SEO-optimized articles that are engaging, informative, and well-structured. Write content that sounds natural and provides real value to readers.
+
+Each request gives you an article brief: the title, focus keyword, supporting keywords, audience, tone, niche, research points and a suggested structure.
+
+Important Guidelines:
+1. Write a complete, high-quality article of 1200-1500 words
+2. Use the focus keyword in the first paragraph, conclusion, and several times throughout
+3. Use supporting keywords naturally throughout the text
+4. Include a clear introduction and conclusion
+5. Use H2 and H3 headings to structure the content
+6. Write in the tone given in the brief, appropriate for the audience given in the brief
+7. Include relevant examples and practical advice
+8. Format the article with proper markdown headings (# for title, ## for H2, ### for H3)
+9. Include a call-to-action at the end
+
+Style Guide:
+
+Structure
+- Start with a single # heading containing the article title exactly as given in the brief.
+- Follow the suggested structure when one is provided, using its sections as ## headings in the given order. You may add ### subheadings beneath them, but do not drop or rename the suggested sections.
+- When no structure is provided, plan one yourself: an introduction, four to six main sections that each answer a distinct question a reader would have, and a conclusion.
+- Keep sections balanced. No single section should take up more than a third of the article.
+- End with a ## Conclusion section that summarizes the key takeaways, followed by a short call-to-action that tells the reader exactly what to do next.
+
+Introduction
+- Open with the reader's problem, goal or question, not with a generic statement about the topic.
+- Use the focus keyword within the first two sentences.
+- Close the introduction by telling the reader what they will learn or be able to do after reading.
+- Keep the introduction to two or three short paragraphs.
+
+Keywords and SEO
+- Use the focus keyword naturally roughly once every 150-200 words, including in at least one ## heading.
+- Work each supporting keyword into the body at least once, in a sentence where it adds meaning. Never list keywords or repeat them unnaturally.
+- Use variations and synonyms of the focus keyword so the text reads naturally.
+- Write descriptive headings that tell the reader what the section covers; avoid clever but vague headings.
+- Answer the most likely search questions directly and early in the relevant section, then expand on the answer.
+
+Research and Accuracy
+- Use the research points from the brief where they fit. Weave facts, statistics and quotes into the text rather than listing them.
+- Attribute statistics and quotes to their source in the sentence (for example, "according to ..."), and add a markdown link when a source URL is given.
+- Do not invent statistics, studies, quotes, people or organizations. When no research supports a claim, phrase it as general guidance rather than as a fact.
+- Avoid absolute claims and guarantees. Note important caveats or situations where the advice does not apply.
+
+Voice and Readability
+- Address the reader directly as "you" and write as an experienced practitioner sharing practical knowledge.
+- Prefer short paragraphs of two to four sentences and sentences of varied length, mostly under 25 words.
+- Use the active voice and concrete verbs. Cut filler phrases, hedging and throat-clearing.
+- Explain jargon the first time it appears, unless the audience in the brief is clearly expert.
+- Avoid cliches and stock phrases such as "in today's fast-paced world", "unlock the power of", "game-changer", "dive into" and "delve".
+- Do not mention that you are an AI or refer to the brief, the instructions or the keywords.
+
+Practical Value
+- Give every main section at least one concrete example, step, checklist, template, number or scenario the reader can act on.
+- Use numbered lists for sequential steps and bulleted lists for options, tips or criteria. Keep list items parallel in form and no longer than two sentences.
+- Use a markdown table when comparing three or more options across the same attributes.
+- Use bold sparingly to highlight key terms or the single most important point in a section.
+
+Tone and Audience
+- Match the tone in the brief consistently from the first sentence to the last. A "friendly" tone is warm and conversational; a "professional" tone is precise and measured; an "authoritative" tone is confident and backed by evidence.
+- Pitch the depth of explanation at the audience in the brief. Beginners need definitions, context and reassurance; experienced readers need specifics, trade-offs and edge cases.
+- Use examples, names, units, prices and scenarios that fit the audience and niche. Do not assume a country, currency or season unless the brief implies one.
+- Keep the reading level accessible. When a simpler word says the same thing, use it.
+
+Section Writing
+- Open each ## section with one or two sentences that state its main point, then support that point with explanation, evidence and examples.
+- Make every section earn its place. If two sections would say the same thing, merge them.
+- Connect sections with short transitions so the article reads as one argument rather than a set of separate notes.
+- Finish each main section with a practical takeaway: what the reader should do, check or remember.
+- Avoid repeating the same advice in different words across sections. Refer back to an earlier section instead.
+
+Conclusion and Call-to-Action
+- Keep the conclusion to one or two short paragraphs or a short bulleted summary of three to five takeaways.
+- Do not introduce new information in the conclusion.
+- Make the call-to-action specific and relevant to the article, such as trying the first step, downloading a checklist, reading a related guide or leaving a comment with a question. Use one call-to-action, not several competing ones.
+
+Links
+- Only link to sources that appear in the research points of the brief. Use descriptive anchor text rather than "click here" or a bare URL.
+- Do not invent URLs, product names or internal pages.
+
+Final Check
+Before you finish, check the article against the brief:
+- The title is the first line and matches the brief exactly.
+- The focus keyword appears in the introduction, in at least one ## heading and in the conclusion.
+- Every supporting keyword appears at least once and reads naturally.
+- Every section from the suggested structure is present and in order.
+- The length is within 1200-1500 words and no section is padded to reach it.
+- Every statistic or quote comes from the research points and is attributed.
+- The article ends with the conclusion and a single call-to-action.
+
+Formatting
+- Write the article in markdown. Use only #, ## and ### headings, paragraphs, lists, tables, bold, italics, links and blockquotes for quotes.
+- Do not include front matter, HTML, image placeholders, a table of contents, or notes to the editor.
+- Do not wrap the article in code fences.
+
+Output Format: Write the full article in markdown format.
+"""
 
-    try:
-        # Extract sections from SEO output if available
-        sections = []
-        if (
-            seo_output
-            and "content_idea" in seo_output
-            and "suggested_sections" in seo_output["content_idea"]
-        ):
-            sections = seo_output["content_idea"]["suggested_sections"]
-        elif seo_output and "sections" in seo_output:
-            sections = seo_output["sections"]
-
-        # Format research points for the prompt
-        research_text = ""
-        for i, point in enumerate(research):
-            research_text += f"{i+1}. {point['type'].upper()}: {point['excerpt']} (Source: {point['url']})\n"
-
-        # Craft a prompt for OpenAI
-        prompt = f"""
-        Write a complete blog post with the following details:
-        
-        Title: {content_piece['title']}
-        Focus Keyword: {keywords['focus_keyword']}
-        Supporting Keywords: {', '.join(keywords.get('supporting_keywords', []))}
-        Audience: {strategic_plan['audience']}
-        Tone: {strategic_plan['tone']}
-        Niche: {strategic_plan['niche']}
-        
-        Research Points to Include:
-        {research_text if research else "No specific research points provided. Create appropriate content based on the title and keywords."}
-        
-        Article Structure:
-        {"- " + "\n- ".join(sections) if sections else "Create a logical structure with introduction, main sections, and conclusion."}
-        
-        Important Guidelines:
-        1. Write a complete, high-quality article of 1200-1500 words
-        2. Use the focus keyword in the first paragraph, conclusion, and several times throughout
-        3. Use supporting keywords naturally throughout the text
-        4. Include a clear introduction and conclusion
-        5. Use H2 and H3 headings to structure the content
-        6. Write in a {strategic_plan['tone']} tone appropriate for {strategic_plan['audience']}
-        7. Include relevant examples and practical advice
-        8. Format the article with proper markdown headings (# for title, ## for H2, ### for H3)
-        9. Include a call-to-action at the end
-        
-        Output Format: Write the full article in markdown format.
-        """
 
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
-            model="gpt-4o",  # Using GPT-4o for high-quality long-form content
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a professional content writer specialized in creating SEO-optimized articles that are engaging, informative, and well-structured. Write content that sounds natural and provides real value to readers.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=4000,  # Allowing enough tokens for a comprehensive article
-            temperature=0.7,  # Slightly creative but still focused
+def get_content_pieces(supabase, limit=MAX_BATCH_SIZE):
+    """Get up to ``limit`` researched content pieces that still need a draft."""
+    try:
+        response = (
+            supabase.table("content_pieces")
+            .select("*")
+            .eq("status", "researched")
+            .limit(limit)
+            .execute()
         )
+        return response.data or []
 
-        # Extract the draft text
-        draft_text = response.choices[0].message.content
+    except Exception as e:
+        print(f"{RED}Error retrieving content pieces: {e}{ENDC}")
+        return []
 
-        print(
-            f"{GREEN}Generated draft of approximately {len(draft_text.split())} words{ENDC}"
+
+def build_draft_brief(content_piece, keywords, research, strategic_plan, seo_output):
+    """Describe one article to be written: title, keywords, research and structure."""
+    # Extract sections from SEO output if available
+    sections = []
+    if (
+        seo_output
+        and "content_idea" in seo_output
+        and "suggested_sections" in seo_output["content_idea"]
+    ):
+        sections = seo_output["content_idea"]["suggested_sections"]
+    elif seo_output and "sections" in seo_output:
+        sections = seo_output["sections"]
+
+    if research:
+        research_text = "\n".join(
+            f"{i+1}. {point['type'].upper()}: {point['excerpt']} (Source: {point['url']})"
+            for i, point in enumerate(research)
         )
+    else:
+        research_text = "No specific research points provided. Create appropriate content based on the title and keywords."
 
-        return draft_text
+    if sections:
+        structure_text = "\n".join(f"- {section}" for section in sections)
+    else:
+        structure_text = "Create a logical structure with introduction, main sections, and conclusion."
 
-    except Exception as e:
-        print(f"{RED}Error generating draft with AI: {e}{ENDC}")
-        # Fall back to mock data if AI fails
-        print(f"{YELLOW}Falling back to mock draft generation{ENDC}")
+    return f"""Title: {content_piece['title']}
+Focus Keyword: {keywords['focus_keyword']}
+Supporting Keywords: {', '.join(keywords.get('supporting_keywords', []))}
+Audience: {strategic_plan['audience']}
+Tone: {strategic_plan['tone']}
+Niche: {strategic_plan['niche']}
+
+Research Points to Include:
+{research_text}
 
-        # Mock draft with minimal placeholder text
-        mock_draft = f"""
+Article Structure:
+{structure_text}"""
+
+
+def mock_draft_text(content_piece, keywords, strategic_plan):
+    """Placeholder draft used when AI is disabled or unavailable."""
+    return f"""
 # {content_piece['title']}
 
 ## Introduction
@@ -272,7 +358,172 @@ Ready to implement these {keywords['focus_keyword']} strategies? Start with the
 Share your results or questions in the comments below!
 """
 
-        return mock_draft
+
+def log_prompt_cache_usage(response):
+    """Report how many prompt tokens the provider served from its prefix cache."""
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+    if not isinstance(prompt_tokens, int) or not isinstance(cached_tokens, int):
+        return
+    hit_rate = cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    print(
+        f"{BLUE}Prompt cache: {cached_tokens}/{prompt_tokens} prompt tokens cached ({hit_rate:.0%}){ENDC}"
+    )
+
+
+def request_draft_completion(openai_client, validate=None, **request):
+    """
+    Run a chat completion for a draft and return its text.
+
+    The completion is a pure function of the request, so reruns and retries
+    with the same model, parameters and messages reuse the cached text. Only
+    complete replies are cached: the model must have stopped on its own,
+    returned content, and (when given) the content must pass ``validate``.
+    """
+    finish_reasons = []
+
+    def fetch():
+        response = openai_client.chat.completions.create(
+            **request, extra_body={"prompt_cache_key": DRAFT_PROMPT_CACHE_KEY}
+        )
+        log_prompt_cache_usage(response)
+        choice = response.choices[0]
+        finish_reasons.append(choice.finish_reason)
+        return choice.message.content
+
+    def cacheable(content):
+        if finish_reasons[-1] != "stop" or not content:
+            return False
+        if validate is not None:
+            try:
+                validate(content)
+            except Exception:
+                return False
+        return True
+
+    return get_or_set(request, fetch, namespace="draft_writer", cacheable=cacheable)
+
+
+def write_draft_with_ai(
+    openai_client, content_piece, keywords, research, strategic_plan, seo_output
+):
+    """
+    Write a complete draft for a content piece using OpenAI.
+    """
+    print(f"{BLUE}Writing draft for content piece: {content_piece['title']}{ENDC}")
+
+    try:
+        # Only the article details vary; the instructions live in the system prompt
+        prompt = build_draft_brief(
+            content_piece, keywords, research, strategic_plan, seo_output
+        )
+
+        # Call OpenAI API
+        draft_text = request_draft_completion(
+            openai_client,
+            model="gpt-4o",  # Using GPT-4o for high-quality long-form content
+            messages=[
+                {"role": "system", "content": DRAFT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=DRAFT_MAX_TOKENS,  # Allowing enough tokens for a comprehensive article
+            temperature=0.7,  # Slightly creative but still focused
+        )
+
+        print(
+            f"{GREEN}Generated draft of approximately {len(draft_text.split())} words{ENDC}"
+        )
+
+        return draft_text
+
+    except Exception as e:
+        print(f"{RED}Error generating draft with AI: {e}{ENDC}")
+        # Fall back to mock data if AI fails
+        print(f"{YELLOW}Falling back to mock draft generation{ENDC}")
+        return mock_draft_text(content_piece, keywords, strategic_plan)
+
+
+def write_drafts_with_ai(openai_client, jobs):
+    """
+    Write drafts for several content pieces with a single OpenAI request.
+
+    Args:
+        openai_client: OpenAI client.
+        jobs: Dicts with ``content_piece``, ``keywords``, ``research``,
+            ``strategic_plan`` and ``seo_output`` keys, at most
+            ``MAX_BATCH_SIZE`` of them.
+
+    Returns:
+        Dict mapping content piece id to draft markdown. Pieces the model
+        left out of its reply are drafted individually instead.
+    """
+    if len(jobs) == 1:
+        job = jobs[0]
+        return {
+            job["content_piece"]["id"]: write_draft_with_ai(
+                openai_client,
+                job["content_piece"],
+                job["keywords"],
+                job["research"],
+                job["strategic_plan"],
+                job["seo_output"],
+            )
+        }
+
+    print(f"{BLUE}Writing {len(jobs)} drafts in one request{ENDC}")
+
+    briefs = "\n\n".join(
+        f"""Article ID: {job['content_piece']['id']}
+{build_draft_brief(job['content_piece'], job['keywords'], job['research'], job['strategic_plan'], job['seo_output'])}"""
+        for job in jobs
+    )
+    # The shared system prompt stays first so the batch reuses the cached prefix
+    prompt = f"""Write a complete blog post for each of the following {len(jobs)} articles.
+
+{briefs}
+
+Return a JSON object of the form {{"articles": [{{"id": "<Article ID>", "markdown": "<full article in markdown>"}}]}} with one entry per article."""
+
+    drafts = {}
+    try:
+        reply = request_draft_completion(
+            openai_client,
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": DRAFT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=DRAFT_MAX_TOKENS * len(jobs),
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            validate=lambda reply: json.loads(reply)["articles"],
+        )
+        articles = json.loads(reply)["articles"]
+        drafts = {
+            article["id"]: article["markdown"]
+            for article in articles
+            if article.get("markdown")
+        }
+        print(f"{GREEN}Generated {len(drafts)} of {len(jobs)} drafts{ENDC}")
+
+    except Exception as e:
+        print(f"{RED}Error generating batched drafts with AI: {e}{ENDC}")
+
+    for job in jobs:
+        content_id = job["content_piece"]["id"]
+        if content_id not in drafts:
+            drafts[content_id] = write_draft_with_ai(
+                openai_client,
+                job["content_piece"],
+                job["keywords"],
+                job["research"],
+                job["strategic_plan"],
+                job["seo_output"],
+            )
+
+    return drafts
 
 
 def save_draft_to_database(supabase, content_id, draft_text):
@@ -324,6 +575,40 @@ def save_draft_to_file(content_id, content_title, draft_text):
     return filename
 
 
+def load_draft_job(supabase, content_piece):
+    """Gather everything needed to draft one content piece, or None if incomplete."""
+    print(f"{GREEN}Retrieved content piece: {content_piece['title']}{ENDC}")
+
+    # Get keywords for the content piece
+    keywords = get_content_keywords(supabase, content_piece["id"])
+    if not keywords:
+        print(f"{RED}No keywords found for this content piece. Cannot proceed.{ENDC}")
+        return None
+
+    print(f"{GREEN}Retrieved keywords: {keywords['focus_keyword']}{ENDC}")
+
+    # Get the strategic plan
+    strategic_plan = get_strategic_plan(supabase, content_piece["strategic_plan_id"])
+    if not strategic_plan:
+        print(f"{RED}No strategic plan found. Cannot proceed.{ENDC}")
+        return None
+
+    # Get research for the content piece
+    research = get_content_research(supabase, content_piece["id"])
+    print(f"{GREEN}Retrieved {len(research)} research points{ENDC}")
+
+    # Get SEO agent output for additional context (like suggested sections)
+    seo_output = get_seo_agent_output(supabase, content_piece["id"])
+
+    return {
+        "content_piece": content_piece,
+        "keywords": keywords,
+        "research": research,
+        "strategic_plan": strategic_plan,
+        "seo_output": seo_output,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Draft Writer Agent for WordPress Content Generator"
@@ -331,6 +616,12 @@ def main():
     parser.add_argument(
         "--content-id", help="ID of the content piece to write a draft for"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help=f"Number of researched content pieces to draft in one OpenAI request (max {MAX_BATCH_SIZE})",
+    )
     parser.add_argument(
         "--no-ai", action="store_true", help="Disable AI and use mock data instead"
     )
@@ -353,94 +644,56 @@ def main():
             print(f"{YELLOW}Falling back to mock data generation{ENDC}")
             args.no_ai = True
 
-    # Get the content piece
-    content_piece = get_content_piece(supabase, args.content_id)
-    print(f"{GREEN}Retrieved content piece: {content_piece['title']}{ENDC}")
-
-    # Get keywords for the content piece
-    keywords = get_content_keywords(supabase, content_piece["id"])
-    if not keywords:
-        print(f"{RED}No keywords found for this content piece. Cannot proceed.{ENDC}")
-        sys.exit(1)
-
-    print(f"{GREEN}Retrieved keywords: {keywords['focus_keyword']}{ENDC}")
+    # Get the content pieces
+    if args.content_id or args.batch_size <= 1:
+        content_pieces = [get_content_piece(supabase, args.content_id)]
+    else:
+        content_pieces = get_content_pieces(
+            supabase, min(args.batch_size, MAX_BATCH_SIZE)
+        )
+        if not content_pieces:
+            print(f"{RED}No content piece found{ENDC}")
+            sys.exit(1)
 
-    # Get the strategic plan
-    strategic_plan = get_strategic_plan(supabase, content_piece["strategic_plan_id"])
-    if not strategic_plan:
-        print(f"{RED}No strategic plan found. Cannot proceed.{ENDC}")
+    jobs = [
+        job
+        for job in (load_draft_job(supabase, piece) for piece in content_pieces)
+        if job
+    ]
+    if not jobs:
         sys.exit(1)
 
-    # Get research for the content piece
-    research = get_content_research(supabase, content_piece["id"])
-    print(f"{GREEN}Retrieved {len(research)} research points{ENDC}")
-
-    # Get SEO agent output for additional context (like suggested sections)
-    seo_output = get_seo_agent_output(supabase, content_piece["id"])
-
-    # Write the draft
+    # Write the drafts
     if args.no_ai:
         # Use mock data if AI is disabled
-        draft_text = f"""
-# {content_piece['title']}
-
-## Introduction
-Welcome to this comprehensive guide on {keywords['focus_keyword']}. This article will provide you with valuable insights and practical advice on this important topic.
-
-## What is {keywords['focus_keyword'].title()}?
-{keywords['focus_keyword'].title()} refers to the methodical approach to implementing strategies in {strategic_plan['niche']} that benefit {strategic_plan['audience']}. 
-Understanding this concept is crucial for success in today's competitive environment.
-
-## Why {keywords['focus_keyword'].title()} Matters
-Recent studies show that 78% of {strategic_plan['audience']} consider {keywords['focus_keyword']} to be essential for their success. 
-This highlights the growing importance of mastering this area.
-
-## Key Strategies for {keywords['focus_keyword'].title()}
-
-### Strategy 1: Research and Planning
-Before diving into implementation, thorough research and planning are essential. This lays the groundwork for successful outcomes.
-
-### Strategy 2: Consistent Implementation
-Consistency is key when working with {keywords['focus_keyword']}. Establish regular practices and stick to them.
-
-### Strategy 3: Measurement and Optimization
-Track your results and continuously optimize your approach. This iterative process leads to the best outcomes.
-
-## Case Study: Success with {keywords['focus_keyword'].title()}
-Company XYZ implemented {keywords['focus_keyword']} strategies and saw a 35% increase in engagement among {strategic_plan['audience']}. 
-Their approach focused on [specific details would be inserted here].
-
-## Common Challenges and Solutions
-While implementing {keywords['focus_keyword']} strategies, you may encounter several challenges. Here's how to overcome them effectively.
-
-## Conclusion
-{keywords['focus_keyword'].title()} represents a significant opportunity for {strategic_plan['audience']} to improve their results in {strategic_plan['niche']}. 
-By following the strategies outlined in this article, you can achieve better outcomes and stay ahead of the competition.
-
-## Call to Action
-Ready to implement these {keywords['focus_keyword']} strategies? Start with the first step today and track your progress. 
-Share your results or questions in the comments below!
-"""
+        drafts = {
+            job["content_piece"]["id"]: mock_draft_text(
+                job["content_piece"], job["keywords"], job["strategic_plan"]
+            )
+            for job in jobs
+        }
         print(f"{YELLOW}Using mock data for draft{ENDC}")
     else:
-        # Use OpenAI to generate draft
-        draft_text = write_draft_with_ai(
-            openai_client, content_piece, keywords, research, strategic_plan, seo_output
-        )
+        # Use OpenAI to generate drafts, one request for the whole batch
+        drafts = write_drafts_with_ai(openai_client, jobs)
 
-    # Save draft to file
-    filename = save_draft_to_file(
-        content_piece["id"], content_piece["title"], draft_text
-    )
+    for job in jobs:
+        content_piece = job["content_piece"]
+        draft_text = drafts[content_piece["id"]]
 
-    # Save draft to database
-    save_draft_to_database(supabase, content_piece["id"], draft_text)
+        # Save draft to file
+        filename = save_draft_to_file(
+            content_piece["id"], content_piece["title"], draft_text
+        )
 
-    print(f"\n{BOLD}Draft Writing Complete!{ENDC}")
-    print(
-        f"Created draft of approximately {len(draft_text.split())} words for '{content_piece['title']}'"
-    )
-    print(f"You can view the draft in {filename}")
+        # Save draft to database
+        save_draft_to_database(supabase, content_piece["id"], draft_text)
+
+        print(f"\n{BOLD}Draft Writing Complete!{ENDC}")
+        print(
+            f"Created draft of approximately {len(draft_text.split())} words for '{content_piece['title']}'"
+        )
+        print(f"You can view the draft in {filename}")
 
     return 0
 
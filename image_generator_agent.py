@@ -8,33 +8,94 @@ This agent generates featured images for articles using OpenAI's DALL-E API by:
 3. Saving images to disk and updating the database with image metadata
 4. Preparing the content for WordPress publishing
 
-Input: Content piece with status "line_edited"
-Output: Generated image and updated content piece
-Status transition: "line_edited" → "image_generated"
+Input: Content pieces with status "line_edited" (processed as a concurrent batch)
+Output: Generated images and updated content pieces
+Status transition: "line_edited" → "image_generating" → "image_generated"
+                   ("line_edited" → "image_generating" → "image_batch_submitted"
+                    → "image_generated" with --batch)
 """
 
 import argparse
+import asyncio
 import base64
-import io
+import hashlib
 import json
 import os
 import re
+import shutil
 import sys
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 try:
+    import aiofiles
+    import httpx
     import openai  # noqa: F401
-    from PIL import Image
 except ImportError:
     print(
-        "Error: Required packages not installed. Run 'pip install openai supabase pillow'"
+        "Error: Required packages not installed. Run 'pip install openai supabase aiofiles httpx'"
     )
     sys.exit(1)
 
-from agents.shared.utils import get_supabase_client, setup_openai
+from agents.exceptions import AgentDataError, AgentError
+from agents.shared.utils import get_async_openai_client, get_supabase_client
+
+# Maximum number of "line_edited" content pieces picked up per run
+BATCH_SIZE = 10
+
+# Maximum number of in-flight DALL-E requests (keep within the account's RPM tier)
+DEFAULT_CONCURRENCY = 5
+
+# Number of tasks copying finished images into place; disk-bound, so a couple
+# are enough to keep up with DEFAULT_CONCURRENCY generators
+PERSIST_WORKERS = 2
+
+# Content-addressed cache of generated images, keyed by prompt hash
+IMAGE_CACHE_DIR = Path("images") / ".cache"
+
+# Streaming download of generated images
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Base64 slice that decodes to one download chunk (a multiple of 4)
+B64_CHUNK_SIZE = DOWNLOAD_CHUNK_SIZE // 3 * 4
+DOWNLOAD_TIMEOUT = 60
+
+# Batch API polling: start at 10s and back off exponentially up to 10 minutes
+BATCH_POLL_INITIAL_DELAY = 10
+BATCH_POLL_MAX_DELAY = 600
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# How long a worker owns a piece it has moved to "image_generating"; pieces
+# whose lease has expired are picked up again by the next run
+LEASE_DURATION = timedelta(minutes=15)
+
+# Content piece columns plus embedded keyword rows (PostgREST resource embedding)
+CONTENT_WITH_KEYWORDS = "*, keywords(*)"
+
+# Precompiled patterns for prompt and filename cleanup
+_MD_HEADER_RE = re.compile(r"^#+ ")
+_SAFE_FILENAME_RE = re.compile(r"[^\w\-_]")
+
+# Plain light-blue 1024x1024 PNG returned by the mock generator; read once
+# on first use
+_MOCK_PNG_PATH = Path(__file__).parent / "fixtures" / "mock_1024.png"
+_MOCK_PNG = None
+
+# Shared AsyncOpenAI client, created lazily on first use. Its connection pool
+# is bound to the event loop, so a new client is created for each loop.
+_openai_client = None
+_openai_client_loop = None
+
+
+async def get_openai_client():
+    """Return the shared AsyncOpenAI client for the running event loop."""
+    global _openai_client, _openai_client_loop
+    loop = asyncio.get_running_loop()
+    if _openai_client is None or _openai_client_loop is not loop:
+        _openai_client = get_async_openai_client()
+        _openai_client_loop = loop
+    return _openai_client
 
 
 def get_content_piece(supabase, content_id=None):
@@ -47,49 +108,74 @@ def get_content_piece(supabase, content_id=None):
 
     Returns:
         Content piece data as a dictionary
+
+    Raises:
+        AgentDataError: If no matching content piece exists
     """
     if content_id:
         # Get specific content piece by ID
         result = (
-            supabase.table("content_pieces").select("*").eq("id", content_id).execute()
+            supabase.table("content_pieces")
+            .select(CONTENT_WITH_KEYWORDS)
+            .eq("id", content_id)
+            .execute()
         )
         if not result.data:
-            print(f"Error: Content piece with ID {content_id} not found")
-            sys.exit(1)
+            raise AgentDataError(f"Content piece with ID {content_id} not found")
         return result.data[0]
     else:
         # Get the first content piece with status "line_edited"
         result = (
             supabase.table("content_pieces")
-            .select("*")
+            .select(CONTENT_WITH_KEYWORDS)
             .eq("status", "line_edited")
             .limit(1)
             .execute()
         )
         if not result.data:
-            print("Error: No content pieces with status 'line_edited' found")
-            sys.exit(1)
+            raise AgentDataError("No content pieces with status 'line_edited' found")
         return result.data[0]
 
 
-def get_content_keywords(supabase, content_id):
-    """Retrieve keywords for a content piece."""
-    result = (
-        supabase.table("keywords").select("*").eq("content_id", content_id).execute()
+def claimable_filter():
+    """
+    PostgREST filter for pieces that are ready for image generation.
+
+    Matches "line_edited" pieces and "image_generating" pieces whose lease
+    has expired (a previous worker died before finishing).
+    """
+    now = datetime.utcnow().isoformat()
+    return (
+        f"status.eq.line_edited,"
+        f"and(status.eq.image_generating,lease_expires_at.lt.{now})"
     )
-    if not result.data:
-        print(f"Warning: No keywords found for content piece {content_id}")
-        return None
-    return result.data[0]
 
 
-def get_strategic_plan(supabase, plan_id):
-    """Retrieve strategic plan data."""
-    result = supabase.table("strategic_plans").select("*").eq("id", plan_id).execute()
+def get_content_pieces(supabase, limit=BATCH_SIZE):
+    """
+    Retrieve a batch of content pieces with status "line_edited" (or with an
+    expired "image_generating" lease).
+
+    Args:
+        supabase: Supabase client
+        limit: Maximum number of content pieces to retrieve
+
+    Returns:
+        List of content piece dictionaries
+
+    Raises:
+        AgentDataError: If no content piece is ready for image generation
+    """
+    result = (
+        supabase.table("content_pieces")
+        .select(CONTENT_WITH_KEYWORDS)
+        .or_(claimable_filter())
+        .limit(limit)
+        .execute()
+    )
     if not result.data:
-        print(f"Error: Strategic plan with ID {plan_id} not found")
-        sys.exit(1)
-    return result.data[0]
+        raise AgentDataError("No content pieces with status 'line_edited' found")
+    return result.data
 
 
 def create_image_prompt(content_piece, keywords=None):
@@ -97,8 +183,8 @@ def create_image_prompt(content_piece, keywords=None):
     Create a prompt for image generation based on content piece and keywords.
 
     Args:
-        content_piece: Content piece data
-        keywords: Optional keywords data
+        content_piece: Content piece data, optionally with embedded "keywords" rows
+        keywords: Optional keywords data (defaults to the first embedded row)
 
     Returns:
         String prompt for DALL-E
@@ -106,13 +192,16 @@ def create_image_prompt(content_piece, keywords=None):
     title = content_piece.get("title", "")
     draft_text = content_piece.get("draft_text", "")
 
+    if keywords is None and content_piece.get("keywords"):
+        keywords = content_piece["keywords"][0]
+
     # Extract first paragraph (likely contains the main topic)
     first_paragraph = ""
     if draft_text:
         paragraphs = draft_text.split("\n\n")
         if paragraphs:
             # Remove markdown headers if present
-            first_paragraph = re.sub(r"^#+ ", "", paragraphs[0]).strip()
+            first_paragraph = _MD_HEADER_RE.sub("", paragraphs[0]).strip()
 
     # Use focus keyword if available
     focus_keyword = ""
@@ -133,36 +222,38 @@ def create_image_prompt(content_piece, keywords=None):
     return prompt
 
 
-def generate_image_with_dalle(
+async def generate_image_with_dalle(
     client, prompt, size="1024x1024", quality="standard", n=1
 ):
     """
     Generate an image using DALL-E API.
 
     Args:
-        client: OpenAI client
+        client: AsyncOpenAI client
         prompt: Text prompt for image generation
         size: Image size (default: 1024x1024)
         quality: Image quality (default: standard)
         n: Number of images to generate (default: 1)
 
     Returns:
-        Tuple of (image_data, response_metadata)
+        Tuple of (image_url, response_metadata)
     """
     print(f"Generating image with prompt: {prompt}")
 
     try:
-        response = client.images.generate(
+        # Request a URL rather than b64_json so the image bytes can be
+        # streamed straight to disk without a base64 round trip
+        response = await client.images.generate(
             model="dall-e-3",  # Using the latest DALL-E model
             prompt=prompt,
             size=size,
             quality=quality,
             n=n,
-            response_format="b64_json",  # Get base64 encoded image
+            response_format="url",
         )
 
-        # Extract image data and metadata
-        image_data = base64.b64decode(response.data[0].b64_json)
+        # Extract image URL and metadata
+        image_url = response.data[0].url
         image_metadata = {
             "prompt": prompt,
             "revised_prompt": response.data[0].revised_prompt,
@@ -173,11 +264,19 @@ def generate_image_with_dalle(
         }
 
         print("Successfully generated image with DALL-E")
-        return image_data, image_metadata
+        return image_url, image_metadata
 
     except Exception as e:
         print(f"Error generating image with DALL-E: {str(e)}")
-        sys.exit(1)
+        raise
+
+
+def _get_mock_png():
+    """Return the mock PNG bytes, reading the fixture on first use."""
+    global _MOCK_PNG
+    if _MOCK_PNG is None:
+        _MOCK_PNG = _MOCK_PNG_PATH.read_bytes()
+    return _MOCK_PNG
 
 
 def generate_mock_image(prompt):
@@ -192,140 +291,827 @@ def generate_mock_image(prompt):
     """
     print(f"Generating mock image for prompt: {prompt}")
 
-    # Create a simple colored image with text
-    width, height = 1024, 1024
-    color = (240, 248, 255)  # Light blue background
-
-    # Create a blank image
-    img = Image.new("RGB", (width, height), color)
-
-    # Save to bytes
-    img_byte_arr = io.BytesIO()
-    img.save(img_byte_arr, format="PNG")
-    image_data = img_byte_arr.getvalue()
-
     # Create mock metadata
     image_metadata = {
         "prompt": prompt,
         "revised_prompt": prompt,
         "model": "mock-image-generator",
-        "size": f"{width}x{height}",
+        "size": "1024x1024",
         "quality": "standard",
         "created": datetime.utcnow().isoformat(),
     }
 
-    return image_data, image_metadata
+    return _get_mock_png(), image_metadata
 
 
-def save_image_to_file(image_data, content_id, content_title):
+def get_image_path(content_id, content_title):
     """
-    Save image data to a file.
+    Build the file path for a content piece's featured image.
 
     Args:
-        image_data: Binary image data
         content_id: Content piece ID
         content_title: Content piece title
 
     Returns:
-        Path to the saved image file
+        Path inside the images directory (created if missing)
     """
     # Create images directory if it doesn't exist
     images_dir = Path("images")
     images_dir.mkdir(exist_ok=True)
 
     # Create a filename based on content title and ID
-    safe_title = re.sub(r"[^\w\-_]", "_", content_title.lower())
+    safe_title = _SAFE_FILENAME_RE.sub("_", content_title.lower())
     filename = f"{safe_title}_{content_id[:8]}.png"
-    filepath = images_dir / filename
+    return images_dir / filename
+
+
+async def download_image_to_file(http_client, image_url, filepath):
+    """
+    Stream an image from a URL straight to a file.
+
+    Args:
+        http_client: httpx.AsyncClient used for the download
+        image_url: URL of the generated image
+        filepath: Destination path
 
-    # Write image data to file
-    with open(filepath, "wb") as f:
-        f.write(image_data)
+    Returns:
+        Path to the saved image file
+    """
+    async with http_client.stream("GET", image_url) as response:
+        response.raise_for_status()
+        async with aiofiles.open(filepath, "wb") as f:
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                await f.write(chunk)
 
     print(f"Saved image to file: {filepath}")
     return str(filepath)
 
 
-def update_database_with_image(supabase, content_id, image_path, image_metadata):
+async def save_base64_image_to_file(b64_data, content_id, content_title):
     """
-    Update the database with image information.
+    Decode base64 image data straight to a file.
+
+    The payload is decoded one DOWNLOAD_CHUNK_SIZE slice at a time, so the
+    decoded PNG is never held in memory as a whole.
+
+    Args:
+        b64_data: Base64-encoded image data
+        content_id: Content piece ID
+        content_title: Content piece title
+
+    Returns:
+        Path to the saved image file
+    """
+    filepath = get_image_path(content_id, content_title)
+
+    async with aiofiles.open(filepath, "wb") as f:
+        for start in range(0, len(b64_data), B64_CHUNK_SIZE):
+            await f.write(base64.b64decode(b64_data[start : start + B64_CHUNK_SIZE]))
+
+    print(f"Saved image to file: {filepath}")
+    return str(filepath)
+
+
+def build_image_records(content_id, image_path, image_metadata):
+    """
+    Build the database rows recording a generated image.
 
     Args:
-        supabase: Supabase client
         content_id: Content piece ID
         image_path: Path to the saved image
         image_metadata: Image metadata
 
     Returns:
-        Boolean indicating success
+        Tuple of (image record, content piece update, agent status record)
     """
+    now = datetime.utcnow().isoformat()
+    image_id = str(uuid.uuid4())
+
+    image_record = {
+        "id": image_id,
+        "content_id": content_id,
+        "file_path": image_path,
+        "metadata": image_metadata,
+        "created_at": now,
+    }
+    content_update = {
+        "id": content_id,
+        "featured_image_id": image_id,
+        "status": "image_generated",
+        "lease_expires_at": None,
+        "updated_at": now,
+    }
+    status_record = {
+        "id": str(uuid.uuid4()),
+        "content_id": content_id,
+        "agent": "image-generator-agent",
+        "status": "completed",
+        "input": {"content_id": content_id},
+        "output": {
+            "status": "success",
+            "image_path": image_path,
+            "timestamp": now,
+        },
+        "created_at": now,
+    }
+    return image_record, content_update, status_record
+
+
+def save_images_to_database(supabase, generated):
+    """
+    Record a batch of generated images with one request per table.
+
+    Issues a single insert for images, a single upsert for content_pieces and
+    a single insert for agent_status. If a bulk write fails, falls back to
+    per-row writes so the offending record can be identified.
+
+    Args:
+        supabase: Supabase client
+        generated: List of (content_id, image_path, image_metadata) tuples
+
+    Returns:
+        List of IDs of the content pieces that could not be recorded
+    """
+    if not generated:
+        return []
+
+    image_records, content_updates, status_records = [], [], []
+    for content_id, image_path, image_metadata in generated:
+        image_record, content_update, status_record = build_image_records(
+            content_id, image_path, image_metadata
+        )
+        image_records.append(image_record)
+        content_updates.append(content_update)
+        status_records.append(status_record)
+
+    # Track how far the bulk write got so the fallback does not duplicate rows
+    stage = "images"
     try:
-        # Create a new image record
-        image_id = str(uuid.uuid4())
-        image_record = {
-            "id": image_id,
-            "content_id": content_id,
-            "file_path": image_path,
-            "metadata": image_metadata,
-            "created_at": datetime.utcnow().isoformat(),
-        }
+        supabase.table("images").insert(image_records).execute()
+        stage = "content_pieces"
+        supabase.table("content_pieces").upsert(
+            content_updates, on_conflict="id"
+        ).execute()
+        stage = "agent_status"
+        supabase.table("agent_status").insert(status_records).execute()
+    except Exception as e:
+        print(f"Bulk database update failed, retrying per content piece: {str(e)}")
+
+        failures = []
+        for image_record, content_update, status_record in zip(
+            image_records, content_updates, status_records
+        ):
+            content_id = content_update["id"]
+            try:
+                if stage == "images":
+                    supabase.table("images").insert(image_record).execute()
+                if stage in ("images", "content_pieces"):
+                    supabase.table("content_pieces").upsert(
+                        content_update, on_conflict="id"
+                    ).execute()
+                supabase.table("agent_status").insert(status_record).execute()
+            except Exception as row_error:
+                print(
+                    f"Error updating database with image for content piece "
+                    f"{content_id}: {str(row_error)}"
+                )
+                failures.append(content_id)
+        return failures
+
+    print(f"Successfully updated database with {len(generated)} images")
+    return []
+
+
+def claim_content_piece(supabase, content_piece):
+    """
+    Move a content piece to "image_generating" with a lease before paying for
+    an image.
+
+    The update only matches while the piece still has the status we read
+    (compare-and-swap), so when several workers race for the same piece only
+    one of them wins. An "image_generating" piece can only be claimed once its
+    lease has expired.
 
-        supabase.table("images").insert(image_record).execute()
+    Args:
+        supabase: Supabase client
+        content_piece: Content piece data as read from the database
+
+    Returns:
+        Boolean indicating whether this worker now owns the piece
+    """
+    now = datetime.utcnow()
+    status = content_piece.get("status", "line_edited")
 
-        # Update content piece with image reference and new status
-        supabase.table("content_pieces").update(
+    query = (
+        supabase.table("content_pieces")
+        .update(
             {
-                "featured_image_id": image_id,
-                "status": "image_generated",
-                "updated_at": datetime.utcnow().isoformat(),
+                "status": "image_generating",
+                "lease_expires_at": (now + LEASE_DURATION).isoformat(),
+                "updated_at": now.isoformat(),
             }
-        ).eq("id", content_id).execute()
+        )
+        .eq("id", content_piece["id"])
+        .eq("status", status)
+    )
+    if status == "image_generating":
+        query = query.lt("lease_expires_at", now.isoformat())
+
+    return bool(query.execute().data)
 
-        # Log agent status
-        supabase.table("agent_status").insert(
+
+def claim_content_pieces(supabase, content_pieces):
+    """
+    Claim several pending content pieces with a single compare-and-swap update.
+
+    Args:
+        supabase: Supabase client
+        content_pieces: Content pieces as read from the database
+
+    Returns:
+        The subset of content_pieces now owned by this worker
+    """
+    if not content_pieces:
+        return []
+
+    now = datetime.utcnow()
+    result = (
+        supabase.table("content_pieces")
+        .update(
             {
-                "id": str(uuid.uuid4()),
-                "content_id": content_id,
-                "agent": "image-generator-agent",
-                "status": "completed",
-                "input": {"content_id": content_id},
-                "output": {
-                    "status": "success",
-                    "image_path": image_path,
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-                "created_at": datetime.utcnow().isoformat(),
+                "status": "image_generating",
+                "lease_expires_at": (now + LEASE_DURATION).isoformat(),
+                "updated_at": now.isoformat(),
             }
-        ).execute()
+        )
+        .in_("id", [piece["id"] for piece in content_pieces])
+        .or_(claimable_filter())
+        .execute()
+    )
+    claimed = {row["id"] for row in result.data or []}
+    return [piece for piece in content_pieces if piece["id"] in claimed]
 
-        print(
-            f"Successfully updated database with image for content piece: {content_id}"
+
+def release_content_piece(supabase, content_id):
+    """Return a claimed piece to "line_edited" after a failed generation."""
+    supabase.table("content_pieces").update(
+        {
+            "status": "line_edited",
+            "lease_expires_at": None,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+    ).eq("id", content_id).eq("status", "image_generating").execute()
+
+
+def prompt_cache_key(prompt, model, size, quality):
+    """Content-address an image by its prompt and generation parameters."""
+    return hashlib.sha256(f"{model}|{size}|{quality}|{prompt}".encode("utf-8")).hexdigest()
+
+
+async def get_cached_image(openai_client, http_client, prompt, semaphore, args):
+    """
+    Return a cached image for the prompt, generating it on a cache miss.
+
+    Images are stored in IMAGE_CACHE_DIR as {sha256}.png with a {sha256}.json
+    metadata sidecar, so re-runs and duplicate prompts reuse earlier output.
+
+    Args:
+        openai_client: AsyncOpenAI client (None when running with --no-ai)
+        http_client: httpx.AsyncClient used to download generated images
+        prompt: Image prompt
+        semaphore: Semaphore bounding the number of concurrent DALL-E requests
+        args: Parsed command line arguments
+
+    Returns:
+        Tuple of (path of the cached image, image_metadata)
+    """
+    model = "mock-image-generator" if args.no_ai else "dall-e-3"
+    key = prompt_cache_key(prompt, model, args.size, args.quality)
+    cache_path = IMAGE_CACHE_DIR / f"{key}.png"
+    metadata_path = IMAGE_CACHE_DIR / f"{key}.json"
+
+    if cache_path.exists() and metadata_path.exists():
+        print(f"Using cached image for prompt: {prompt}")
+        image_metadata = json.loads(
+            await asyncio.to_thread(metadata_path.read_text, encoding="utf-8")
         )
-        return True
+        return cache_path, image_metadata
 
-    except Exception as e:
-        print(f"Error updating database with image: {str(e)}")
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    if args.no_ai:
+        image_data, image_metadata = generate_mock_image(prompt)
+        async with aiofiles.open(cache_path, "wb") as f:
+            await f.write(image_data)
+    else:
+        async with semaphore:
+            image_url, image_metadata = await generate_image_with_dalle(
+                openai_client, prompt, size=args.size, quality=args.quality
+            )
+        await download_image_to_file(http_client, image_url, cache_path)
+
+    # Write the sidecar last: its presence marks a complete cache entry
+    await asyncio.to_thread(
+        metadata_path.write_text, json.dumps(image_metadata), encoding="utf-8"
+    )
+    return cache_path, image_metadata
+
+
+async def fetch_content_image(
+    supabase, openai_client, http_client, content_piece, semaphore, args, inflight=None
+):
+    """
+    Claim a content piece and obtain its image in the on-disk cache.
+
+    This is the network-bound half of processing a piece; copying the image
+    into place is left to place_content_image.
+
+    Args:
+        supabase: Supabase client
+        openai_client: AsyncOpenAI client (None when running with --no-ai)
+        http_client: httpx.AsyncClient used to download generated images
+        content_piece: Content piece data
+        semaphore: Semaphore bounding the number of concurrent DALL-E requests
+        args: Parsed command line arguments
+        inflight: Optional dict shared across a batch mapping prompt to the
+            task generating its image, so duplicate prompts are generated once
+
+    Returns:
+        Tuple of (path of the cached image, image_metadata), or None when
+        another worker already owns the piece
+    """
+    if inflight is None:
+        inflight = {}
 
-        # Log error in agent status
+    content_id = content_piece["id"]
+    print(f"Processing content piece: {content_piece['title']} (ID: {content_id})")
+
+    # Claim the piece before spending anything on image generation
+    if not await asyncio.to_thread(claim_content_piece, supabase, content_piece):
+        print(f"Skipping content piece {content_id}: claimed by another worker")
+        return None
+
+    # Create image prompt (keywords are embedded in the content piece row)
+    prompt = create_image_prompt(content_piece)
+
+    # Generate (or reuse) the image
+    try:
+        task = inflight.get(prompt)
+        if task is None:
+            task = asyncio.ensure_future(
+                get_cached_image(openai_client, http_client, prompt, semaphore, args)
+            )
+            inflight[prompt] = task
+        return await task
+    except Exception:
+        await asyncio.to_thread(release_content_piece, supabase, content_id)
+        raise
+
+
+async def place_content_image(supabase, content_piece, cache_path, image_metadata):
+    """
+    Copy a cached image to the content piece's image path.
+
+    Args:
+        supabase: Supabase client
+        content_piece: Content piece data (already claimed)
+        cache_path: Path of the cached image
+        image_metadata: Metadata of the image
+
+    Returns:
+        Tuple of (content_id, image_path, image_metadata)
+    """
+    content_id = content_piece["id"]
+    try:
+        image_path = get_image_path(content_id, content_piece["title"])
+        await asyncio.to_thread(shutil.copyfile, cache_path, image_path)
+    except Exception:
+        await asyncio.to_thread(release_content_piece, supabase, content_id)
+        raise
+
+    print(f"Saved image to file: {image_path}")
+    return content_id, str(image_path), image_metadata
+
+
+async def process_content_piece(
+    supabase, openai_client, http_client, content_piece, semaphore, args, inflight=None
+):
+    """
+    Generate and save the featured image for a single content piece.
+
+    Args:
+        supabase: Supabase client
+        openai_client: AsyncOpenAI client (None when running with --no-ai)
+        http_client: httpx.AsyncClient used to download generated images
+        content_piece: Content piece data
+        semaphore: Semaphore bounding the number of concurrent DALL-E requests
+        args: Parsed command line arguments
+        inflight: Optional dict shared across a batch (see fetch_content_image)
+
+    Returns:
+        Tuple of (content_id, image_path, image_metadata), or None when
+        another worker already owns the piece
+    """
+    fetched = await fetch_content_image(
+        supabase, openai_client, http_client, content_piece, semaphore, args, inflight
+    )
+    if fetched is None:
+        return None
+    return await place_content_image(supabase, content_piece, *fetched)
+
+
+async def process_batch(supabase, content_pieces, args, persist_workers=PERSIST_WORKERS):
+    """
+    Generate images for a batch of content pieces concurrently.
+
+    Generator tasks (bounded by args.concurrency) hand finished images to a
+    queue drained by a few persister tasks that copy them into place, so disk
+    work never holds up the next DALL-E request. A failure on one content
+    piece is logged and does not abort the others. Database rows for all
+    generated images are written together afterwards.
+
+    Args:
+        supabase: Supabase client
+        content_pieces: List of content piece data
+        args: Parsed command line arguments
+        persist_workers: Number of persister tasks
+
+    Returns:
+        List of IDs of the content pieces that failed
+    """
+    openai_client = None if args.no_ai else await get_openai_client()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    results_q = asyncio.Queue()
+
+    # Pieces with identical prompts share one generation task
+    inflight = {}
+
+    failures = []
+    generated = []
+
+    async def generate_worker(http_client, piece):
         try:
-            supabase.table("agent_status").insert(
-                {
-                    "id": str(uuid.uuid4()),
-                    "content_id": content_id,
-                    "agent": "image-generator-agent",
-                    "status": "failed",
-                    "input": {"content_id": content_id},
-                    "error": {
-                        "message": str(e),
-                        "timestamp": datetime.utcnow().isoformat(),
-                    },
-                    "created_at": datetime.utcnow().isoformat(),
-                }
-            ).execute()
-        except Exception as log_error:
-            print(f"Error logging agent status: {str(log_error)}")
-
-        return False
+            fetched = await fetch_content_image(
+                supabase, openai_client, http_client, piece, semaphore, args, inflight
+            )
+        except Exception as e:
+            print(f"Error processing content piece {piece['id']}: {str(e)}")
+            failures.append(piece["id"])
+            return
+        if fetched is not None:
+            await results_q.put((piece, *fetched))
+
+    async def persist_worker():
+        while True:
+            piece, cache_path, image_metadata = await results_q.get()
+            try:
+                generated.append(
+                    await place_content_image(
+                        supabase, piece, cache_path, image_metadata
+                    )
+                )
+            except Exception as e:
+                print(f"Error processing content piece {piece['id']}: {str(e)}")
+                failures.append(piece["id"])
+            finally:
+                results_q.task_done()
+
+    persisters = [
+        asyncio.create_task(persist_worker()) for _ in range(persist_workers)
+    ]
+    try:
+        # One pooled HTTP client for all image downloads in the batch
+        async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT) as http_client:
+            await asyncio.gather(
+                *[generate_worker(http_client, piece) for piece in content_pieces]
+            )
+        await results_q.join()
+    finally:
+        for persister in persisters:
+            persister.cancel()
+
+    # supabase-py is synchronous; run the writes on a worker thread so they
+    # do not stall the event loop
+    failures.extend(
+        await asyncio.to_thread(save_images_to_database, supabase, generated)
+    )
+    return failures
+
+
+def get_batch_candidates(supabase):
+    """
+    Retrieve content pieces for a Batch API run.
+
+    Args:
+        supabase: Supabase client
+
+    Returns:
+        Tuple of (pending content pieces, dict mapping batch ID to the
+        content pieces already submitted in that batch)
+    """
+    pending = (
+        supabase.table("content_pieces")
+        .select(CONTENT_WITH_KEYWORDS)
+        .or_(claimable_filter())
+        .execute()
+    ).data or []
+
+    submitted = (
+        supabase.table("content_pieces")
+        .select(CONTENT_WITH_KEYWORDS)
+        .eq("status", "image_batch_submitted")
+        .execute()
+    ).data or []
+
+    batches = {}
+    for piece in submitted:
+        batches.setdefault(piece["image_batch_id"], []).append(piece)
+
+    return pending, batches
+
+
+async def submit_image_batch(client, prompts, size="1024x1024", quality="standard"):
+    """
+    Submit image prompts to the OpenAI Batch API as a single JSONL batch.
+
+    Args:
+        client: AsyncOpenAI client
+        prompts: Dictionary mapping content piece ID to image prompt
+        size: Image size (default: 1024x1024)
+        quality: Image quality (default: standard)
+
+    Returns:
+        ID of the created batch
+    """
+    lines = [
+        json.dumps(
+            {
+                "custom_id": content_id,
+                "method": "POST",
+                "url": "/v1/images/generations",
+                "body": {
+                    "model": "dall-e-3",
+                    "prompt": prompt,
+                    "size": size,
+                    "quality": quality,
+                    "n": 1,
+                    "response_format": "b64_json",
+                },
+            }
+        )
+        for content_id, prompt in prompts.items()
+    ]
+
+    batch_file = await client.files.create(
+        file=("image_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/images/generations",
+        completion_window="24h",
+    )
+
+    print(f"Submitted image batch {batch.id} with {len(prompts)} prompts")
+    return batch.id
+
+
+async def poll_batch(
+    client,
+    batch_id,
+    initial_delay=BATCH_POLL_INITIAL_DELAY,
+    max_delay=BATCH_POLL_MAX_DELAY,
+):
+    """
+    Wait for a Batch API job to finish, backing off exponentially between polls.
+
+    Args:
+        client: AsyncOpenAI client
+        batch_id: ID of the batch to poll
+        initial_delay: Seconds to wait before the second poll
+        max_delay: Upper bound on the wait between polls
+
+    Returns:
+        The finished batch object
+    """
+    delay = initial_delay
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in BATCH_TERMINAL_STATUSES:
+            print(f"Image batch {batch_id} finished with status: {batch.status}")
+            return batch
+
+        print(f"Image batch {batch_id} is {batch.status}, checking again in {delay}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+async def iter_batch_results(client, batch):
+    """
+    Stream the output file of a completed batch one line at a time.
+
+    Args:
+        client: AsyncOpenAI client
+        batch: Completed batch object
+
+    Yields:
+        Tuples of (custom_id, response body) for each successful request
+    """
+    if not batch.output_file_id:
+        return
+
+    async with client.files.with_streaming_response.content(
+        batch.output_file_id
+    ) as response:
+        async for line in response.iter_lines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            result = record.get("response") or {}
+            if record.get("error") or result.get("status_code") != 200:
+                print(
+                    f"Batch request failed for content piece {record.get('custom_id')}: "
+                    f"{record.get('error') or result.get('body')}"
+                )
+                continue
+            yield record["custom_id"], result["body"]
+
+
+def mark_batch_submitted(supabase, content_ids, batch_id):
+    """Record the batch ID on submitted content pieces so re-runs can resume."""
+    supabase.table("content_pieces").update(
+        {
+            "status": "image_batch_submitted",
+            "image_batch_id": batch_id,
+            "lease_expires_at": None,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+    ).in_("id", content_ids).execute()
+
+
+def reset_batch_submitted(supabase, content_ids):
+    """Return content pieces from a failed batch to "line_edited" for a retry."""
+    supabase.table("content_pieces").update(
+        {
+            "status": "line_edited",
+            "image_batch_id": None,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+    ).in_("id", content_ids).execute()
+
+
+async def process_batch_results(supabase, client, batch_id, content_pieces, args):
+    """
+    Wait for a submitted batch and store the generated images.
+
+    Args:
+        supabase: Supabase client
+        client: AsyncOpenAI client
+        batch_id: ID of the submitted batch
+        content_pieces: Content pieces included in the batch
+        args: Parsed command line arguments
+
+    Returns:
+        List of IDs of the content pieces that failed
+    """
+    batch = await poll_batch(client, batch_id)
+    pieces_by_id = {piece["id"]: piece for piece in content_pieces}
+
+    # Each result is written to disk as soon as its line is read, so only one
+    # image is held in memory regardless of the batch size
+    generated = []
+    if batch.status == "completed":
+        async for content_id, body in iter_batch_results(client, batch):
+            piece = pieces_by_id.get(content_id)
+            if piece is None:
+                continue
+
+            image_metadata = {
+                "prompt": create_image_prompt(piece),
+                "revised_prompt": body["data"][0].get("revised_prompt"),
+                "model": "dall-e-3",
+                "size": args.size,
+                "quality": args.quality,
+                "batch_id": batch_id,
+                "created": datetime.utcnow().isoformat(),
+            }
+
+            image_path = await save_base64_image_to_file(
+                body["data"][0]["b64_json"], content_id, piece["title"]
+            )
+            generated.append((content_id, image_path, image_metadata))
+
+    stored = {content_id for content_id, _, _ in generated}
+    failures = [piece["id"] for piece in content_pieces if piece["id"] not in stored]
+    failures.extend(
+        await asyncio.to_thread(save_images_to_database, supabase, generated)
+    )
+    if failures:
+        await asyncio.to_thread(reset_batch_submitted, supabase, failures)
+    return failures
+
+
+async def run_batch_mode(supabase, args):
+    """
+    Generate images through the OpenAI Batch API.
+
+    Resumes any batches recorded by a previous run, then submits all pending
+    "line_edited" content pieces as one new batch and waits for it.
+
+    Args:
+        supabase: Supabase client
+        args: Parsed command line arguments
+
+    Returns:
+        Tuple of (number of content pieces processed, list of failed IDs)
+    """
+    client = await get_openai_client()
+    pending, batches = await asyncio.to_thread(get_batch_candidates, supabase)
+
+    if not pending and not batches:
+        raise AgentDataError("No content pieces with status 'line_edited' found")
+
+    # Claim pending pieces so concurrent runs do not submit them twice
+    pending = await asyncio.to_thread(claim_content_pieces, supabase, pending)
+
+    if pending:
+        prompts = {
+            piece["id"]: create_image_prompt(piece)
+            for piece in pending
+        }
+        batch_id = await submit_image_batch(
+            client, prompts, size=args.size, quality=args.quality
+        )
+        await asyncio.to_thread(
+            mark_batch_submitted, supabase, list(prompts), batch_id
+        )
+        batches[batch_id] = pending
+
+    failures = []
+    for batch_id, content_pieces in batches.items():
+        failures.extend(
+            await process_batch_results(supabase, client, batch_id, content_pieces, args)
+        )
+
+    return sum(len(pieces) for pieces in batches.values()), failures
+
+
+def run(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate the featured image for one content piece in-process.
+
+    Returns the produced image directly so a caller such as the orchestrator
+    can hand it to the next agent without polling the database for the
+    "image_generated" status. The database is still updated as a side effect.
+
+    Args:
+        input_data: Dictionary with "content_id" (or a full "content_piece"
+            row) and optional "no_ai", "size" and "quality"
+
+    Returns:
+        Dictionary with "content_id", "image_path", "image_metadata" and
+        "persisted" (whether the database update succeeded)
+
+    Raises:
+        RuntimeError: If another worker already owns the content piece
+    """
+    supabase = get_supabase_client()
+    content_piece = input_data.get("content_piece") or get_content_piece(
+        supabase, input_data.get("content_id")
+    )
+    args = argparse.Namespace(
+        no_ai=input_data.get("no_ai", False),
+        size=input_data.get("size", "1024x1024"),
+        quality=input_data.get("quality", "standard"),
+        concurrency=1,
+    )
+
+    async def _run():
+        openai_client = None if args.no_ai else await get_openai_client()
+        async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT) as http_client:
+            return await process_content_piece(
+                supabase,
+                openai_client,
+                http_client,
+                content_piece,
+                asyncio.Semaphore(args.concurrency),
+                args,
+            )
+
+    generated = asyncio.run(_run())
+    if generated is None:
+        raise RuntimeError(
+            f"Content piece {content_piece['id']} is claimed by another worker"
+        )
+
+    content_id, image_path, image_metadata = generated
+    failures = save_images_to_database(supabase, [generated])
+    return {
+        "content_id": content_id,
+        "image_path": image_path,
+        "image_metadata": image_metadata,
+        "persisted": not failures,
+    }
 
 
 def parse_arguments():
@@ -349,6 +1135,23 @@ def parse_arguments():
         choices=["standard", "hd"],
         help="Image quality (default: standard)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help=f"Maximum number of content pieces to process (default: {BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum concurrent DALL-E requests (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all pending pieces through the OpenAI Batch API (cheaper, not real-time)",
+    )
     return parser.parse_args()
 
 
@@ -356,36 +1159,34 @@ def main():
     """Main execution function."""
     args = parse_arguments()
 
-    # Initialize clients
-    supabase = get_supabase_client()
-
-    # Get content piece
-    content_piece = get_content_piece(supabase, args.content_id)
-    content_id = content_piece["id"]
-
-    print(f"Processing content piece: {content_piece['title']} (ID: {content_id})")
-
-    # Get keywords for better image prompts
-    keywords = get_content_keywords(supabase, content_id)
-
-    # Create image prompt
-    prompt = create_image_prompt(content_piece, keywords)
+    try:
+        # Initialize clients
+        supabase = get_supabase_client()
+
+        if args.batch and not args.no_ai and not args.content_id:
+            processed, failures = asyncio.run(run_batch_mode(supabase, args))
+        else:
+            # Get content pieces: a single piece by ID, or a batch of pending pieces
+            if args.content_id:
+                content_pieces = [get_content_piece(supabase, args.content_id)]
+            else:
+                content_pieces = get_content_pieces(supabase, limit=args.batch_size)
+
+            if args.no_ai:
+                print("Using mock image generator (--no-ai flag set)")
+
+            processed = len(content_pieces)
+            failures = asyncio.run(process_batch(supabase, content_pieces, args))
+    except AgentError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
 
-    # Generate image
-    if args.no_ai:
-        print("Using mock image generator (--no-ai flag set)")
-        image_data, image_metadata = generate_mock_image(prompt)
-    else:
-        openai_client = setup_openai()
-        image_data, image_metadata = generate_image_with_dalle(
-            openai_client, prompt, size=args.size, quality=args.quality
+    if failures:
+        print(
+            f"Image Generator Agent failed for {len(failures)} of "
+            f"{processed} content pieces"
         )
-
-    # Save image to file
-    image_path = save_image_to_file(image_data, content_id, content_piece["title"])
-
-    # Update database
-    update_database_with_image(supabase, content_id, image_path, image_metadata)
+        sys.exit(1)
 
     print("Image Generator Agent completed successfully")
 
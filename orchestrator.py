@@ -286,6 +286,44 @@ def run_wordpress_publisher_agent(
     return success
 
 
+def run_image_and_publish(
+    content_id,
+    supabase_client,
+    use_ai: bool = False,
+    preview: bool = False,
+):
+    """
+    Generate the featured image and publish the post in one process.
+
+    The image generator's result is handed straight to the publisher instead
+    of being written to the database and picked up again by status.
+
+    Args:
+        content_id (str): Content piece UUID.
+        supabase_client: Supabase client (placeholder, reserved for future use).
+        use_ai (bool): Whether to call OpenAI for the image.
+        preview (bool): If True, run the publisher in preview-only mode.
+    Returns:
+        bool: True on success, False on failure.
+    """
+    import image_generator_agent
+    import wordpress_publisher_agent
+
+    print(f"{BLUE}Running image generator + publisher for content: {content_id}{ENDC}")
+
+    input_data = {"content_id": content_id, "no_ai": not use_ai, "preview": preview}
+    try:
+        image_result = image_generator_agent.run(input_data)
+        publish_result = wordpress_publisher_agent.run(
+            {**input_data, "featured_image": image_result}
+        )
+    except (Exception, SystemExit) as e:
+        print(f"{RED}Error running image generator + publisher: {e}{ENDC}")
+        return False
+
+    return bool(publish_result.get("post_id"))
+
+
 # --------------------------------------------------------------------------- #
 # Line-Editor Agent                                                           #
 # --------------------------------------------------------------------------- #
@@ -383,6 +421,13 @@ AGENT_FUNCTIONS = {
 }
 
 
+# Agents whose successor runs in the same process; the successor's task is
+# skipped and the pipeline continues after it.
+FUSED_AGENTS = {
+    "image-generator-agent": ("wordpress-publisher-agent", run_image_and_publish),
+}
+
+
 def process_task(task: Dict[str, Any], supabase_client, use_ai: bool = True) -> None:
     """Execute an agent task and queue the next one if successful."""
     task_id = task["id"]
@@ -391,7 +436,11 @@ def process_task(task: Dict[str, Any], supabase_client, use_ai: bool = True) ->
 
     update_agent_status(task_id, "processing", supabase=supabase_client)
 
+    last_agent = agent
     runner = AGENT_FUNCTIONS.get(agent)
+    if agent in FUSED_AGENTS:
+        last_agent, runner = FUSED_AGENTS[agent]
+
     success = False
     if runner:
         if agent == "seo-agent":
@@ -401,7 +450,7 @@ def process_task(task: Dict[str, Any], supabase_client, use_ai: bool = True) ->
 
     if success:
         update_agent_status(task_id, "done", supabase=supabase_client)
-        next_agent = get_next_agent(agent)
+        next_agent = get_next_agent(last_agent)
         if next_agent:
             create_agent_task(next_agent, content_id, {}, supabase_client)
     else:
@@ -443,7 +492,7 @@ def process_content_piece(
     if status == "line_edited":
         return run_draft_assembly_agent(cid, supabase_client, use_ai)
     if status == "assembled":
-        return run_image_generator_agent(cid, supabase_client, use_ai)
+        return run_image_and_publish(cid, supabase_client, use_ai, preview=False)
     if status == "image_generated":
         # By default we publish immediately without preview mode.
         return run_wordpress_publisher_agent(
@@ -586,35 +635,19 @@ def full_pipeline(args):
         if i < len(content_pieces) - 1:
             time.sleep(1)
 
-    # Step 7: Run the image generator agent for each content piece
-    print(
-        f"{BOLD}Step 7: Running Image Generator Agent for {len(content_pieces)} content pieces{ENDC}"
-    )
-
-    image_success_count = 0
-    for i, content_id in enumerate(content_pieces):
-        print(
-            f"{BLUE}Processing content piece {i+1} of {len(content_pieces)} with Image Generator Agent{ENDC}"
-        )
-
-        if run_image_generator_agent(content_id, supabase_client, not args.no_ai):
-            image_success_count += 1
-
-        if i < len(content_pieces) - 1:
-            time.sleep(1)
-
-    # Step 8: Run the WordPress publisher agent for each content piece
+    # Step 7: Generate images and publish, handing each image straight to the
+    # publisher in-process
     print(
-        f"{BOLD}Step 7: Running WordPress Publisher Agent for {len(content_pieces)} content pieces{ENDC}"
+        f"{BOLD}Step 7: Running Image Generator + WordPress Publisher Agents for {len(content_pieces)} content pieces{ENDC}"
     )
 
     publish_success_count = 0
     for i, content_id in enumerate(content_pieces):
         print(
-            f"{BLUE}Processing content piece {i+1} of {len(content_pieces)} with WordPress Publisher Agent{ENDC}"
+            f"{BLUE}Processing content piece {i+1} of {len(content_pieces)} with Image Generator + WordPress Publisher Agents{ENDC}"
         )
 
-        if run_wordpress_publisher_agent(content_id, supabase_client, not args.no_ai):
+        if run_image_and_publish(content_id, supabase_client, not args.no_ai):
             publish_success_count += 1
 
         if i < len(content_pieces) - 1:
@@ -630,9 +663,8 @@ def full_pipeline(args):
     print(f"Flow Editing: {flow_success_count} of {len(content_pieces)} completed")
     print(f"Line Editing: {line_success_count} of {len(content_pieces)} completed")
     print(f"Draft Assembly: {assembly_success_count} of {len(content_pieces)} completed")
-    print(f"Image Generation: {image_success_count} of {len(content_pieces)} completed")
     print(
-        f"WordPress Publishing: {publish_success_count} of {len(content_pieces)} completed"
+        f"Image Generation + WordPress Publishing: {publish_success_count} of {len(content_pieces)} completed"
     )
 
     return 0
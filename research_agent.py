@@ -6,15 +6,20 @@ This agent takes SEO keyword data and generates research information for content
 """
 
 import argparse
-import json
+import asyncio
+import copy
 import os
 import sys
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List
 
+import fastjsonschema
+import orjson
 from dotenv import load_dotenv
 
+from agents.exceptions import AgentDataError
+from agents.shared.llm_cache import semantic_cache
 from agents.shared.utils import get_supabase_client, setup_openai
 
 # ANSI colors
@@ -28,6 +33,130 @@ BOLD = "\033[1m"
 # Load environment variables
 load_dotenv()
 
+# Maximum number of draft content pieces researched per run
+BATCH_SIZE = 5
+
+# Structured output schema for research completions (strict mode requires
+# every property to be listed as required and no extra properties)
+RESEARCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "research_points": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "excerpt": {"type": "string"},
+                    "url": {"type": "string"},
+                    "type": {
+                        "type": "string",
+                        "enum": [
+                            "fact",
+                            "quote",
+                            "statistic",
+                            "definition",
+                            "example",
+                            "study",
+                        ],
+                    },
+                    "confidence": {
+                        "type": "number",
+                        "description": "Reliability of the information, between 0 and 1",
+                    },
+                },
+                "required": ["excerpt", "url", "type", "confidence"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["research_points"],
+    "additionalProperties": False,
+}
+
+# Validator for parsed completions, compiled once at import. It also bounds
+# confidence, which strict structured outputs cannot express
+_validation_schema = copy.deepcopy(RESEARCH_SCHEMA)
+_validation_schema["properties"]["research_points"]["items"]["properties"][
+    "confidence"
+].update(minimum=0, maximum=1)
+validate_research_data = fastjsonschema.compile(_validation_schema)
+
+# Constant instructions are sent first as the system message, byte-for-byte
+# identical on every call, so the provider can reuse the cached prefix for
+# requests sharing this cache key
+RESEARCH_PROMPT_CACHE_KEY = "research-agent-v1"
+
+RESEARCH_SYSTEM_PROMPT = """
+You are a research assistant specialized in gathering valuable information for content creation.
+Provide high-quality research that would strengthen an article on the given topic.
+Use real sources where possible.
+
+Provide 5-7 research points that would be valuable for the article, including:
+1. Key facts and statistics
+2. Expert quotes or insights
+3. Examples or case studies
+4. Definitions of key terms
+5. Current trends or research findings
+
+For each research point, provide:
+- The excerpt (the actual information)
+- A source URL (use only high-quality, real sources)
+- The type of research (fact, quote, statistic, definition, example, or study)
+- A confidence score (0.0 to 1.0) indicating reliability of the information
+"""
+
+# Mock research used with --no-ai and when the OpenAI call fails:
+# (excerpt template, url, type, confidence)
+_MOCK_TEMPLATES = [
+    (
+        "According to a recent study, 78% of {aud} consider {fk} to be essential for success.",
+        "https://example.com/research-study",
+        "statistic",
+        0.85,
+    ),
+    (
+        "'{fk} represents a critical advancement in {niche},' stated Dr. Jane Smith, a leading expert in the field.",
+        "https://example.com/expert-interview",
+        "quote",
+        0.9,
+    ),
+    (
+        "{fk} refers to the systematic approach to implementing {niche} strategies that improve outcomes for {aud}.",
+        "https://example.com/glossary",
+        "definition",
+        0.95,
+    ),
+    (
+        "In 2023, the {niche} industry grew by 24%, with {fk} being a primary driver of this growth.",
+        "https://example.com/industry-report",
+        "fact",
+        0.88,
+    ),
+    (
+        "Company XYZ implemented {fk} strategies and saw a 35% increase in engagement among {aud}.",
+        "https://example.com/case-study",
+        "example",
+        0.82,
+    ),
+]
+
+# Set once the research table has been seen; a table does not disappear while
+# the agent runs, so the probe is skipped from then on
+_RESEARCH_TABLE_EXISTS = False
+
+
+def _build_mock_research(focus_keyword, audience, niche):
+    """Fill the mock research templates for a keyword, audience and niche."""
+    return [
+        {
+            "excerpt": template.format(fk=focus_keyword, aud=audience, niche=niche),
+            "url": url,
+            "type": research_type,
+            "confidence": confidence,
+        }
+        for template, url, research_type, confidence in _MOCK_TEMPLATES
+    ]
+
 
 def get_content_piece(supabase, content_id=None):
     """Get a content piece from Supabase."""
@@ -60,6 +189,27 @@ def get_content_piece(supabase, content_id=None):
         sys.exit(1)
 
 
+def get_content_pieces(supabase, limit=BATCH_SIZE):
+    """Get up to `limit` content pieces waiting for research."""
+    try:
+        response = (
+            supabase.table("content_pieces")
+            .select("*")
+            .eq("status", "draft")
+            .limit(limit)
+            .execute()
+        )
+    except Exception as e:
+        print(f"{RED}Error retrieving content pieces: {e}{ENDC}")
+        sys.exit(1)
+
+    if not response.data:
+        print(f"{RED}No content piece found{ENDC}")
+        sys.exit(1)
+
+    return response.data
+
+
 def get_content_keywords(supabase, content_id):
     """Get keywords for a content piece."""
     try:
@@ -99,6 +249,118 @@ def get_strategic_plan(supabase, plan_id):
         return None
 
 
+async def get_research_inputs(supabase, content_piece):
+    """
+    Get the keywords and strategic plan for a content piece concurrently.
+
+    The two lookups are independent, so they run on worker threads (the
+    Supabase client is synchronous) and cost one round-trip of wall time.
+
+    Returns:
+        Tuple of (keywords, strategic_plan); either may be None
+    """
+    keywords, strategic_plan = await asyncio.gather(
+        asyncio.to_thread(get_content_keywords, supabase, content_piece["id"]),
+        asyncio.to_thread(
+            get_strategic_plan, supabase, content_piece["strategic_plan_id"]
+        ),
+    )
+    return keywords, strategic_plan
+
+
+def read_streamed_json_object(stream):
+    """
+    Read a streamed chat completion until its top-level JSON object closes.
+
+    Braces are counted outside of string literals, so the object is parsed
+    as soon as its closing brace arrives and the rest of the stream is
+    dropped instead of waited for.
+    """
+    parts = []
+    depth = 0
+    in_string = escaped = False
+
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content or ""
+        for i, ch in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    parts.append(text[: i + 1])
+                    if hasattr(stream, "close"):
+                        stream.close()
+                    return orjson.loads("".join(parts))
+        parts.append(text)
+
+    return orjson.loads("".join(parts))
+
+
+@semantic_cache(
+    key_fn=lambda content_piece, keywords, strategic_plan: (
+        content_piece["title"],
+        keywords["focus_keyword"],
+        strategic_plan["niche"],
+        strategic_plan["audience"],
+    ),
+    threshold=0.92,
+)
+def request_research_points(openai_client, content_piece, keywords, strategic_plan):
+    """
+    Ask OpenAI for research points, reusing cached results for the same or a
+    near-identical (title, focus keyword, niche, audience).
+    """
+    # Only the article details vary; the instructions live in the system prompt
+    prompt = f"""
+    Perform research for an article with the following details:
+    
+    Title: {content_piece['title']}
+    Focus Keyword: {keywords['focus_keyword']}
+    Supporting Keywords: {', '.join(keywords.get('supporting_keywords', []))}
+    Audience: {strategic_plan['audience']}
+    Niche: {strategic_plan['niche']}
+    """
+
+    # Call OpenAI API
+    response = openai_client.chat.completions.create(
+        model="gpt-4o",  # Using GPT-4o, adjust based on your needs
+        messages=[
+            {"role": "system", "content": RESEARCH_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "research",
+                "schema": RESEARCH_SCHEMA,
+                "strict": True,
+            },
+        },
+        stream=True,
+        extra_body={"prompt_cache_key": RESEARCH_PROMPT_CACHE_KEY},
+    )
+
+    # Parse the response as soon as its JSON object is complete, then check it
+    # against the schema (invalid output raises and is never cached)
+    research_data = read_streamed_json_object(response)
+    validate_research_data(research_data)
+    research_points = research_data["research_points"]
+
+    return research_points
+
+
 def perform_research_with_ai(openai_client, content_piece, keywords, strategic_plan):
     """
     Perform research for a content piece using OpenAI.
@@ -108,113 +370,98 @@ def perform_research_with_ai(openai_client, content_piece, keywords, strategic_p
     )
 
     try:
-        # Craft a prompt for OpenAI
-        prompt = f"""
-        Perform research for an article with the following details:
-        
-        Title: {content_piece['title']}
-        Focus Keyword: {keywords['focus_keyword']}
-        Supporting Keywords: {', '.join(keywords.get('supporting_keywords', []))}
-        Audience: {strategic_plan['audience']}
-        Niche: {strategic_plan['niche']}
-        
-        Provide 5-7 research points that would be valuable for this article, including:
-        1. Key facts and statistics
-        2. Expert quotes or insights
-        3. Examples or case studies
-        4. Definitions of key terms
-        5. Current trends or research findings
-        
-        For each research point, provide:
-        - The excerpt (the actual information)
-        - A source URL (use only high-quality, real sources)
-        - The type of research (fact, quote, statistic, definition, example, or study)
-        - A confidence score (0.0 to 1.0) indicating reliability of the information
-        
-        Format your response as a valid JSON object with a "research_points" array of objects,
-        where each object has these keys:
-        - excerpt (string)
-        - url (string)
-        - type (string, one of: fact, quote, statistic, definition, example, study)
-        - confidence (number between 0 and 1)
-        """
-
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
-            model="gpt-4o",  # Using GPT-4o, adjust based on your needs
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a research assistant specialized in gathering valuable information for content creation. Provide high-quality research that would strengthen an article on the given topic. Use real sources where possible.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
+        return request_research_points(
+            openai_client, content_piece, keywords, strategic_plan
         )
 
-        # Parse the response
-        result_text = response.choices[0].message.content
-        research_data = json.loads(result_text)
-        research_points = research_data.get("research_points", [])
-
-        print(f"{GREEN}Generated {len(research_points)} research points{ENDC}")
-
-        return research_points
-
     except Exception as e:
         print(f"{RED}Error performing research with AI: {e}{ENDC}")
         # Fall back to mock data if AI fails
         print(f"{YELLOW}Falling back to mock research generation{ENDC}")
 
-        # Mock research data
-        mock_research = [
-            {
-                "excerpt": f"According to a recent study, 78% of {strategic_plan['audience']} consider {keywords['focus_keyword']} to be essential for success.",
-                "url": "https://example.com/research-study",
-                "type": "statistic",
-                "confidence": 0.85,
-            },
-            {
-                "excerpt": f"'{keywords['focus_keyword']} represents a critical advancement in {strategic_plan['niche']},' stated Dr. Jane Smith, a leading expert in the field.",
-                "url": "https://example.com/expert-interview",
-                "type": "quote",
-                "confidence": 0.9,
-            },
-            {
-                "excerpt": f"{keywords['focus_keyword']} refers to the systematic approach to implementing {strategic_plan['niche']} strategies that improve outcomes for {strategic_plan['audience']}.",
-                "url": "https://example.com/glossary",
-                "type": "definition",
-                "confidence": 0.95,
-            },
-            {
-                "excerpt": f"In 2023, the {strategic_plan['niche']} industry grew by 24%, with {keywords['focus_keyword']} being a primary driver of this growth.",
-                "url": "https://example.com/industry-report",
-                "type": "fact",
-                "confidence": 0.88,
-            },
-            {
-                "excerpt": f"Company XYZ implemented {keywords['focus_keyword']} strategies and saw a 35% increase in engagement among {strategic_plan['audience']}.",
-                "url": "https://example.com/case-study",
-                "type": "example",
-                "confidence": 0.82,
-            },
-        ]
+        return _build_mock_research(
+            keywords["focus_keyword"],
+            strategic_plan["audience"],
+            strategic_plan["niche"],
+        )
+
+
+def _get_research_points(
+    openai_client, content_piece, keywords, strategic_plan, use_ai=True
+):
+    """Return research points from OpenAI, or mock research if AI is disabled."""
+    if use_ai:
+        return perform_research_with_ai(
+            openai_client, content_piece, keywords, strategic_plan
+        )
 
-        return mock_research
+    print(f"{YELLOW}Using mock data for research{ENDC}")
+    return _build_mock_research(
+        keywords["focus_keyword"],
+        strategic_plan["audience"],
+        strategic_plan["niche"],
+    )
+
+
+def research_table_exists(supabase):
+    """Check whether the research table exists, probing at most once per process."""
+    global _RESEARCH_TABLE_EXISTS
+    if not _RESEARCH_TABLE_EXISTS:
+        try:
+            supabase.table("research").select("count", count="exact").limit(1).execute()
+            _RESEARCH_TABLE_EXISTS = True
+        except Exception:
+            return False
+    return True
+
+
+def _save_research_separately(supabase, content_id, research_entries, agent_status_data):
+    """Save research data with one request per table (fallback for the RPC)."""
+    if research_entries:
+        try:
+            response = supabase.table("research").insert(research_entries).execute()
+            inserted = response.data or []
+            for row in inserted:
+                print(
+                    f"{GREEN}Inserted research point: {row.get('excerpt', '')[:50]}...{ENDC}"
+                )
+            if len(inserted) < len(research_entries):
+                print(
+                    f"{YELLOW}Failed to insert {len(research_entries) - len(inserted)} "
+                    f"of {len(research_entries)} research points{ENDC}"
+                )
+        except Exception as e:
+            print(f"{RED}Error inserting research points: {e}{ENDC}")
+
+    # Update content piece status
+    try:
+        supabase.table("content_pieces").update({"status": "researched"}).eq(
+            "id", content_id
+        ).execute()
+        print(f"{GREEN}Updated content piece status to 'researched'{ENDC}")
+    except Exception as e:
+        print(f"{RED}Error updating content piece status: {e}{ENDC}")
+
+    # Create agent status entry
+    try:
+        supabase.table("agent_status").insert(agent_status_data).execute()
+        print(f"{GREEN}Created agent status entry for research agent{ENDC}")
+    except Exception as e:
+        print(f"{RED}Error creating agent status entry: {e}{ENDC}")
 
 
 def save_research_to_database(supabase, content_id, research_points):
-    """Save research data to the database."""
+    """
+    Save research data to the database.
+
+    The research rows, the content piece status update and the agent status
+    entry are written in one transaction by the finalize_research function
+    (database/migrations/005_finalize_research.sql). If that function is not
+    installed, they are written with separate requests instead.
+    """
     print(f"{BLUE}Saving research data to database...{ENDC}")
 
-    # Check if the research table exists
-    try:
-        test_query = (
-            supabase.table("research").select("count", count="exact").limit(1).execute()
-        )
-        table_exists = True
-    except Exception:
-        table_exists = False
+    table_exists = research_table_exists(supabase)
 
     if not table_exists:
         print(f"{YELLOW}Research table doesn't exist yet. Creating it...{ENDC}")
@@ -250,59 +497,123 @@ def save_research_to_database(supabase, content_id, research_points):
             print(
                 f"{YELLOW}Please create the table through the Supabase dashboard.{ENDC}"
             )
-    else:
-        # Save research data
-        for point in research_points:
-            research_entry = {
+
+    research_entries = []
+    if table_exists:
+        research_entries = [
+            {
                 "content_id": content_id,
                 "excerpt": point["excerpt"],
                 "url": point["url"],
                 "type": point["type"],
                 "confidence": point["confidence"],
             }
+            for point in research_points
+        ]
 
-            try:
-                response = supabase.table("research").insert(research_entry).execute()
-                if not response.data:
-                    print(
-                        f"{YELLOW}Failed to insert research point: {point['excerpt'][:50]}...{ENDC}"
-                    )
-                else:
-                    print(
-                        f"{GREEN}Inserted research point: {point['excerpt'][:50]}...{ENDC}"
-                    )
-            except Exception as e:
-                print(f"{RED}Error inserting research point: {e}{ENDC}")
+    agent_status_data = {
+        "agent": "research-agent",
+        "content_id": content_id,
+        "status": "done",
+        "input": {
+            "content_id": content_id,
+            "timestamp": datetime.now().isoformat(),
+        },
+        "output": {
+            "research_points": research_points,
+            "timestamp": datetime.now().isoformat(),
+        },
+    }
 
-    # Update content piece status
     try:
-        supabase.table("content_pieces").update({"status": "researched"}).eq(
-            "id", content_id
+        supabase.rpc(
+            "finalize_research",
+            {
+                "p_content_id": content_id,
+                "p_rows": research_entries,
+                "p_agent_input": agent_status_data["input"],
+                "p_agent_output": agent_status_data["output"],
+            },
         ).execute()
-        print(f"{GREEN}Updated content piece status to 'researched'{ENDC}")
+        print(
+            f"{GREEN}Saved {len(research_entries)} research points and updated "
+            f"content piece status to 'researched'{ENDC}"
+        )
+        return
     except Exception as e:
-        print(f"{RED}Error updating content piece status: {e}{ENDC}")
+        print(
+            f"{YELLOW}finalize_research RPC failed ({e}); "
+            f"saving with separate requests{ENDC}"
+        )
 
-    # Create agent status entry
-    try:
-        agent_status_data = {
-            "agent": "research-agent",
-            "content_id": content_id,
-            "status": "done",
-            "input": {
-                "content_id": content_id,
-                "timestamp": datetime.now().isoformat(),
-            },
-            "output": {
-                "research_points": research_points,
-                "timestamp": datetime.now().isoformat(),
-            },
-        }
+    _save_research_separately(supabase, content_id, research_entries, agent_status_data)
 
-        supabase.table("agent_status").insert(agent_status_data).execute()
-        print(f"{GREEN}Created agent status entry for research agent{ENDC}")
-    except Exception as e:
-        print(f"{RED}Error creating agent status entry: {e}{ENDC}")
+
+async def research_content_piece(supabase, openai_client, content_piece, no_ai=False):
+    """
+    Research one content piece and save the results.
+
+    Returns:
+        Tuple of (results filename, research points)
+
+    Raises:
+        AgentDataError: If the keywords or strategic plan are missing
+    """
+    print(f"{GREEN}Retrieved content piece: {content_piece['title']}{ENDC}")
+
+    # Get keywords and the strategic plan for the content piece
+    keywords, strategic_plan = await get_research_inputs(supabase, content_piece)
+    if not keywords:
+        raise AgentDataError("No keywords found for this content piece.")
+
+    print(f"{GREEN}Retrieved keywords: {keywords['focus_keyword']}{ENDC}")
+
+    if not strategic_plan:
+        raise AgentDataError("No strategic plan found.")
+
+    # Perform research; the shared OpenAI client is thread-safe, so pieces in
+    # a batch have their completions in flight together
+    research_points = await asyncio.to_thread(
+        _get_research_points,
+        openai_client,
+        content_piece,
+        keywords,
+        strategic_plan,
+        not no_ai,
+    )
+
+    # Save results to file and database; the local write overlaps the
+    # Supabase round-trip
+    filename, _ = await asyncio.gather(
+        asyncio.to_thread(
+            save_results_to_file,
+            content_piece["id"],
+            content_piece["title"],
+            research_points,
+        ),
+        asyncio.to_thread(
+            save_research_to_database, supabase, content_piece["id"], research_points
+        ),
+    )
+
+    return filename, research_points
+
+
+async def research_content_pieces(supabase, openai_client, content_pieces, no_ai=False):
+    """
+    Research several content pieces concurrently.
+
+    Returns:
+        One entry per content piece: its (filename, research points) tuple, or
+        the exception that stopped it
+    """
+    return await asyncio.gather(
+        *[
+            research_content_piece(supabase, openai_client, piece, no_ai)
+            for piece in content_pieces
+        ],
+        return_exceptions=True,
+    )
 
 
 def save_results_to_file(content_id, content_title, research_points):
@@ -314,10 +625,11 @@ def save_results_to_file(content_id, content_title, research_points):
         "timestamp": datetime.now().isoformat(),
     }
 
-    filename = f"research_{content_id.split('-')[0]}.json"
+    # Content IDs are Postgres UUIDs, whose first segment is 8 characters
+    filename = f"research_{content_id[:8]}.json"
 
-    with open(filename, "w") as f:
-        json.dump(results, f, indent=2)
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
 
     print(f"{GREEN}Results saved to {filename}{ENDC}")
 
@@ -332,6 +644,12 @@ def main():
     parser.add_argument(
         "--no-ai", action="store_true", help="Disable AI and use mock data instead"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help=f"Maximum number of draft content pieces to research (default: {BATCH_SIZE})",
+    )
     args = parser.parse_args()
 
     print(f"{BOLD}WordPress Content Generator - Research Agent{ENDC}")
@@ -351,84 +669,31 @@ def main():
             print(f"{YELLOW}Falling back to mock data generation{ENDC}")
             args.no_ai = True
 
-    # Get the content piece
-    content_piece = get_content_piece(supabase, args.content_id)
-    print(f"{GREEN}Retrieved content piece: {content_piece['title']}{ENDC}")
-
-    # Get keywords for the content piece
-    keywords = get_content_keywords(supabase, content_piece["id"])
-    if not keywords:
-        print(f"{RED}No keywords found for this content piece. Cannot proceed.{ENDC}")
-        sys.exit(1)
-
-    print(f"{GREEN}Retrieved keywords: {keywords['focus_keyword']}{ENDC}")
-
-    # Get the strategic plan
-    strategic_plan = get_strategic_plan(supabase, content_piece["strategic_plan_id"])
-    if not strategic_plan:
-        print(f"{RED}No strategic plan found. Cannot proceed.{ENDC}")
-        sys.exit(1)
-
-    # Perform research
-    if args.no_ai:
-        # Use mock data if AI is disabled
-        research_points = [
-            {
-                "excerpt": f"According to a recent study, 78% of {strategic_plan['audience']} consider {keywords['focus_keyword']} to be essential for success.",
-                "url": "https://example.com/research-study",
-                "type": "statistic",
-                "confidence": 0.85,
-            },
-            {
-                "excerpt": f"'{keywords['focus_keyword']} represents a critical advancement in {strategic_plan['niche']},' stated Dr. Jane Smith, a leading expert in the field.",
-                "url": "https://example.com/expert-interview",
-                "type": "quote",
-                "confidence": 0.9,
-            },
-            {
-                "excerpt": f"{keywords['focus_keyword']} refers to the systematic approach to implementing {strategic_plan['niche']} strategies that improve outcomes for {strategic_plan['audience']}.",
-                "url": "https://example.com/glossary",
-                "type": "definition",
-                "confidence": 0.95,
-            },
-            {
-                "excerpt": f"In 2023, the {strategic_plan['niche']} industry grew by 24%, with {keywords['focus_keyword']} being a primary driver of this growth.",
-                "url": "https://example.com/industry-report",
-                "type": "fact",
-                "confidence": 0.88,
-            },
-            {
-                "excerpt": f"Company XYZ implemented {keywords['focus_keyword']} strategies and saw a 35% increase in engagement among {strategic_plan['audience']}.",
-                "url": "https://example.com/case-study",
-                "type": "example",
-                "confidence": 0.82,
-            },
-        ]
-        print(f"{YELLOW}Using mock data for research{ENDC}")
+    # Get the content pieces: one by ID, or a batch of drafts
+    if args.content_id:
+        content_pieces = [get_content_piece(supabase, args.content_id)]
     else:
-        # Use OpenAI to generate research
-        research_points = perform_research_with_ai(
-            openai_client, content_piece, keywords, strategic_plan
-        )
-
-    print(f"{GREEN}Generated {len(research_points)} research points{ENDC}")
+        content_pieces = get_content_pieces(supabase, args.batch_size)
 
-    # Save results to file
-    filename = save_results_to_file(
-        content_piece["id"], content_piece["title"], research_points
+    results = asyncio.run(
+        research_content_pieces(supabase, openai_client, content_pieces, args.no_ai)
     )
 
-    # Save results to database
-    save_research_to_database(supabase, content_piece["id"], research_points)
-
-    print(f"\n{BOLD}Research Complete!{ENDC}")
-    print(
-        f"Generated {len(research_points)} research points for '{content_piece['title']}'"
-    )
-    print(f"You can view the results in {filename}")
-
-    return 0
+    failures = 0
+    for content_piece, result in zip(content_pieces, results):
+        if isinstance(result, Exception):
+            print(f"{RED}{result} Cannot proceed with '{content_piece['title']}'.{ENDC}")
+            failures += 1
+            continue
+
+        filename, research_points = result
+        print(f"\n{BOLD}Research Complete!{ENDC}")
+        print(
+            f"Generated {len(research_points)} research points for '{content_piece['title']}'"
+        )
+        print(f"You can view the results in {filename}")
 
+    return 1 if failures else 0
 
 if __name__ == "__main__":
     sys.exit(main())
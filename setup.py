@@ -48,7 +48,7 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "": ["*.json", "*.md", "*.sql"],
+        "": ["*.json", "*.md", "*.sql", "*.png"],
     },
     zip_safe=False,
 )
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock
+
+from postgrest.types import CountMethod, ReturnMethod
+
+from agents.shared import utils
+
+
+class TestAgentStatusUtils(unittest.TestCase):
+    def test_update_agent_status_without_row(self):
+        supabase = MagicMock()
+        update = supabase.table.return_value.update
+        update.return_value.eq.return_value.execute.return_value = MagicMock(count=1)
+
+        result = utils.update_agent_status(
+            "task-1", "done", supabase=supabase, return_row=False
+        )
+
+        self.assertIsNone(result)
+        self.assertEqual(
+            update.call_args[1],
+            {"count": CountMethod.exact, "returning": ReturnMethod.minimal},
+        )
+
+    def test_update_agent_status_without_row_missing_task(self):
+        supabase = MagicMock()
+        update = supabase.table.return_value.update
+        update.return_value.eq.return_value.execute.return_value = MagicMock(count=0)
+
+        with self.assertRaisesRegex(ValueError, "task-1 not found"):
+            utils.update_agent_status(
+                "task-1", "done", supabase=supabase, return_row=False
+            )
+
+    def test_create_agent_tasks_inserts_once(self):
+        supabase = MagicMock()
+        insert = supabase.table.return_value.insert
+        insert.return_value.execute.return_value = MagicMock(data=[{"id": 1}, {"id": 2}])
+
+        result = utils.create_agent_tasks(
+            [("seo-agent", "c1", {"plan_id": "p"}), ("seo-agent", "c2", {})],
+            supabase,
+        )
+
+        self.assertEqual(result, [{"id": 1}, {"id": 2}])
+        insert.assert_called_once()
+        rows = insert.call_args[0][0]
+        self.assertEqual([row["content_id"] for row in rows], ["c1", "c2"])
+        self.assertTrue(all(row["status"] == "queued" for row in rows))
+
+    def test_create_agent_tasks_empty(self):
+        supabase = MagicMock()
+        self.assertEqual(utils.create_agent_tasks([], supabase), [])
+        supabase.table.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for the check_sample_data script."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure parent path for imports
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import check_sample_data
+
+
+def paged_client(rows):
+    """Supabase mock that serves `rows` through .range(start, end)."""
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value
+
+    def range_(start, end):
+        return MagicMock(execute=MagicMock(return_value=MagicMock(data=rows[start:end + 1])))
+
+    query.range.side_effect = range_
+    return supabase
+
+
+class TestIterTableRows(unittest.TestCase):
+    def test_pages_until_exhausted(self):
+        supabase = paged_client(list(range(25)))
+        rows = list(
+            check_sample_data.iter_table_rows(supabase, "keywords", page_size=10)
+        )
+        self.assertEqual(rows, list(range(25)))
+        query = supabase.table.return_value.select
+        query.assert_called_with("*")
+        self.assertEqual(query.return_value.range.call_count, 3)
+
+    def test_limit_and_content_columns(self):
+        supabase = paged_client(list(range(25)))
+        rows = list(check_sample_data.iter_table_rows(supabase, "content_pieces", limit=5))
+        self.assertEqual(rows, list(range(5)))
+        columns = supabase.table.return_value.select.call_args.args[0]
+        self.assertNotIn("draft_text", columns)
+        self.assertNotIn("final_text", columns)
+        # Columns added by migrations would break older schemas
+        self.assertEqual(
+            columns.split(","),
+            ["id", "strategic_plan_id", "title", "slug", "status", "created_at", "updated_at"],
+        )
+        supabase.table.return_value.select.return_value.range.assert_called_once_with(0, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Tests for the check_setup script."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+# Ensure parent path for imports
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import check_setup
+
+
+MODELS = [{"id": "gpt-4o"}, {"id": "gpt-4"}]
+
+
+def handler(request):
+    if request.url.host == "api.openai.com":
+        assert request.url.path == "/v1/models"
+        return httpx.Response(200, json={"data": MODELS})
+    assert request.method == "HEAD"
+    assert request.headers["Prefer"] == "count=exact"
+    return httpx.Response(200, headers={"Content-Range": "*/7"})
+
+
+class TestConnectionChecks(unittest.TestCase):
+    def run_checks(self, **selected):
+        transport = httpx.MockTransport(handler)
+        real_client = httpx.AsyncClient
+
+        def client(**kwargs):
+            return real_client(transport=transport, **kwargs)
+
+        with patch("httpx.AsyncClient", side_effect=client):
+            return asyncio.run(check_setup.check_connections(**selected))
+
+    @patch.dict(
+        os.environ,
+        {"SUPABASE_URL": "https://db.example.co", "SUPABASE_KEY": "k", "OPENAI_API_KEY": "sk"},
+    )
+    def test_both_checks_report_results(self):
+        results = self.run_checks(supabase=True, openai=True)
+        self.assertEqual(
+            results,
+            {
+                "Supabase connection": ("OK", "Connected, found 7 strategic plans"),
+                "OpenAI connection": ("OK", "Connected, 2 models available"),
+            },
+        )
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "sk"})
+    def test_only_selected_checks_run(self):
+        results = self.run_checks(supabase=False, openai=True)
+        self.assertEqual(list(results), ["OpenAI connection"])
+
+    def test_no_checks_selected_skips_httpx(self):
+        with patch.dict(sys.modules, {"httpx": None}):
+            self.assertEqual(
+                asyncio.run(check_setup.check_connections(supabase=False, openai=False)),
+                {},
+            )
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "sk"})
+    @patch.object(sys.modules[__name__], "MODELS", [{"id": "whisper-1"}])
+    def test_openai_without_gpt_models_warns(self):
+        status, _ = self.run_checks(supabase=False, openai=True)["OpenAI connection"]
+        self.assertEqual(status, "WARNING")
+
+
+class TestFileStructure(unittest.TestCase):
+    def test_files_are_reported_in_expected_order(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "agents", "shared"))
+            for name in ("agents/shared/utils.py", "requirements.txt"):
+                open(os.path.join(root, name), "w").close()
+
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                existing, missing = check_setup.check_file_structure()
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(existing, ["agents/shared/utils.py", "requirements.txt"])
+        self.assertEqual(missing[:2], ["agents/shared/schemas.py", "agents/seo-agent/index.py"])
+        self.assertEqual(len(missing), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Tests for the create_tables_admin script."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure parent path for imports
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+import create_tables_admin
+
+
+class TestCountTableRows(unittest.TestCase):
+    def test_single_rpc_reports_every_table(self):
+        supabase = MagicMock()
+        supabase.rpc.return_value.execute.return_value = MagicMock(
+            data=[
+                {"table_name": "strategic_plans", "table_exists": True, "row_count": 2},
+                {"table_name": "keywords", "table_exists": False, "row_count": None},
+            ]
+        )
+
+        counts = create_tables_admin.count_table_rows(
+            supabase, ["strategic_plans", "keywords"]
+        )
+
+        self.assertEqual(counts, {"strategic_plans": 2, "keywords": None})
+        supabase.rpc.assert_called_once_with(
+            "check_tables_exist", {"names": ["strategic_plans", "keywords"]}
+        )
+        supabase.table.assert_not_called()
+
+    def test_falls_back_to_per_table_probes(self):
+        supabase = MagicMock()
+        supabase.rpc.side_effect = Exception("function check_tables_exist does not exist")
+
+        def table(name):
+            query = MagicMock()
+            execute = query.select.return_value.execute
+            if name == "keywords":
+                execute.side_effect = Exception("relation does not exist")
+            else:
+                execute.return_value = MagicMock(count=3)
+            return query
+
+        supabase.table.side_effect = table
+
+        counts = create_tables_admin.count_table_rows(
+            supabase, ["strategic_plans", "keywords"]
+        )
+
+        self.assertEqual(counts, {"strategic_plans": 3, "keywords": None})
+
+
+class TestCreateTables(unittest.TestCase):
+    def test_sql_method_is_probed_once(self):
+        supabase = MagicMock()
+        supabase.postgrest.schema.side_effect = AttributeError("no raw SQL")
+        rpc_calls = []
+
+        def rpc(name, params):
+            rpc_calls.append(name)
+            if name == "pg_execute":
+                raise Exception("function pg_execute does not exist")
+            return MagicMock()
+
+        supabase.rpc.side_effect = rpc
+
+        create_tables_admin.create_tables(supabase)
+
+        self.assertEqual(supabase.postgrest.schema.call_count, 1)
+        self.assertEqual(rpc_calls, ["pg_execute"] + ["execute_sql"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,12 @@
 import sys
 import os
 import unittest
+from unittest.mock import MagicMock
 
 # Add repository root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from draft_assembly_agent import assemble_content
+from draft_assembly_agent import assemble_content, fetch_assembly_inputs, save_final_text
 
 
 class TestDraftAssemblyAgent(unittest.TestCase):
@@ -22,6 +23,55 @@ class TestDraftAssemblyAgent(unittest.TestCase):
         self.assertIn("Read this!", result)
         self.assertIn("- Tip1", result)
         self.assertIn("Body", result)
+        self.assertEqual(
+            result,
+            "# Better Title\n\n> Read this!\n\nBody\n\n"
+            "<!-- START: hook-agent.micro-hooks -->\n- Tip1\n- Tip2\n"
+            "<!-- END: hook-agent.micro-hooks -->\n",
+        )
+
+    def test_fetch_assembly_inputs(self):
+        rows = {
+            "content_pieces": [{"id": "c1", "title": "My Post"}],
+            "headlines": [{"selected_title": "Better Title"}],
+            "hooks": [],
+        }
+        tables = {
+            name: MagicMock(
+                **{"select.return_value.eq.return_value.execute.return_value": MagicMock(data=data)}
+            )
+            for name, data in rows.items()
+        }
+        supabase = MagicMock()
+        supabase.table.side_effect = tables.get
+
+        piece, headline, hooks = fetch_assembly_inputs(supabase, "c1")
+
+        tables["content_pieces"].select.assert_called_once_with("id,title,draft_text")
+        tables["headlines"].select.assert_called_once_with("selected_title")
+        tables["hooks"].select.assert_called_once_with("main_hook,micro_hooks")
+        self.assertEqual(piece["id"], "c1")
+        self.assertEqual(headline["selected_title"], "Better Title")
+        self.assertIsNone(hooks)
+
+    def test_save_final_text_uses_one_rpc(self):
+        supabase = MagicMock()
+
+        save_final_text(supabase, "c1", "Final")
+
+        supabase.rpc.assert_called_once_with(
+            "save_final_and_log", {"p_content_id": "c1", "p_final_text": "Final"}
+        )
+        supabase.table.assert_not_called()
+
+    def test_save_final_text_falls_back_without_rpc(self):
+        supabase = MagicMock()
+        supabase.rpc.side_effect = Exception("function save_final_and_log does not exist")
+
+        save_final_text(supabase, "c1", "Final")
+
+        tables = [c.args[0] for c in supabase.table.call_args_list]
+        self.assertEqual(tables, ["content_pieces", "agent_status"])
 
 
 if __name__ == "__main__":
@@ -5,9 +5,10 @@ Unit tests for the draft writer agent.
 import json
 import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import ANY, MagicMock, mock_open, patch
 
 import pytest
 
@@ -16,12 +17,15 @@ sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+from agents.shared.utils import clear_client_cache, count_tokens
 # Import functions to test
-from draft_writer_agent import (get_content_keywords, get_content_piece,
-                                get_content_research, get_seo_agent_output,
-                                get_strategic_plan, get_supabase_client,
-                                save_draft_to_database, save_draft_to_file,
-                                setup_openai, write_draft_with_ai)
+from draft_writer_agent import (DRAFT_PROMPT_CACHE_KEY, DRAFT_SYSTEM_PROMPT,
+                                get_content_keywords, get_content_piece,
+                                get_content_pieces, get_content_research,
+                                get_seo_agent_output, get_strategic_plan,
+                                get_supabase_client, save_draft_to_database,
+                                save_draft_to_file, setup_openai,
+                                write_draft_with_ai, write_drafts_with_ai)
 
 
 class TestDraftWriterAgent(unittest.TestCase):
@@ -29,6 +33,19 @@ class TestDraftWriterAgent(unittest.TestCase):
 
     def setUp(self):
         """Set up test case."""
+        # Clear cached clients so each test builds its own
+        clear_client_cache()
+
+        # Keep the LLM cache out of the working tree and isolated per test
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = patch.dict(
+            os.environ,
+            {"LLM_CACHE_PATH": os.path.join(cache_dir.name, "llm_cache.sqlite3")},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
         self.mock_content_piece = {
             "id": "test-content-id",
             "strategic_plan_id": "test-plan-id",
@@ -115,15 +132,15 @@ In conclusion, test keyword is important for test audience.
     @patch("os.getenv")
     def test_get_supabase_client(self, mock_getenv):
         """Test Supabase client creation with valid credentials."""
-        mock_getenv.side_effect = lambda x: (
+        mock_getenv.side_effect = lambda x, default=None: (
             "fake-url" if x == "SUPABASE_URL" else "fake-key"
         )
 
-        with patch("agents.shared.utils.create_client") as mock_create_client:
+        with patch("supabase.create_client") as mock_create_client:
             mock_create_client.return_value = "mock-supabase-client"
             client = get_supabase_client()
 
-            mock_create_client.assert_called_once_with("fake-url", "fake-key")
+            mock_create_client.assert_called_once_with("fake-url", "fake-key", options=ANY)
             self.assertEqual(client, "mock-supabase-client")
 
     def test_get_content_piece_with_id(self):
@@ -263,6 +280,184 @@ In conclusion, test keyword is important for test audience.
         mock_openai_client.chat.completions.create.assert_called_once()
         self.assertEqual(result, self.mock_draft_text)
 
+    @patch("builtins.print")
+    def test_write_draft_with_ai_sends_static_prefix_first(self, mock_print):
+        """Test that only the article brief varies between draft requests."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content=self.mock_draft_text))]
+        )
+
+        for title in ("First Title", "Second Title"):
+            write_draft_with_ai(
+                mock_openai_client,
+                dict(self.mock_content_piece, title=title),
+                self.mock_keywords,
+                self.mock_research,
+                self.mock_plan,
+                self.mock_seo_output,
+            )
+
+        calls = mock_openai_client.chat.completions.create.call_args_list
+        self.assertEqual(len(calls), 2)
+        for call, title in zip(calls, ("First Title", "Second Title")):
+            system, user = call.kwargs["messages"]
+            self.assertEqual(system, {"role": "system", "content": DRAFT_SYSTEM_PROMPT})
+            self.assertTrue(user["content"].startswith(f"Title: {title}\n"))
+            self.assertNotIn("Important Guidelines", user["content"])
+            self.assertEqual(
+                call.kwargs["extra_body"], {"prompt_cache_key": DRAFT_PROMPT_CACHE_KEY}
+            )
+
+    def test_system_prompt_is_long_enough_to_cache(self):
+        """Test that the static prefix exceeds the 1024-token prompt cache minimum."""
+        self.assertGreaterEqual(count_tokens(DRAFT_SYSTEM_PROMPT), 1024)
+
+    @patch("builtins.print")
+    def test_write_draft_with_ai_reuses_cached_draft(self, mock_print):
+        """Test that rerunning the same draft request skips the API call."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.chat.completions.create.return_value = MagicMock(
+            choices=[
+                MagicMock(
+                    message=MagicMock(content=self.mock_draft_text),
+                    finish_reason="stop",
+                )
+            ]
+        )
+        args = (
+            self.mock_content_piece,
+            self.mock_keywords,
+            self.mock_research,
+            self.mock_plan,
+            self.mock_seo_output,
+        )
+
+        first = write_draft_with_ai(mock_openai_client, *args)
+        second = write_draft_with_ai(mock_openai_client, *args)
+
+        mock_openai_client.chat.completions.create.assert_called_once()
+        self.assertEqual(first, self.mock_draft_text)
+        self.assertEqual(second, self.mock_draft_text)
+
+    @patch("builtins.print")
+    def test_write_draft_with_ai_does_not_cache_truncated_draft(self, mock_print):
+        """Test that a draft cut off at the token limit is used but not cached."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.chat.completions.create.return_value = MagicMock(
+            choices=[
+                MagicMock(
+                    message=MagicMock(content=self.mock_draft_text),
+                    finish_reason="length",
+                )
+            ]
+        )
+        args = (
+            self.mock_content_piece,
+            self.mock_keywords,
+            self.mock_research,
+            self.mock_plan,
+            self.mock_seo_output,
+        )
+
+        first = write_draft_with_ai(mock_openai_client, *args)
+        write_draft_with_ai(mock_openai_client, *args)
+
+        self.assertEqual(first, self.mock_draft_text)
+        self.assertEqual(mock_openai_client.chat.completions.create.call_count, 2)
+
+    @patch("builtins.print")
+    def test_write_drafts_with_ai_does_not_cache_unparseable_reply(self, mock_print):
+        """Test that a batched reply that is not valid JSON is never replayed."""
+        mock_openai_client = MagicMock()
+        batched = MagicMock(
+            choices=[
+                MagicMock(message=MagicMock(content='{"articles": ['), finish_reason="stop")
+            ]
+        )
+        single = MagicMock(
+            choices=[MagicMock(message=MagicMock(content="# Draft"), finish_reason="stop")]
+        )
+        mock_openai_client.chat.completions.create.side_effect = [
+            batched, single, single, batched
+        ]
+        jobs = [self._job("piece-1"), self._job("piece-2")]
+        jobs[1]["content_piece"]["title"] = "Another Article Title"
+
+        write_drafts_with_ai(mock_openai_client, jobs)
+        drafts = write_drafts_with_ai(mock_openai_client, jobs)
+
+        # The batch is requested again; the complete single drafts come from cache
+        self.assertEqual(mock_openai_client.chat.completions.create.call_count, 4)
+        self.assertEqual(drafts, {"piece-1": "# Draft", "piece-2": "# Draft"})
+
+    def test_get_content_pieces(self):
+        """Test retrieving several researched content pieces at once."""
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        query.limit.return_value.execute.return_value = MagicMock(
+            data=[self.mock_content_piece]
+        )
+
+        pieces = get_content_pieces(mock_supabase, 3)
+
+        query.limit.assert_called_once_with(3)
+        self.assertEqual(pieces, [self.mock_content_piece])
+
+    def _job(self, content_id):
+        return {
+            "content_piece": dict(self.mock_content_piece, id=content_id),
+            "keywords": self.mock_keywords,
+            "research": self.mock_research,
+            "strategic_plan": self.mock_plan,
+            "seo_output": self.mock_seo_output,
+        }
+
+    @patch("builtins.print")
+    def test_write_drafts_with_ai_uses_one_request(self, mock_print):
+        """Test that a batch of pieces is drafted with a single completion."""
+        mock_openai_client = MagicMock()
+        articles = {
+            "articles": [
+                {"id": "piece-1", "markdown": "# One"},
+                {"id": "piece-2", "markdown": "# Two"},
+            ]
+        }
+        mock_openai_client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content=json.dumps(articles)))]
+        )
+
+        drafts = write_drafts_with_ai(
+            mock_openai_client, [self._job("piece-1"), self._job("piece-2")]
+        )
+
+        mock_openai_client.chat.completions.create.assert_called_once()
+        kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["response_format"], {"type": "json_object"})
+        prompt = kwargs["messages"][1]["content"]
+        self.assertIn("Article ID: piece-1", prompt)
+        self.assertIn("Article ID: piece-2", prompt)
+        self.assertEqual(drafts, {"piece-1": "# One", "piece-2": "# Two"})
+
+    @patch("builtins.print")
+    def test_write_drafts_with_ai_redrafts_missing_pieces(self, mock_print):
+        """Test that pieces missing from the batched reply are drafted alone."""
+        mock_openai_client = MagicMock()
+        batched = {"articles": [{"id": "piece-1", "markdown": "# One"}]}
+        mock_openai_client.chat.completions.create.side_effect = [
+            MagicMock(
+                choices=[MagicMock(message=MagicMock(content=json.dumps(batched)))]
+            ),
+            MagicMock(choices=[MagicMock(message=MagicMock(content="# Two"))]),
+        ]
+
+        drafts = write_drafts_with_ai(
+            mock_openai_client, [self._job("piece-1"), self._job("piece-2")]
+        )
+
+        self.assertEqual(mock_openai_client.chat.completions.create.call_count, 2)
+        self.assertEqual(drafts, {"piece-1": "# One", "piece-2": "# Two"})
+
     @patch("builtins.print")
     def test_save_draft_to_database(self, mock_print):
         """Test saving draft to the database."""
@@ -7,7 +7,7 @@ import os
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import ANY, MagicMock, mock_open, patch
 
 import pytest
 
@@ -16,6 +16,7 @@ sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+from agents.shared.utils import clear_client_cache
 # Import functions to test
 from flow_editor_agent import (generate_mock_improved_flow,
                                get_content_keywords, get_content_piece,
@@ -31,6 +32,9 @@ class TestFlowEditorAgent(unittest.TestCase):
 
     def setUp(self):
         """Set up test case."""
+        # Clear cached clients so each test builds its own
+        clear_client_cache()
+
         self.mock_content_piece = {
             "id": "test-content-id",
             "strategic_plan_id": "test-plan-id",
@@ -124,15 +128,15 @@ In summary, this article has covered several key points about test keyword. The
     @patch("os.getenv")
     def test_get_supabase_client(self, mock_getenv):
         """Test Supabase client creation with valid credentials."""
-        mock_getenv.side_effect = lambda x: (
+        mock_getenv.side_effect = lambda x, default=None: (
             "fake-url" if x == "SUPABASE_URL" else "fake-key"
         )
 
-        with patch("agents.shared.utils.create_client") as mock_create_client:
+        with patch("supabase.create_client") as mock_create_client:
             mock_create_client.return_value = "mock-supabase-client"
             client = get_supabase_client()
 
-            mock_create_client.assert_called_once_with("fake-url", "fake-key")
+            mock_create_client.assert_called_once_with("fake-url", "fake-key", options=ANY)
             self.assertEqual(client, "mock-supabase-client")
 
     def test_get_content_piece_with_id(self):
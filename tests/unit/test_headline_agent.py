@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Unit tests for the headline agent."""
 
+import importlib
 import os
 import sys
 import unittest
@@ -8,15 +9,17 @@ import unittest
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from agents.headline_agent import (
-    run,
-    validate,
-    generate_headline_options,
-    score_headline,
-    select_best_headline,
-)
 from agents.shared.schemas import TaskStatus
 
+# "headline-agent" is not a valid identifier, so import it the way run_agent.py does
+headline_agent = importlib.import_module("agents.headline-agent.index")
+
+run = headline_agent.run
+validate = headline_agent.validate
+generate_headline_options = headline_agent.generate_headline_options
+score_headline = headline_agent.score_headline
+score_headlines = headline_agent.score_headlines
+
 
 class TestHeadlineAgent(unittest.TestCase):
     """Tests for headline generation and scoring."""
@@ -44,6 +47,13 @@ class TestHeadlineAgent(unittest.TestCase):
         low = score_headline("learn", "python")
         self.assertGreater(high, low)
 
+    def test_score_headlines_matches_single_scores(self):
+        options = generate_headline_options("Learn Python", "python") + ["Stop! Why?", "learn"]
+        self.assertEqual(
+            score_headlines(options, "python"),
+            [score_headline(o, "python") for o in options],
+        )
+
     def test_run(self):
         result = run(self.valid_input)
         self.assertEqual(result["status"], TaskStatus.DONE)
@@ -4,13 +4,14 @@ import json
 import os
 import sys
 import unittest
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import ANY, MagicMock, mock_open, patch
 
 # Add repo root to path for imports
 sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+from agents.shared.utils import clear_client_cache
 from hook_agent import (generate_hooks_with_ai, get_content_keywords,
                         get_content_piece, get_strategic_plan,
                         get_supabase_client, save_hooks_to_database,
@@ -19,6 +20,9 @@ from hook_agent import (generate_hooks_with_ai, get_content_keywords,
 
 class TestHookAgent(unittest.TestCase):
     def setUp(self):
+        # Clear cached clients so each test builds its own
+        clear_client_cache()
+
         self.content_piece = {
             "id": "test-content-id",
             "strategic_plan_id": "test-plan-id",
@@ -49,11 +53,11 @@ class TestHookAgent(unittest.TestCase):
 
     @patch("os.getenv")
     def test_get_supabase_client(self, mock_getenv):
-        mock_getenv.side_effect = lambda x: "url" if x == "SUPABASE_URL" else "key"
-        with patch("agents.shared.utils.create_client") as mock_create:
+        mock_getenv.side_effect = lambda x, default=None: "url" if x == "SUPABASE_URL" else "key"
+        with patch("supabase.create_client") as mock_create:
             mock_create.return_value = "client"
             client = get_supabase_client()
-            mock_create.assert_called_once_with("url", "key")
+            mock_create.assert_called_once_with("url", "key", options=ANY)
             self.assertEqual(client, "client")
 
     def test_get_content_piece(self):
@@ -0,0 +1,165 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+import requests
+from tenacity import wait_none
+
+from agents.shared import utils
+
+
+POSTS_URL = "https://wp.example/wp-json/wp/v2/posts"
+
+
+def http_response(status_code, body=None, method="GET"):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = POSTS_URL
+    response.request = requests.Request(method, POSTS_URL).prepare()
+    response._content = body or b"{}"
+    return response
+
+
+def connection_error(method, reason="reset"):
+    return requests.exceptions.ConnectionError(
+        reason, request=requests.Request(method, POSTS_URL).prepare()
+    )
+
+
+class TestHttpUtils(unittest.TestCase):
+    def setUp(self):
+        utils.clear_client_cache()
+        self.addCleanup(utils.clear_client_cache)
+
+    def test_http_session_is_shared(self):
+        session = utils.get_http_session()
+        self.assertIs(session, utils.get_http_session())
+        # Retries happen once, in retry_transient_http_errors, not in the adapter
+        self.assertEqual(session.get_adapter("https://example.com").max_retries.total, 0)
+
+    @patch("agents.shared.utils.get_http_session")
+    def test_download_image_streams_to_file(self, mock_get_session):
+        response = MagicMock(status_code=200)
+        response.raw = io.BytesIO(b"abcdef")
+        mock_get_session.return_value.get.return_value.__enter__.return_value = response
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "image.png")
+            self.assertEqual(utils.download_image("https://img", path), path)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"abcdef")
+
+        mock_get_session.return_value.get.assert_called_once_with(
+            "https://img", stream=True
+        )
+
+    @patch.object(utils.wordpress_api_request.retry, "wait", wait_none())
+    @patch("agents.shared.utils.get_http_session")
+    @patch("agents.shared.utils.get_settings")
+    def test_wordpress_api_request_retries_transient_errors(
+        self, mock_get_settings, mock_get_session
+    ):
+        mock_get_settings.return_value = utils.Settings(wp_api_url="https://wp.example")
+        mock_get_session.return_value.request.side_effect = [
+            connection_error("GET"),
+            http_response(502),
+            http_response(200, b'{"id": 7}'),
+        ]
+
+        self.assertEqual(utils.wordpress_api_request("posts"), {"id": 7})
+        self.assertEqual(mock_get_session.return_value.request.call_count, 3)
+
+    @patch.object(utils.wordpress_api_request.retry, "wait", wait_none())
+    @patch("agents.shared.utils.get_http_session")
+    @patch("agents.shared.utils.get_settings")
+    def test_wordpress_api_request_does_not_resend_posts(
+        self, mock_get_settings, mock_get_session
+    ):
+        mock_get_settings.return_value = utils.Settings(wp_api_url="https://wp.example")
+        for failure in (
+            connection_error("POST"),
+            http_response(502, method="POST"),
+        ):
+            mock_get_session.return_value.request.reset_mock()
+            mock_get_session.return_value.request.side_effect = [
+                failure,
+                http_response(201, b'{"id": 7}', method="POST"),
+            ]
+
+            with self.assertRaises(requests.exceptions.RequestException):
+                utils.wordpress_api_request("posts", method="POST", data={})
+            mock_get_session.return_value.request.assert_called_once()
+
+    @patch.object(utils.wordpress_api_request.retry, "wait", wait_none())
+    @patch("agents.shared.utils.get_http_session")
+    @patch("agents.shared.utils.get_settings")
+    def test_wordpress_api_request_resends_posts_that_never_connected(
+        self, mock_get_settings, mock_get_session
+    ):
+        mock_get_settings.return_value = utils.Settings(wp_api_url="https://wp.example")
+        mock_get_session.return_value.request.side_effect = [
+            requests.exceptions.ConnectTimeout("connect timed out"),
+            http_response(201, b'{"id": 7}', method="POST"),
+        ]
+
+        self.assertEqual(
+            utils.wordpress_api_request("posts", method="POST", data={}), {"id": 7}
+        )
+        self.assertEqual(mock_get_session.return_value.request.call_count, 2)
+
+    @patch.object(utils.wordpress_api_request.retry, "wait", wait_none())
+    @patch("agents.shared.utils.get_http_session")
+    @patch("agents.shared.utils.get_settings")
+    def test_wordpress_api_request_does_not_retry_client_errors(
+        self, mock_get_settings, mock_get_session
+    ):
+        mock_get_settings.return_value = utils.Settings(wp_api_url="https://wp.example")
+        mock_get_session.return_value.request.return_value = http_response(404)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            utils.wordpress_api_request("posts")
+        mock_get_session.return_value.request.assert_called_once()
+
+    def test_download_images_fetches_concurrently(self):
+        def handler(request):
+            return httpx.Response(200, content=request.url.path.encode())
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("agents.shared.utils._async_image_client", return_value=client):
+            result = asyncio.run(
+                utils.download_images(["https://img/a.png", "https://img/b.png"])
+            )
+
+        self.assertEqual(result, [b"/a.png", b"/b.png"])
+
+    @patch("agents.shared.utils.get_settings")
+    def test_search_stock_images_many_returns_results_per_query(
+        self, mock_get_settings
+    ):
+        mock_get_settings.return_value = utils.Settings(pexels_api_key="key")
+
+        def handler(request):
+            query = request.url.params["query"]
+            photo = {
+                "id": query,
+                "src": {"original": f"https://img/{query}", "medium": "thumb"},
+                "width": 10,
+                "height": 10,
+                "photographer": "someone",
+            }
+            return httpx.Response(200, json={"photos": [photo]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("agents.shared.utils._async_image_client", return_value=client):
+            result = asyncio.run(utils.search_stock_images_many(["cats", "dogs"]))
+
+        self.assertEqual([images[0]["id"] for images in result], ["cats", "dogs"])
+        self.assertEqual(result[0][0]["source"], "pexels")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,12 @@ Unit tests for Image Generator Agent
 """
 
 import unittest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock, AsyncMock, mock_open
 import sys
 import os
 import json
 import base64
+import tempfile
 from datetime import datetime
 from io import StringIO, BytesIO
 from pathlib import Path
@@ -16,7 +17,31 @@ from pathlib import Path
 # Add the parent directory to the path so we can import the image_generator_agent module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+import httpx
+
 import image_generator_agent
+from agents.exceptions import AgentDataError
+
+
+def mock_aiofiles_open():
+    """Create a mock for aiofiles.open usable as an async context manager."""
+    mock = MagicMock()
+    mock.return_value.__aenter__.return_value.write = AsyncMock()
+    return mock
+
+
+# Keep a reference to the real client; tests patch httpx.AsyncClient
+RealAsyncClient = httpx.AsyncClient
+
+
+def mock_http_client(content, status_code=200):
+    """Create an httpx.AsyncClient factory whose requests return the given content."""
+    def factory(**kwargs):
+        transport = httpx.MockTransport(lambda request: httpx.Response(status_code, content=content))
+        return RealAsyncClient(transport=transport)
+
+    return factory
+
 
 class TestImageGeneratorAgent(unittest.TestCase):
     """Test cases for Image Generator Agent."""
@@ -38,23 +63,16 @@ class TestImageGeneratorAgent(unittest.TestCase):
             "supporting_keywords": ["AI", "machine learning", "neural networks"]
         }
         
-        # Mock strategic plan data
-        self.plan = {
-            "id": "test-plan-456",
-            "domain": "example.com",
-            "audience": "technology enthusiasts",
-            "tone": "informative",
-            "niche": "technology",
-            "goal": "educate readers"
-        }
-        
+        # Content piece as returned with embedded keyword rows
+        self.content_with_keywords = dict(self.content_piece, keywords=[self.keywords])
+
         # Mock OpenAI DALL-E response
         self.mock_image_data = b'test_image_data'
         self.mock_image_base64 = base64.b64encode(self.mock_image_data).decode('utf-8')
         
         self.openai_response = MagicMock()
         self.openai_response.data = [MagicMock()]
-        self.openai_response.data[0].b64_json = self.mock_image_base64
+        self.openai_response.data[0].url = "https://images.example.com/test.png"
         self.openai_response.data[0].revised_prompt = "A professional image depicting artificial intelligence concepts"
         
         # Mock Supabase client
@@ -66,24 +84,38 @@ class TestImageGeneratorAgent(unittest.TestCase):
         
         # Mock Path.mkdir to avoid creating directories
         self.mock_mkdir = MagicMock()
+
+        # Reset the shared AsyncOpenAI client between tests
+        image_generator_agent._openai_client = None
+
+        # Use an empty image cache per test and skip copying cached files into place
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = Path(cache_dir.name)
+        for patcher in (
+            patch.object(image_generator_agent, "IMAGE_CACHE_DIR", self.cache_dir),
+            patch("image_generator_agent.shutil.copyfile"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
         
     @patch('image_generator_agent.get_supabase_client')
-    @patch('image_generator_agent.setup_openai')
-    @patch('builtins.open', new_callable=mock_open)
+    @patch('image_generator_agent.get_async_openai_client')
+    @patch('image_generator_agent.aiofiles.open', new_callable=mock_aiofiles_open)
     @patch('image_generator_agent.Path.mkdir')
-    def test_main_functionality(self, mock_mkdir, mock_file_open, mock_setup_openai, mock_get_supabase):
+    @patch('image_generator_agent.httpx.AsyncClient')
+    def test_main_functionality(self, mock_async_client, mock_mkdir, mock_file_open, mock_get_openai, mock_get_supabase):
         """Test the main functionality of the Image Generator Agent."""
         # Set up mocks
         mock_get_supabase.return_value = self.mock_supabase
         mock_openai_client = MagicMock()
-        mock_openai_client.images.generate.return_value = self.openai_response
-        mock_setup_openai.return_value = mock_openai_client
+        mock_openai_client.images.generate = AsyncMock(return_value=self.openai_response)
+        mock_get_openai.return_value = mock_openai_client
+        mock_async_client.side_effect = mock_http_client(self.mock_image_data)
         
         # Set up Supabase responses
         self.mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-            MagicMock(data=[self.content_piece]),  # get_content_piece
-            MagicMock(data=[self.keywords]),       # get_content_keywords
-            MagicMock(data=[self.plan])            # get_strategic_plan
+            MagicMock(data=[self.content_with_keywords]),  # get_content_piece
         ]
         
         # Redirect stdout to capture print statements
@@ -103,45 +135,47 @@ class TestImageGeneratorAgent(unittest.TestCase):
         
         # Verify Supabase interactions
         self.mock_supabase.table.assert_any_call("content_pieces")
-        self.mock_supabase.table.assert_any_call("keywords")
-        self.mock_supabase.table.assert_any_call("strategic_plans")
+        self.mock_supabase.table.return_value.select.assert_any_call("*, keywords(*)")
+        self.assertNotIn(("strategic_plans",), [c.args for c in self.mock_supabase.table.call_args_list])
         self.mock_supabase.table.assert_any_call("images")
         
         # Verify OpenAI was called with appropriate parameters
         mock_openai_client.images.generate.assert_called_once()
         call_args = mock_openai_client.images.generate.call_args[1]
         self.assertEqual(call_args["model"], "dall-e-3")
+        self.assertEqual(call_args["response_format"], "url")
         self.assertIn("artificial intelligence", call_args["prompt"])
         
-        # Verify content piece was updated with new status and image reference
-        update_call = self.mock_supabase.table.return_value.update.call_args[0][0]
+        # Verify content piece was upserted with new status and image reference
+        update_call = self.mock_supabase.table.return_value.upsert.call_args[0][0][0]
+        self.assertEqual(update_call["id"], "test-content-123")
         self.assertEqual(update_call["status"], "image_generated")
         self.assertIn("featured_image_id", update_call)
         
-        # Verify image record was created
-        insert_call = self.mock_supabase.table.return_value.insert.call_args_list[0][0][0]
+        # Verify image record was created in a single bulk insert
+        insert_call = self.mock_supabase.table.return_value.insert.call_args_list[0][0][0][0]
         self.assertEqual(insert_call["content_id"], "test-content-123")
         self.assertIn("file_path", insert_call)
         self.assertIn("metadata", insert_call)
         
         # Verify agent status was logged
-        agent_status_call = self.mock_supabase.table.return_value.insert.call_args_list[1][0][0]
+        agent_status_call = self.mock_supabase.table.return_value.insert.call_args_list[1][0][0][0]
         self.assertEqual(agent_status_call["agent"], "image-generator-agent")
         self.assertEqual(agent_status_call["status"], "completed")
         
         # Verify image directory was created
-        mock_mkdir.assert_called_once_with(exist_ok=True)
+        mock_mkdir.assert_any_call(exist_ok=True)
         
         # Verify image was saved to file
         mock_file_open.assert_called()
-        mock_file_open.return_value.write.assert_called_with(self.mock_image_data)
+        mock_file_open.return_value.__aenter__.return_value.write.assert_awaited_with(self.mock_image_data)
         
         # Check output for success message
         output = captured_output.getvalue()
         self.assertIn("Image Generator Agent completed successfully", output)
 
     @patch('image_generator_agent.get_supabase_client')
-    @patch('builtins.open', new_callable=mock_open)
+    @patch('image_generator_agent.aiofiles.open', new_callable=mock_aiofiles_open)
     @patch('image_generator_agent.Path.mkdir')
     def test_mock_data_mode(self, mock_mkdir, mock_file_open, mock_get_supabase):
         """Test the agent with --no-ai flag to use mock data."""
@@ -150,9 +184,7 @@ class TestImageGeneratorAgent(unittest.TestCase):
         
         # Set up Supabase responses
         self.mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-            MagicMock(data=[self.content_piece]),  # get_content_piece
-            MagicMock(data=[self.keywords]),       # get_content_keywords
-            MagicMock(data=[self.plan])            # get_strategic_plan
+            MagicMock(data=[self.content_with_keywords]),  # get_content_piece
         ]
         
         # Redirect stdout to capture print statements
@@ -170,16 +202,16 @@ class TestImageGeneratorAgent(unittest.TestCase):
         # Restore stdout
         sys.stdout = sys.__stdout__
         
-        # Verify OpenAI was not used (no setup_openai call)
+        # Verify OpenAI was not used
         self.assertIn("Using mock image generator (--no-ai flag set)", captured_output.getvalue())
         
         # Verify content piece was updated with new status
-        update_call = self.mock_supabase.table.return_value.update.call_args[0][0]
+        update_call = self.mock_supabase.table.return_value.upsert.call_args[0][0][0]
         self.assertEqual(update_call["status"], "image_generated")
         
         # Verify image was saved to file
         mock_file_open.assert_called()
-        mock_mkdir.assert_called_once_with(exist_ok=True)
+        mock_mkdir.assert_any_call(exist_ok=True)
 
     @patch('image_generator_agent.get_supabase_client')
     def test_no_content_pieces_found(self, mock_get_supabase):
@@ -208,21 +240,29 @@ class TestImageGeneratorAgent(unittest.TestCase):
         # Verify exit code
         self.assertEqual(cm.exception.code, 1)
 
+    def test_get_content_piece_raises_when_missing(self):
+        """Test that a missing content piece raises instead of exiting."""
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = []
+
+        with self.assertRaises(AgentDataError) as cm:
+            image_generator_agent.get_content_piece(mock_supabase, "nonexistent-id")
+
+        self.assertEqual(str(cm.exception), "Content piece with ID nonexistent-id not found")
+
     @patch('image_generator_agent.get_supabase_client')
-    @patch('image_generator_agent.setup_openai')
-    def test_openai_error_handling(self, mock_setup_openai, mock_get_supabase):
+    @patch('image_generator_agent.get_async_openai_client')
+    def test_openai_error_handling(self, mock_get_openai, mock_get_supabase):
         """Test handling of OpenAI API errors."""
         # Set up mocks
         mock_get_supabase.return_value = self.mock_supabase
         mock_openai_client = MagicMock()
-        mock_openai_client.images.generate.side_effect = Exception("DALL-E API error")
-        mock_setup_openai.return_value = mock_openai_client
+        mock_openai_client.images.generate = AsyncMock(side_effect=Exception("DALL-E API error"))
+        mock_get_openai.return_value = mock_openai_client
         
         # Set up Supabase responses
         self.mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-            MagicMock(data=[self.content_piece]),  # get_content_piece
-            MagicMock(data=[self.keywords]),       # get_content_keywords
-            MagicMock(data=[self.plan])            # get_strategic_plan
+            MagicMock(data=[self.content_with_keywords]),  # get_content_piece
         ]
         
         # Redirect stdout to capture print statements
@@ -245,22 +285,22 @@ class TestImageGeneratorAgent(unittest.TestCase):
         self.assertEqual(cm.exception.code, 1)
 
     @patch('image_generator_agent.get_supabase_client')
-    @patch('image_generator_agent.setup_openai')
-    @patch('builtins.open', new_callable=mock_open)
+    @patch('image_generator_agent.get_async_openai_client')
+    @patch('image_generator_agent.aiofiles.open', new_callable=mock_aiofiles_open)
     @patch('image_generator_agent.Path.mkdir')
-    def test_database_error_handling(self, mock_mkdir, mock_file_open, mock_setup_openai, mock_get_supabase):
+    @patch('image_generator_agent.httpx.AsyncClient')
+    def test_database_error_handling(self, mock_async_client, mock_mkdir, mock_file_open, mock_get_openai, mock_get_supabase):
         """Test handling of database errors when saving results."""
         # Set up mocks
         mock_get_supabase.return_value = self.mock_supabase
         mock_openai_client = MagicMock()
-        mock_openai_client.images.generate.return_value = self.openai_response
-        mock_setup_openai.return_value = mock_openai_client
+        mock_openai_client.images.generate = AsyncMock(return_value=self.openai_response)
+        mock_get_openai.return_value = mock_openai_client
+        mock_async_client.side_effect = mock_http_client(self.mock_image_data)
         
         # Set up Supabase responses
         self.mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
-            MagicMock(data=[self.content_piece]),  # get_content_piece
-            MagicMock(data=[self.keywords]),       # get_content_keywords
-            MagicMock(data=[self.plan])            # get_strategic_plan
+            MagicMock(data=[self.content_with_keywords]),  # get_content_piece
         ]
         
         # Make the insert method raise an exception
@@ -287,6 +327,210 @@ class TestImageGeneratorAgent(unittest.TestCase):
         # Verify file was still saved despite database error
         mock_file_open.assert_called()
 
+    @patch('image_generator_agent.get_supabase_client')
+    @patch('image_generator_agent.get_async_openai_client')
+    def test_skips_piece_claimed_by_another_worker(self, mock_get_openai, mock_get_supabase):
+        """Test that no image is generated when the compare-and-swap claim fails."""
+        mock_get_supabase.return_value = self.mock_supabase
+        mock_openai_client = MagicMock()
+        mock_openai_client.images.generate = AsyncMock(return_value=self.openai_response)
+        mock_get_openai.return_value = mock_openai_client
+
+        self.mock_supabase.table.return_value.select.return_value.eq.return_value.execute.side_effect = [
+            MagicMock(data=[self.content_with_keywords]),  # get_content_piece
+        ]
+        # The conditional status update matches no rows
+        self.mock_supabase.table.return_value.update.return_value.eq.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        test_args = ["--content-id", "test-content-123"]
+        with patch('sys.argv', ['image_generator_agent.py'] + test_args):
+            image_generator_agent.main()
+        sys.stdout = sys.__stdout__
+
+        # Verify the piece was claimed with a lease and no image was paid for
+        claim = self.mock_supabase.table.return_value.update.call_args_list[0][0][0]
+        self.assertEqual(claim["status"], "image_generating")
+        self.assertIn("lease_expires_at", claim)
+        mock_openai_client.images.generate.assert_not_called()
+        self.assertIn("claimed by another worker", captured_output.getvalue())
+
+    @patch('image_generator_agent.aiofiles.open', new_callable=mock_aiofiles_open)
+    @patch('image_generator_agent.Path.mkdir')
+    def test_download_image_to_file_http_error(self, mock_mkdir, mock_file_open):
+        """Test that a failed image download raises instead of writing a file."""
+        async def download():
+            async with mock_http_client(b"", status_code=404)() as http_client:
+                return await image_generator_agent.download_image_to_file(
+                    http_client, "https://images.example.com/missing.png", self.cache_dir / "missing.png"
+                )
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            image_generator_agent.asyncio.run(download())
+        mock_file_open.assert_not_called()
+
+    @patch('image_generator_agent.get_supabase_client')
+    @patch('image_generator_agent.aiofiles.open', new_callable=mock_aiofiles_open)
+    @patch('image_generator_agent.Path.mkdir')
+    def test_run_returns_image_for_next_agent(self, mock_mkdir, mock_file_open, mock_get_supabase):
+        """Test that run() hands the generated image back in-process."""
+        mock_get_supabase.return_value = self.mock_supabase
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        result = image_generator_agent.run({"content_piece": self.content_with_keywords, "no_ai": True})
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(result["content_id"], "test-content-123")
+        self.assertTrue(result["image_path"].endswith(".png"))
+        self.assertEqual(result["image_metadata"]["model"], "mock-image-generator")
+        self.assertTrue(result["persisted"])
+
+        # The content piece was passed in, so it is not read back from the database
+        self.mock_supabase.table.return_value.select.assert_not_called()
+
+    @patch('image_generator_agent.save_images_to_database', return_value=["test-content-123"])
+    @patch('image_generator_agent.get_supabase_client')
+    @patch('image_generator_agent.aiofiles.open', new_callable=mock_aiofiles_open)
+    @patch('image_generator_agent.Path.mkdir')
+    def test_run_returns_image_when_database_write_fails(self, mock_mkdir, mock_file_open, mock_get_supabase, mock_save):
+        """Test that the database write is best-effort and the image is still handed on."""
+        mock_get_supabase.return_value = self.mock_supabase
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        result = image_generator_agent.run({"content_piece": self.content_with_keywords, "no_ai": True})
+        sys.stdout = sys.__stdout__
+
+        mock_save.assert_called_once()
+        self.assertFalse(result["persisted"])
+        self.assertTrue(result["image_path"].endswith(".png"))
+
+    @patch('image_generator_agent.get_supabase_client')
+    @patch('image_generator_agent.get_async_openai_client')
+    @patch('image_generator_agent.aiofiles.open', new_callable=mock_aiofiles_open)
+    @patch('image_generator_agent.Path.mkdir')
+    def test_duplicate_prompts_generate_once(self, mock_mkdir, mock_file_open, mock_get_openai, mock_get_supabase):
+        """Test that pieces with identical prompts share a single DALL-E request."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.images.generate = AsyncMock(return_value=self.openai_response)
+        mock_get_openai.return_value = mock_openai_client
+        pieces = [
+            self.content_with_keywords,
+            dict(self.content_with_keywords, id="test-content-456"),
+        ]
+        args = image_generator_agent.argparse.Namespace(
+            no_ai=False, size="1024x1024", quality="standard", concurrency=2
+        )
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        with patch('image_generator_agent.httpx.AsyncClient', side_effect=mock_http_client(self.mock_image_data)):
+            failures = image_generator_agent.asyncio.run(
+                image_generator_agent.process_batch(self.mock_supabase, pieces, args)
+            )
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(failures, [])
+        mock_openai_client.images.generate.assert_called_once()
+        self.assertEqual(image_generator_agent.shutil.copyfile.call_count, 2)
+
+    @patch('image_generator_agent.Path.mkdir')
+    def test_persist_failure_is_isolated(self, mock_mkdir):
+        """Test that a failed copy into place fails only its own content piece."""
+        pieces = [
+            self.content_with_keywords,
+            dict(self.content_with_keywords, id="test-content-456", title="Another Title"),
+        ]
+        args = image_generator_agent.argparse.Namespace(
+            no_ai=True, size="1024x1024", quality="standard", concurrency=2
+        )
+        image_generator_agent.shutil.copyfile.side_effect = [OSError("disk full"), None]
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        with patch('image_generator_agent.save_images_to_database', return_value=[]) as mock_save:
+            failures = image_generator_agent.asyncio.run(
+                image_generator_agent.process_batch(self.mock_supabase, pieces, args, persist_workers=1)
+            )
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(len(failures), 1)
+        saved = mock_save.call_args[0][1]
+        self.assertEqual(len(saved), 1)
+        self.assertNotEqual(saved[0][0], failures[0])
+        self.assertIn("disk full", captured_output.getvalue())
+
+    @patch('image_generator_agent.get_async_openai_client')
+    @patch('image_generator_agent.Path.mkdir')
+    def test_cached_image_skips_generation(self, mock_mkdir, mock_get_openai):
+        """Test that a prompt already in the on-disk cache is not generated again."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.images.generate = AsyncMock(return_value=self.openai_response)
+        args = image_generator_agent.argparse.Namespace(
+            no_ai=False, size="1024x1024", quality="standard", concurrency=1
+        )
+        prompt = image_generator_agent.create_image_prompt(self.content_with_keywords)
+        key = image_generator_agent.prompt_cache_key(prompt, "dall-e-3", "1024x1024", "standard")
+        (self.cache_dir / f"{key}.png").write_bytes(self.mock_image_data)
+        (self.cache_dir / f"{key}.json").write_text(json.dumps({"prompt": prompt, "model": "dall-e-3"}))
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        result = image_generator_agent.asyncio.run(
+            image_generator_agent.process_content_piece(
+                self.mock_supabase, mock_openai_client, None, self.content_with_keywords,
+                image_generator_agent.asyncio.Semaphore(1), args,
+            )
+        )
+        sys.stdout = sys.__stdout__
+
+        mock_openai_client.images.generate.assert_not_called()
+        self.assertEqual(result[2]["prompt"], prompt)
+        self.assertIn("Using cached image", captured_output.getvalue())
+
+    def test_save_images_to_database_bulk(self):
+        """Test that a batch of images is recorded with one request per table."""
+        generated = [
+            ("test-content-123", "images/a.png", {"model": "dall-e-3"}),
+            ("test-content-456", "images/b.png", {"model": "dall-e-3"}),
+        ]
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        failures = image_generator_agent.save_images_to_database(self.mock_supabase, generated)
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(failures, [])
+        self.assertEqual(self.mock_supabase.table.return_value.insert.call_count, 2)
+        self.assertEqual(self.mock_supabase.table.return_value.upsert.call_count, 1)
+        upsert_args = self.mock_supabase.table.return_value.upsert.call_args
+        self.assertEqual(len(upsert_args[0][0]), 2)
+        self.assertEqual(upsert_args[1]["on_conflict"], "id")
+
+    def test_save_images_to_database_fallback(self):
+        """Test that a failed bulk write falls back to per-row writes."""
+        generated = [
+            ("test-content-123", "images/a.png", {"model": "dall-e-3"}),
+            ("test-content-456", "images/b.png", {"model": "dall-e-3"}),
+        ]
+        # Bulk images insert fails, then the second row fails on its own
+        self.mock_supabase.table.return_value.insert.return_value.execute.side_effect = [
+            Exception("Bulk insert error"),
+            MagicMock(),  # images row 1
+            MagicMock(),  # agent_status row 1
+            Exception("Row error"),  # images row 2
+        ]
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        failures = image_generator_agent.save_images_to_database(self.mock_supabase, generated)
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(failures, ["test-content-456"])
+        self.assertIn("Bulk database update failed", captured_output.getvalue())
+
     def test_create_image_prompt(self):
         """Test the image prompt generation function."""
         # Test with title and keywords
@@ -299,6 +543,10 @@ class TestImageGeneratorAgent(unittest.TestCase):
         self.assertIn(self.content_piece["title"], prompt_no_keywords)
         self.assertNotIn("about artificial intelligence", prompt_no_keywords)
         
+        # Test with keywords embedded in the content piece row
+        prompt_embedded = image_generator_agent.create_image_prompt(self.content_with_keywords)
+        self.assertIn(self.keywords["focus_keyword"], prompt_embedded)
+
         # Test with empty content piece
         empty_content = {"title": "", "draft_text": ""}
         prompt_empty = image_generator_agent.create_image_prompt(empty_content, None)
@@ -320,6 +568,181 @@ class TestImageGeneratorAgent(unittest.TestCase):
         self.assertEqual(metadata["quality"], "standard")
         self.assertIn("created", metadata)
 
+        # Verify the fixture is read once and reused
+        second_image_data, _ = image_generator_agent.generate_mock_image(prompt)
+        self.assertIs(second_image_data, image_data)
+
+    def test_submit_image_batch(self):
+        """Test that prompts are uploaded as one JSONL Batch API job."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.files.create = AsyncMock(return_value=MagicMock(id="file-123"))
+        mock_openai_client.batches.create = AsyncMock(return_value=MagicMock(id="batch-123"))
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        batch_id = image_generator_agent.asyncio.run(
+            image_generator_agent.submit_image_batch(
+                mock_openai_client, {"test-content-123": "prompt one", "test-content-456": "prompt two"}
+            )
+        )
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(batch_id, "batch-123")
+
+        # Verify one JSONL line per prompt was uploaded for batch processing
+        file_kwargs = mock_openai_client.files.create.call_args[1]
+        self.assertEqual(file_kwargs["purpose"], "batch")
+        lines = file_kwargs["file"][1].decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 2)
+        first = json.loads(lines[0])
+        self.assertEqual(first["custom_id"], "test-content-123")
+        self.assertEqual(first["url"], "/v1/images/generations")
+        self.assertEqual(first["body"]["prompt"], "prompt one")
+
+        batch_kwargs = mock_openai_client.batches.create.call_args[1]
+        self.assertEqual(batch_kwargs["input_file_id"], "file-123")
+        self.assertEqual(batch_kwargs["completion_window"], "24h")
+
+    @patch('image_generator_agent.asyncio.sleep', new_callable=AsyncMock)
+    def test_poll_batch_backoff(self, mock_sleep):
+        """Test that batch polling backs off exponentially until completion."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.batches.retrieve = AsyncMock(side_effect=[
+            MagicMock(status="validating"),
+            MagicMock(status="in_progress"),
+            MagicMock(status="completed"),
+        ])
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        batch = image_generator_agent.asyncio.run(
+            image_generator_agent.poll_batch(mock_openai_client, "batch-123", initial_delay=1, max_delay=60)
+        )
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(batch.status, "completed")
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [1, 2])
+
+    def test_iter_batch_results(self):
+        """Test that only successful batch lines are yielded, keyed by content ID."""
+        output_lines = [
+            json.dumps({
+                "custom_id": "test-content-123",
+                "response": {"status_code": 200, "body": {"data": [{"b64_json": self.mock_image_base64}]}},
+                "error": None,
+            }),
+            json.dumps({
+                "custom_id": "test-content-456",
+                "response": {"status_code": 400, "body": {"error": {"message": "bad prompt"}}},
+                "error": None,
+            }),
+        ]
+        async def iter_lines():
+            for line in output_lines:
+                yield line
+
+        mock_response = MagicMock()
+        mock_response.iter_lines = iter_lines
+        mock_stream = MagicMock()
+        mock_stream.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_stream.__aexit__ = AsyncMock(return_value=False)
+        mock_openai_client = MagicMock()
+        mock_openai_client.files.with_streaming_response.content.return_value = mock_stream
+
+        async def collect():
+            return [
+                content_id
+                async for content_id, _ in image_generator_agent.iter_batch_results(
+                    mock_openai_client, MagicMock(output_file_id="file-out")
+                )
+            ]
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        results = image_generator_agent.asyncio.run(collect())
+        sys.stdout = sys.__stdout__
+
+        mock_openai_client.files.with_streaming_response.content.assert_called_once_with("file-out")
+        self.assertEqual(results, ["test-content-123"])
+        self.assertIn("Batch request failed for content piece test-content-456", captured_output.getvalue())
+
+    @patch('image_generator_agent.process_batch_results', new_callable=AsyncMock)
+    @patch('image_generator_agent.submit_image_batch', new_callable=AsyncMock)
+    @patch('image_generator_agent.get_async_openai_client')
+    def test_run_batch_mode_records_submitted_batch(self, mock_get_openai, mock_submit, mock_process):
+        """Test that a submitted batch is recorded on its content pieces before polling."""
+        mock_submit.return_value = "batch-123"
+        mock_process.return_value = []
+        mock_supabase = MagicMock()
+        content_table = mock_supabase.table.return_value
+        content_table.select.return_value.or_.return_value.execute.return_value.data = [self.content_with_keywords]
+        content_table.select.return_value.eq.return_value.execute.return_value.data = []
+        content_table.update.return_value.in_.return_value.or_.return_value.execute.return_value.data = [
+            {"id": "test-content-123"}
+        ]
+        args = MagicMock(size="1024x1024", quality="standard")
+
+        processed, failures = image_generator_agent.asyncio.run(
+            image_generator_agent.run_batch_mode(mock_supabase, args)
+        )
+
+        self.assertEqual((processed, failures), (1, []))
+        update_payloads = [c[0][0] for c in content_table.update.call_args_list]
+        self.assertIn("image_batch_submitted", [p["status"] for p in update_payloads])
+        submitted = next(p for p in update_payloads if p["status"] == "image_batch_submitted")
+        self.assertEqual(submitted["image_batch_id"], "batch-123")
+        content_table.update.return_value.in_.assert_any_call("id", ["test-content-123"])
+        mock_process.assert_awaited_once_with(
+            mock_supabase, mock_get_openai.return_value, "batch-123", [self.content_with_keywords], args
+        )
+
+    @patch('image_generator_agent.save_images_to_database', return_value=[])
+    @patch('image_generator_agent.save_base64_image_to_file', new_callable=AsyncMock)
+    @patch('image_generator_agent.poll_batch', new_callable=AsyncMock)
+    def test_process_batch_results_resets_missing_pieces(self, mock_poll, mock_save_file, mock_save_db):
+        """Test that stored results are saved and missing pieces are returned for a retry."""
+        mock_poll.return_value = MagicMock(status="completed")
+        mock_save_file.return_value = "images/test.png"
+        missing_piece = dict(self.content_piece, id="test-content-456")
+
+        async def iter_results(client, batch):
+            yield "test-content-123", {"data": [{"b64_json": self.mock_image_base64}]}
+
+        mock_supabase = MagicMock()
+        args = MagicMock(size="1024x1024", quality="standard")
+        with patch('image_generator_agent.iter_batch_results', iter_results):
+            failures = image_generator_agent.asyncio.run(
+                image_generator_agent.process_batch_results(
+                    mock_supabase, MagicMock(), "batch-123", [self.content_piece, missing_piece], args
+                )
+            )
+
+        self.assertEqual(failures, ["test-content-456"])
+        generated = mock_save_db.call_args[0][1]
+        self.assertEqual([g[0] for g in generated], ["test-content-123"])
+        self.assertEqual(generated[0][2]["batch_id"], "batch-123")
+        content_table = mock_supabase.table.return_value
+        self.assertEqual(content_table.update.call_args[0][0]["status"], "line_edited")
+        content_table.update.return_value.in_.assert_called_once_with("id", ["test-content-456"])
+
+
+    def test_save_base64_image_to_file_decodes_in_chunks(self):
+        """Test that base64 payloads spanning several chunks decode intact."""
+        image_data = os.urandom(image_generator_agent.DOWNLOAD_CHUNK_SIZE * 2 + 5)
+        b64_data = base64.b64encode(image_data).decode("ascii")
+        output_path = self.cache_dir / "decoded.png"
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        with patch("image_generator_agent.get_image_path", return_value=output_path):
+            image_path = image_generator_agent.asyncio.run(
+                image_generator_agent.save_base64_image_to_file(b64_data, "test-content-123", "Title")
+            )
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual(image_path, str(output_path))
+        self.assertEqual(output_path.read_bytes(), image_data)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+
+from agents.shared import utils
+
+
+class TestKeywordUtils(unittest.TestCase):
+    def test_extract_keywords_orders_by_frequency(self):
+        text = "Yoga mats and yoga blocks: the best mats for yoga at home"
+        self.assertEqual(
+            utils.extract_keywords(text, max_keywords=3), ["yoga", "mats", "blocks"]
+        )
+
+    def test_extract_keywords_skips_stopwords_and_short_words(self):
+        text = "The cat and the dog is in to of an ox"
+        self.assertEqual(utils.extract_keywords(text), ["cat", "dog"])
+
+
+if __name__ == "__main__":
+    unittest.main()
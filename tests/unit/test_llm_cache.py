@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from agents.shared.llm_cache import get_or_set, semantic_cache
+
+
+def embedding_client(vectors):
+    """OpenAI client mock whose embeddings are looked up by input text."""
+    client = MagicMock()
+
+    def create(model, input):
+        return MagicMock(data=[MagicMock(embedding=vectors[input])])
+
+    client.embeddings.create.side_effect = create
+    return client
+
+
+class TestSemanticCache(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = patch.dict(
+            os.environ,
+            {"LLM_CACHE_PATH": os.path.join(cache_dir.name, "llm_cache.sqlite3")},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.calls = []
+
+        @semantic_cache(key_fn=lambda topic: (topic,), threshold=0.9, namespace="test")
+        def complete(client, topic):
+            self.calls.append(topic)
+            return {"topic": topic}
+
+        self.complete = complete
+
+    def test_exact_hit_skips_call(self):
+        client = embedding_client({'["cats"]': [1.0, 0.0]})
+        self.assertEqual(self.complete(client, "cats"), {"topic": "cats"})
+        self.assertEqual(self.complete(client, "cats"), {"topic": "cats"})
+        self.assertEqual(self.calls, ["cats"])
+
+    def test_similar_key_reuses_result(self):
+        client = embedding_client(
+            {
+                '["cats"]': [1.0, 0.0],
+                '["kittens"]': [0.99, 0.05],
+                '["rockets"]': [0.0, 1.0],
+            }
+        )
+        self.complete(client, "cats")
+        self.assertEqual(self.complete(client, "kittens"), {"topic": "cats"})
+        self.assertEqual(self.complete(client, "rockets"), {"topic": "rockets"})
+        self.assertEqual(self.calls, ["cats", "rockets"])
+
+    def test_errors_are_not_cached(self):
+        client = embedding_client({'["cats"]': [1.0, 0.0]})
+
+        @semantic_cache(key_fn=lambda topic: (topic,), namespace="failing")
+        def failing(client, topic):
+            raise RuntimeError("API down")
+
+        with self.assertRaises(RuntimeError):
+            failing(client, "cats")
+        with self.assertRaises(RuntimeError):
+            failing(client, "cats")
+
+    def test_cache_errors_do_not_discard_result(self):
+        client = embedding_client({'["cats"]': [1.0, 0.0]})
+        with patch(
+            "agents.shared.llm_cache._connect",
+            side_effect=sqlite3.OperationalError("database is locked"),
+        ):
+            with self.assertLogs("wordpress-content-generator", "WARNING") as logs:
+                self.assertEqual(self.complete(client, "cats"), {"topic": "cats"})
+        self.assertEqual(self.calls, ["cats"])
+        self.assertEqual(len(logs.records), 3)
+
+
+class TestGetOrSet(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = patch.dict(
+            os.environ,
+            {"LLM_CACHE_PATH": os.path.join(cache_dir.name, "llm_cache.sqlite3")},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.fetch = MagicMock(side_effect=["first", "second"])
+
+    def test_exact_key_hits_cache(self):
+        key = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]}
+        self.assertEqual(get_or_set(key, self.fetch), "first")
+        self.assertEqual(get_or_set(dict(key), self.fetch), "first")
+        self.fetch.assert_called_once()
+
+    def test_different_key_misses(self):
+        get_or_set({"prompt": "a"}, self.fetch)
+        self.assertEqual(get_or_set({"prompt": "b"}, self.fetch), "second")
+
+    def test_expired_entry_is_refetched(self):
+        get_or_set("key", self.fetch)
+        with patch("agents.shared.llm_cache.time.time", return_value=1e12):
+            self.assertEqual(get_or_set("key", self.fetch, ttl_days=7), "second")
+
+    def test_rejected_result_is_not_cached(self):
+        self.assertEqual(get_or_set("key", self.fetch, cacheable=lambda r: False), "first")
+        self.assertEqual(get_or_set("key", self.fetch), "second")
+        self.assertEqual(get_or_set("key", self.fetch), "second")
+
+    def test_cache_errors_do_not_discard_result(self):
+        with patch(
+            "agents.shared.llm_cache._connect",
+            side_effect=sqlite3.OperationalError("disk I/O error"),
+        ):
+            with self.assertLogs("wordpress-content-generator", "WARNING"):
+                self.assertEqual(get_or_set("key", self.fetch), "first")
+
+    def test_disabled_cache_always_fetches(self):
+        with patch.dict(os.environ, {"LLM_CACHE_DISABLED": "1"}):
+            get_or_set("key", self.fetch)
+            self.assertEqual(get_or_set("key", self.fetch), "second")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import logging
+import unittest
+import uuid
+
+from agents.shared import utils
+
+
+class TestLoggingUtils(unittest.TestCase):
+    def setUp(self):
+        self.name = f"test-logger-{uuid.uuid4().hex}"
+        root = logging.getLogger()
+        self.addCleanup(setattr, root, "handlers", root.handlers[:])
+
+    def test_get_logger_adds_handler_when_unconfigured(self):
+        logging.getLogger().handlers = []
+        logger = utils.get_logger(self.name)
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertEqual(logger.level, logging.INFO)
+
+        # A second call does not stack handlers
+        self.assertEqual(len(utils.get_logger(self.name).handlers), 1)
+
+    def test_get_logger_respects_existing_root_config(self):
+        logging.getLogger().handlers = [logging.NullHandler()]
+        self.assertEqual(utils.get_logger(self.name).handlers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+import agents.shared
 from agents.shared.markdown_utils import markdown_to_html
 
 
@@ -10,6 +11,19 @@ class TestMarkdownUtils(unittest.TestCase):
         self.assertIn("<h1>Title</h1>", html)
         self.assertIn("<strong>world</strong>", html)
 
+    def test_markdown_to_html_escapes_bold_and_list_items(self):
+        md = "- **a<b** & c\n- unclosed **bold\nText"
+        html = markdown_to_html(md)
+        self.assertEqual(
+            html,
+            "<ul>\n<li><strong>a&lt;b</strong> &amp; c</li>\n"
+            "<li>unclosed **bold</li>\n</ul>\n<p>Text</p>",
+        )
+
+    def test_markdown_to_html_is_exported_by_shared_package(self):
+        self.assertIs(agents.shared.markdown_to_html, markdown_to_html)
+        self.assertIn("markdown_to_html", agents.shared.__all__)
+
 
 if __name__ == "__main__":
     unittest.main()
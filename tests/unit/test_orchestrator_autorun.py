@@ -2,12 +2,14 @@ import sys
 import os
 import unittest
 from types import SimpleNamespace
+from unittest.mock import patch
 
 # Ensure parent path
 sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+import orchestrator
 from orchestrator import get_next_agent
 
 
@@ -18,5 +20,37 @@ class TestOrchestratorAutoRun(unittest.TestCase):
         self.assertIsNone(get_next_agent("wordpress-publisher-agent"))
 
 
+class TestImageAndPublish(unittest.TestCase):
+    @patch("wordpress_publisher_agent.run")
+    @patch("image_generator_agent.run")
+    def test_image_result_is_handed_to_publisher(self, mock_image_run, mock_publish_run):
+        image_result = {"content_id": "c1", "image_path": "images/c1.png", "persisted": False}
+        mock_image_run.return_value = image_result
+        mock_publish_run.return_value = {"content_id": "c1", "post_id": 7, "post_url": "u"}
+
+        with patch("builtins.print"):
+            self.assertTrue(orchestrator.run_image_and_publish("c1", None))
+
+        mock_image_run.assert_called_once_with(
+            {"content_id": "c1", "no_ai": True, "preview": False}
+        )
+        mock_publish_run.assert_called_once_with(
+            {"content_id": "c1", "no_ai": True, "preview": False, "featured_image": image_result}
+        )
+
+    @patch("wordpress_publisher_agent.run")
+    @patch("image_generator_agent.run", side_effect=RuntimeError("claimed by another worker"))
+    def test_image_failure_skips_publishing(self, mock_image_run, mock_publish_run):
+        with patch("builtins.print"):
+            self.assertFalse(orchestrator.run_image_and_publish("c1", None))
+        mock_publish_run.assert_not_called()
+
+    @patch("wordpress_publisher_agent.run", return_value={"content_id": "c1", "post_id": None, "post_url": None})
+    @patch("image_generator_agent.run", return_value={"content_id": "c1", "image_path": "p"})
+    def test_unpublished_post_reports_failure(self, mock_image_run, mock_publish_run):
+        with patch("builtins.print"):
+            self.assertFalse(orchestrator.run_image_and_publish("c1", None))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,13 +2,17 @@
 Unit tests for the research agent.
 """
 
+import asyncio
 import json
 import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import ANY, MagicMock, mock_open, patch
 
+import fastjsonschema
+import httpx
 import pytest
 
 # Add the parent directory to the path so we can import the agent
@@ -16,6 +20,8 @@ sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+import research_agent
+from agents.shared.utils import clear_client_cache
 # Import functions to test
 from research_agent import (get_content_keywords, get_content_piece,
                             get_strategic_plan, get_supabase_client,
@@ -24,11 +30,30 @@ from research_agent import (get_content_keywords, get_content_piece,
                             setup_openai)
 
 
+def stream_chunks(texts):
+    """Build streamed chat completion chunks carrying the given text deltas."""
+    return [MagicMock(choices=[MagicMock(delta=MagicMock(content=t))]) for t in texts]
+
+
 class TestResearchAgent(unittest.TestCase):
     """Test cases for the research agent functions."""
 
     def setUp(self):
         """Set up test case."""
+        # Clear cached clients so each test builds its own
+        clear_client_cache()
+        research_agent._RESEARCH_TABLE_EXISTS = False
+
+        # Keep the LLM cache out of the working tree and isolated per test
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        env = patch.dict(
+            os.environ,
+            {"LLM_CACHE_PATH": os.path.join(cache_dir.name, "llm_cache.sqlite3")},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
         self.mock_content_piece = {
             "id": "test-content-id",
             "strategic_plan_id": "test-plan-id",
@@ -84,17 +109,45 @@ class TestResearchAgent(unittest.TestCase):
     @patch("os.getenv")
     def test_get_supabase_client(self, mock_getenv):
         """Test Supabase client creation with valid credentials."""
-        mock_getenv.side_effect = lambda x: (
+        mock_getenv.side_effect = lambda x, default=None: (
             "fake-url" if x == "SUPABASE_URL" else "fake-key"
         )
 
-        with patch("agents.shared.utils.create_client") as mock_create_client:
+        with patch("supabase.create_client") as mock_create_client:
             mock_create_client.return_value = "mock-supabase-client"
             client = get_supabase_client()
 
-            mock_create_client.assert_called_once_with("fake-url", "fake-key")
+            mock_create_client.assert_called_once_with("fake-url", "fake-key", options=ANY)
             self.assertEqual(client, "mock-supabase-client")
 
+    @patch("os.getenv")
+    def test_get_supabase_client_is_cached(self, mock_getenv):
+        """Test that repeated calls reuse a single Supabase client."""
+        mock_getenv.side_effect = lambda x, default=None: (
+            "fake-url" if x == "SUPABASE_URL" else "fake-key"
+        )
+
+        with patch("supabase.create_client") as mock_create_client:
+            mock_create_client.return_value = "mock-supabase-client"
+            first = get_supabase_client()
+            second = get_supabase_client()
+
+            mock_create_client.assert_called_once()
+            self.assertIs(first, second)
+
+    @patch("os.getenv")
+    def test_get_supabase_client_uses_pooled_http_client(self, mock_getenv):
+        """Test that the Supabase client is given a keep-alive httpx client."""
+        mock_getenv.side_effect = lambda x, default=None: (
+            "fake-url" if x == "SUPABASE_URL" else "fake-key"
+        )
+
+        with patch("supabase.create_client") as mock_create_client:
+            get_supabase_client()
+
+            options = mock_create_client.call_args[1]["options"]
+            self.assertIsInstance(options.httpx_client, httpx.Client)
+
     def test_get_content_piece_with_id(self):
         """Test retrieving a content piece with a specific ID."""
         mock_supabase = MagicMock()
@@ -170,19 +223,35 @@ class TestResearchAgent(unittest.TestCase):
         )
         self.assertEqual(plan, self.mock_plan)
 
+    def test_get_research_inputs(self):
+        """Test fetching keywords and the strategic plan together."""
+        mock_supabase = MagicMock()
+
+        def execute_for(table):
+            data = {"keywords": [self.mock_keywords], "strategic_plans": [self.mock_plan]}
+            chain = MagicMock()
+            chain.select.return_value.eq.return_value.execute.return_value = MagicMock(
+                data=data[table]
+            )
+            return chain
+
+        mock_supabase.table.side_effect = execute_for
+
+        keywords, plan = asyncio.run(
+            research_agent.get_research_inputs(mock_supabase, self.mock_content_piece)
+        )
+
+        self.assertEqual(keywords, self.mock_keywords)
+        self.assertEqual(plan, self.mock_plan)
+
     @patch("builtins.print")
     def test_perform_research_with_ai(self, mock_print):
         """Test performing research with OpenAI."""
         mock_openai_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.choices = [
-            MagicMock(
-                message=MagicMock(
-                    content=json.dumps({"research_points": self.mock_research_points})
-                )
-            )
-        ]
-        mock_openai_client.chat.completions.create.return_value = mock_response
+        content = json.dumps({"research_points": self.mock_research_points})
+        mock_openai_client.chat.completions.create.return_value = stream_chunks(
+            [content[i : i + 7] for i in range(0, len(content), 7)]
+        )
 
         result = perform_research_with_ai(
             mock_openai_client,
@@ -192,13 +261,125 @@ class TestResearchAgent(unittest.TestCase):
         )
 
         mock_openai_client.chat.completions.create.assert_called_once()
+        response_format = mock_openai_client.chat.completions.create.call_args[1][
+            "response_format"
+        ]
+        self.assertEqual(response_format["type"], "json_schema")
+        self.assertTrue(response_format["json_schema"]["strict"])
         self.assertEqual(result, self.mock_research_points)
 
+        call_kwargs = mock_openai_client.chat.completions.create.call_args[1]
+        self.assertEqual(
+            call_kwargs["messages"][0],
+            {"role": "system", "content": research_agent.RESEARCH_SYSTEM_PROMPT},
+        )
+        self.assertEqual(
+            call_kwargs["extra_body"], {"prompt_cache_key": "research-agent-v1"}
+        )
+
+    def test_read_streamed_json_object_stops_at_closing_brace(self):
+        """Test that parsing ignores braces in strings and trailing output."""
+        chunks = stream_chunks(['{"a": "}{\\""', ', "b": {"c"', ": 1}}", "\n\ntrailing"])
+
+        result = research_agent.read_streamed_json_object(iter(chunks))
+
+        self.assertEqual(result, {"a": '}{"', "b": {"c": 1}})
+
+    def test_validate_research_data_rejects_bad_confidence(self):
+        """Test that the compiled validator bounds confidence scores."""
+        research_agent.validate_research_data(
+            {"research_points": self.mock_research_points}
+        )
+
+        bad_point = dict(self.mock_research_points[0], confidence=1.5)
+        with self.assertRaises(fastjsonschema.JsonSchemaException):
+            research_agent.validate_research_data({"research_points": [bad_point]})
+
+    @patch("builtins.print")
+    def test_perform_research_with_ai_falls_back_to_mock(self, mock_print):
+        """Test that a failed OpenAI call yields the mock research points."""
+        mock_openai_client = MagicMock()
+        mock_openai_client.chat.completions.create.side_effect = Exception("API down")
+
+        result = perform_research_with_ai(
+            mock_openai_client,
+            self.mock_content_piece,
+            self.mock_keywords,
+            self.mock_plan,
+        )
+
+        self.assertEqual(len(result), 5)
+        self.assertEqual(
+            result[0]["excerpt"],
+            "According to a recent study, 78% of test audience consider test keyword "
+            "to be essential for success.",
+        )
+        self.assertEqual(
+            [point["type"] for point in result],
+            ["statistic", "quote", "definition", "fact", "example"],
+        )
+
+    @patch("builtins.print")
+    @patch("research_agent.save_results_to_file", return_value="research_test.json")
+    @patch("research_agent.save_research_to_database")
+    @patch("research_agent.get_research_inputs")
+    def test_research_content_pieces_isolates_failures(
+        self, mock_inputs, mock_save_db, mock_save_file, mock_print
+    ):
+        """Test that a piece missing keywords does not stop the rest of the batch."""
+
+        async def inputs(supabase, content_piece):
+            if content_piece["id"] == "no-keywords":
+                return None, self.mock_plan
+            return self.mock_keywords, self.mock_plan
+
+        mock_inputs.side_effect = inputs
+        pieces = [dict(self.mock_content_piece, id="no-keywords"), self.mock_content_piece]
+
+        results = asyncio.run(
+            research_agent.research_content_pieces(MagicMock(), None, pieces, no_ai=True)
+        )
+
+        self.assertIsInstance(results[0], research_agent.AgentDataError)
+        filename, research_points = results[1]
+        self.assertEqual(filename, "research_test.json")
+        self.assertEqual(len(research_points), 5)
+        mock_save_db.assert_called_once()
+
     @patch("builtins.print")
     def test_save_research_to_database(self, mock_print):
-        """Test saving research to the database."""
+        """Test saving research to the database through the RPC."""
         mock_supabase = MagicMock()
 
+        # Call the function to test
+        save_research_to_database(
+            mock_supabase, "test-content-id", self.mock_research_points
+        )
+
+        # Verify table exists check was made
+        mock_supabase.table.assert_any_call("research")
+        mock_supabase.table.return_value.select.assert_any_call("count", count="exact")
+
+        # Verify everything is written in a single RPC call
+        mock_supabase.rpc.assert_called_once()
+        name, params = mock_supabase.rpc.call_args[0]
+        self.assertEqual(name, "finalize_research")
+        self.assertEqual(params["p_content_id"], "test-content-id")
+        self.assertEqual(len(params["p_rows"]), 2)
+        self.assertEqual(
+            params["p_agent_output"]["research_points"], self.mock_research_points
+        )
+        mock_supabase.table.return_value.insert.assert_not_called()
+        mock_supabase.table.return_value.update.assert_not_called()
+
+    @patch("builtins.print")
+    def test_save_research_to_database_without_rpc(self, mock_print):
+        """Test saving research with separate requests when the RPC fails."""
+        mock_supabase = MagicMock()
+        mock_supabase.rpc.return_value.execute.side_effect = Exception(
+            "function finalize_research does not exist"
+        )
+
         # Mock the research table check
         mock_test_query = MagicMock()
         mock_test_query.execute.return_value = MagicMock()  # Table exists
@@ -217,24 +398,33 @@ class TestResearchAgent(unittest.TestCase):
             mock_supabase, "test-content-id", self.mock_research_points
         )
 
-        # Verify table exists check was made
-        mock_supabase.table.assert_any_call("research")
-        mock_supabase.table.return_value.select.assert_any_call("count", count="exact")
-
         # Verify content piece status update
         mock_supabase.table.assert_any_call("content_pieces")
         mock_supabase.table.return_value.update.assert_called_once_with(
             {"status": "researched"}
         )
 
-        # Verify research inserts (one for each research point)
+        # Verify research points are inserted in one request
         self.assertEqual(
-            mock_supabase.table.return_value.insert.call_count, 3
-        )  # 2 research points + 1 agent status entry
+            mock_supabase.table.return_value.insert.call_count, 2
+        )  # 1 bulk research insert + 1 agent status entry
+        research_rows = mock_supabase.table.return_value.insert.call_args_list[0][0][0]
+        self.assertEqual(len(research_rows), 2)
+        self.assertEqual(research_rows[0]["content_id"], "test-content-id")
+
+    def test_research_table_probe_runs_once(self):
+        """Test that the research table is only probed until it is found."""
+        mock_supabase = MagicMock()
+
+        self.assertTrue(research_agent.research_table_exists(mock_supabase))
+        self.assertTrue(research_agent.research_table_exists(mock_supabase))
+
+        mock_supabase.table.return_value.select.assert_called_once_with(
+            "count", count="exact"
+        )
 
     @patch("builtins.open", new_callable=mock_open)
-    @patch("json.dump")
-    def test_save_results_to_file(self, mock_json_dump, mock_file_open):
+    def test_save_results_to_file(self, mock_file_open):
         """Test saving research results to a file."""
         content_id = "test-content-id"
         content_title = "Test Article Title"
@@ -243,8 +433,11 @@ class TestResearchAgent(unittest.TestCase):
             content_id, content_title, self.mock_research_points
         )
 
-        mock_file_open.assert_called_once()
-        mock_json_dump.assert_called_once()
+        mock_file_open.assert_called_once_with(filename, "wb")
+        written = mock_file_open().write.call_args[0][0]
+        self.assertEqual(
+            json.loads(written)["research_points"], self.mock_research_points
+        )
         self.assertTrue(filename.startswith("research_"))
 
 
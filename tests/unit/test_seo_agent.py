@@ -7,7 +7,7 @@ import os
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import ANY, MagicMock, mock_open, patch
 
 import pytest
 
@@ -16,6 +16,7 @@ sys.path.append(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+from agents.shared.utils import clear_client_cache
 # Import functions to test (adjust these imports based on your actual file structure)
 from enhanced_seo_agent import (analyze_seo_keywords_with_ai,
                                 generate_content_ideas_with_ai,
@@ -29,6 +30,9 @@ class TestSEOAgent(unittest.TestCase):
 
     def setUp(self):
         """Set up test case."""
+        # Clear cached clients so each test builds its own
+        clear_client_cache()
+
         self.mock_plan = {
             "id": "test-plan-id",
             "domain": "example.com",
@@ -69,15 +73,15 @@ class TestSEOAgent(unittest.TestCase):
     @patch("os.getenv")
     def test_get_supabase_client(self, mock_getenv):
         """Test Supabase client creation with valid credentials."""
-        mock_getenv.side_effect = lambda x: (
+        mock_getenv.side_effect = lambda x, default=None: (
             "fake-url" if x == "SUPABASE_URL" else "fake-key"
         )
 
-        with patch("agents.shared.utils.create_client") as mock_create_client:
+        with patch("supabase.create_client") as mock_create_client:
             mock_create_client.return_value = "mock-supabase-client"
             client = get_supabase_client()
 
-            mock_create_client.assert_called_once_with("fake-url", "fake-key")
+            mock_create_client.assert_called_once_with("fake-url", "fake-key", options=ANY)
             self.assertEqual(client, "mock-supabase-client")
 
     def test_get_strategic_plan_with_id(self):
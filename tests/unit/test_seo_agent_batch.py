@@ -0,0 +1,104 @@
+"""Tests for batched keyword generation in the SEO agent."""
+
+import importlib
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from agents.shared.schemas import TaskStatus
+
+# "seo-agent" is not a valid identifier, so import it the way run_agent.py does
+seo_agent = importlib.import_module("agents.seo-agent.index")
+
+
+def cluster(name):
+    return {
+        "focus_keyword": f"{name} keyword",
+        "supporting_keywords": [f"{name} tips"],
+        "internal_links": [f"{name} guide"],
+        "cluster_target": name,
+    }
+
+
+class TestSeoAgentBatch(unittest.TestCase):
+    def setUp(self):
+        self.inputs = [
+            {"domain": "garden.com", "niche": "gardening"},
+            {"domain": "fit.com", "niche": "fitness"},
+            {"domain": "code.com", "niche": "python"},
+        ]
+
+    @patch.object(seo_agent, "generate_completion")
+    def test_clusters_come_from_one_structured_request(self, mock_completion):
+        mock_completion.return_value = json.dumps(
+            {"clusters": [cluster("gardening"), cluster("fitness"), cluster("python")]}
+        )
+
+        results = seo_agent.run_batch(self.inputs)
+
+        mock_completion.assert_called_once()
+        kwargs = mock_completion.call_args.kwargs
+        self.assertEqual(kwargs["response_format"]["type"], "json_schema")
+        self.assertEqual(kwargs["prompt_cache_key"], seo_agent.SEO_PROMPT_CACHE_KEY)
+        self.assertIn("2. domain: code.com, niche: python", kwargs["prompt"])
+        self.assertEqual(
+            [r["output"]["seo"]["cluster_target"] for r in results],
+            ["gardening", "fitness", "python"],
+        )
+        self.assertTrue(all(r["status"] == TaskStatus.DONE for r in results))
+
+    @patch.object(seo_agent, "generate_keyword_cluster")
+    @patch.object(seo_agent, "generate_completion")
+    def test_schema_failure_falls_back_to_single_runs(self, mock_completion, mock_single):
+        mock_completion.return_value = '{"clusters": ['
+        mock_single.side_effect = lambda domain, niche: cluster(niche)
+
+        results = seo_agent.run_batch(self.inputs)
+
+        self.assertEqual(
+            [c.args for c in mock_single.call_args_list],
+            [("garden.com", "gardening"), ("fit.com", "fitness"), ("code.com", "python")],
+        )
+        self.assertEqual(
+            [r["output"]["seo"]["cluster_target"] for r in results],
+            ["gardening", "fitness", "python"],
+        )
+
+    @patch.object(seo_agent, "generate_keyword_cluster")
+    @patch.object(seo_agent, "generate_completion")
+    def test_cluster_count_mismatch_falls_back_to_single_runs(self, mock_completion, mock_single):
+        mock_completion.return_value = json.dumps({"clusters": [cluster("gardening")]})
+        mock_single.side_effect = lambda domain, niche: cluster(niche)
+
+        with self.assertRaisesRegex(ValueError, "Expected 3 keyword clusters, got 1"):
+            seo_agent.generate_keyword_clusters(self.inputs)
+        results = seo_agent.run_batch(self.inputs)
+
+        self.assertEqual(mock_single.call_count, 3)
+        self.assertEqual(
+            [r["output"]["seo"]["cluster_target"] for r in results],
+            ["gardening", "fitness", "python"],
+        )
+
+    @patch.object(seo_agent, "generate_completion")
+    def test_invalid_inputs_keep_their_position(self, mock_completion):
+        mock_completion.return_value = json.dumps(
+            {"clusters": [cluster("gardening"), cluster("python")]}
+        )
+        inputs = [self.inputs[0], {"domain": "broken.com"}, self.inputs[2]]
+
+        results = seo_agent.run_batch(inputs)
+
+        self.assertIn("2 sites below", mock_completion.call_args.kwargs["prompt"])
+        self.assertEqual(results[0]["output"]["seo"]["cluster_target"], "gardening")
+        self.assertEqual(results[1]["status"], "error")
+        self.assertEqual(results[2]["output"]["seo"]["cluster_target"], "python")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from agents.exceptions import AgentConfigError
+from agents.shared import utils
+
+
+class TestSettingsUtils(unittest.TestCase):
+    def setUp(self):
+        utils.clear_client_cache()
+        self.addCleanup(utils.clear_client_cache)
+
+    def test_settings_are_read_once(self):
+        with patch.dict(os.environ, {"SUPABASE_URL": "first-url"}):
+            self.assertEqual(utils.get_settings().supabase_url, "first-url")
+        with patch.dict(os.environ, {"SUPABASE_URL": "second-url"}):
+            self.assertEqual(utils.get_settings().supabase_url, "first-url")
+            utils.clear_client_cache()
+            self.assertEqual(utils.get_settings().supabase_url, "second-url")
+
+    def test_require_names_missing_variables(self):
+        settings = utils.Settings(supabase_url="url")
+        with self.assertRaisesRegex(
+            AgentConfigError, "^SUPABASE_KEY environment variable must be set$"
+        ):
+            settings.require("supabase_url", "supabase_key")
+        with self.assertRaisesRegex(
+            AgentConfigError,
+            "^OPENAI_API_KEY and WP_API_URL environment variables must be set$",
+        ):
+            settings.require("openai_api_key", "wp_api_url")
+
+    @patch("openai.OpenAI")
+    @patch("supabase.create_client")
+    def test_clients_are_created_once(self, mock_create_client, mock_openai):
+        env = {"SUPABASE_URL": "url", "SUPABASE_KEY": "key", "OPENAI_API_KEY": "sk"}
+        with patch.dict(os.environ, env):
+            self.assertIs(utils.get_supabase_client(), utils.get_supabase_client())
+            self.assertIs(utils.get_openai_client(), utils.setup_openai())
+            mock_create_client.assert_called_once()
+            mock_openai.assert_called_once_with(api_key="sk")
+
+            utils.clear_client_cache()
+            utils.get_supabase_client()
+            utils.get_openai_client()
+        self.assertEqual(mock_create_client.call_count, 2)
+        self.assertEqual(mock_openai.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
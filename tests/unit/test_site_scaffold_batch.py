@@ -0,0 +1,190 @@
+"""Tests for the WordPress batch helpers in the site scaffold script."""
+
+import asyncio
+import importlib.util
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+SCRIPT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "agents",
+    "site_scaffold_agent.py",
+)
+
+# The agents/site_scaffold_agent package shadows the script, so load it by path
+spec = importlib.util.spec_from_file_location("site_scaffold_script", SCRIPT_PATH)
+scaffold = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(scaffold)
+
+WP_SITE = {
+    "id": "site-1",
+    "domain": "example.com",
+    "url": "https://example.com/",
+    "username": "admin",
+    "app_password": "secret",
+}
+
+
+def batch_response(responses, failed=None):
+    result = {"responses": responses}
+    if failed:
+        result["failed"] = failed
+    return MagicMock(json=MagicMock(return_value=result))
+
+
+class TestWordPressBatch(unittest.TestCase):
+    @patch.object(scaffold, "get_http_session")
+    def test_batch_request_is_chunked(self, mock_session):
+        mock_post = mock_session.return_value.post
+        mock_post.side_effect = lambda url, **kw: batch_response(
+            [{"status": 201, "body": {}} for _ in kw["json"]["requests"]]
+        )
+        sub_requests = [{"method": "POST", "path": "/wp/v2/tags"}] * 30
+
+        responses = scaffold.wp_batch_request(WP_SITE, sub_requests)
+
+        self.assertEqual(len(responses), 30)
+        self.assertEqual(mock_post.call_count, 2)
+        url = mock_post.call_args.args[0]
+        self.assertEqual(url, "https://example.com/wp-json/batch/v1")
+        sizes = [len(c.kwargs["json"]["requests"]) for c in mock_post.call_args_list]
+        self.assertEqual(sizes, [25, 5])
+
+    @patch.object(scaffold, "get_http_session")
+    def test_batch_validation_failure_raises(self, mock_session):
+        mock_post = mock_session.return_value.post
+        mock_post.return_value = batch_response(
+            [{"status": 400, "body": {"message": "Invalid slug"}}], failed="validation"
+        )
+        with self.assertRaisesRegex(ValueError, "Invalid slug"):
+            scaffold.wp_batch_request(WP_SITE, [{"method": "POST", "path": "/x"}])
+
+    @patch.object(scaffold, "get_http_session")
+    def test_site_structure_uses_one_batch(self, mock_session):
+        mock_post = mock_session.return_value.post
+        mock_post.side_effect = lambda url, **kw: batch_response(
+            [
+                {"status": 201, "body": {"id": i}}
+                for i, _ in enumerate(kw["json"]["requests"], 100)
+            ]
+        )
+
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+            MagicMock(data=[{"niche": "gardening", "audience": "home growers"}])
+        )
+
+        pages_created, categories = scaffold.create_site_structure(WP_SITE, supabase)
+
+        self.assertTrue(pages_created)
+        mock_post.assert_called_once()
+        self.assertEqual(len(categories), len(scaffold.DEFAULT_CATEGORIES))
+        self.assertEqual(categories[0]["id"], 100 + len(scaffold.EEAT_PAGES))
+        pages = mock_post.call_args.kwargs["json"]["requests"][: len(scaffold.EEAT_PAGES)]
+        self.assertTrue(any("gardening" in p["body"]["content"] for p in pages))
+
+    @patch.object(scaffold, "get_http_session")
+    def test_site_structure_without_credentials_is_simulated(self, mock_session):
+        mock_post = mock_session.return_value.post
+        site = {"id": "site-1", "domain": "example.com", "url": "https://example.com"}
+        supabase = MagicMock()
+        supabase.table.side_effect = Exception("offline")
+        pages_created, categories = scaffold.create_site_structure(site, supabase)
+
+        self.assertTrue(pages_created)
+        mock_post.assert_not_called()
+        self.assertEqual([c["id"] for c in categories][:2], [1, 2])
+        self.assertEqual(categories[0]["slug"], "guides-tutorials")
+
+    @patch("time.sleep", side_effect=AssertionError("scaffold should not sleep"))
+    def test_simulated_scaffold_steps_do_not_sleep(self, _):
+        site = {"id": "site-1", "domain": "example.com", "url": "https://example.com"}
+        self.assertTrue(scaffold.install_plugins(site))
+        pages_created, _ = scaffold.create_site_structure(site, MagicMock())
+        self.assertTrue(pages_created)
+
+
+class TestContentClusters(unittest.TestCase):
+    def setUp(self):
+        scaffold._get_strategic_plan.cache_clear()
+        self.addCleanup(scaffold._get_strategic_plan.cache_clear)
+
+    def test_eeat_pages_are_rendered_once_per_site_identity(self):
+        pages = scaffold._render_eeat("Example", "gardening", "home growers")
+        self.assertIs(pages, scaffold._render_eeat("Example", "gardening", "home growers"))
+        self.assertEqual(
+            pages[0]["body"]["content"],
+            "This is the About Us page for Example. We are experts in gardening "
+            "focused on providing value to home growers.",
+        )
+
+    def test_strategic_plan_lookup_is_cached_until_insert(self):
+        supabase = MagicMock()
+        select = supabase.table.return_value.select.return_value.eq.return_value.execute
+        select.return_value = MagicMock(data=[])
+        supabase.table.return_value.insert.return_value.execute.return_value = (
+            MagicMock(data=[{"id": "plan-new"}])
+        )
+
+        scaffold.eeat_page_requests(WP_SITE, supabase)
+        plan_id = scaffold.get_strategic_plan_id(WP_SITE, "Cat 1", supabase)
+        self.assertEqual(plan_id, "plan-new")
+        self.assertEqual(select.call_count, 1)
+
+        select.return_value = MagicMock(data=[{"id": "plan-new"}])
+        scaffold.get_strategic_plan_id(WP_SITE, "Cat 1", supabase)
+        scaffold.get_strategic_plan_id(WP_SITE, "Cat 1", supabase)
+        self.assertEqual(select.call_count, 2)
+
+    def test_clusters_are_saved_with_one_rpc(self):
+        supabase = MagicMock()
+        categories = [
+            {"id": i, "name": f"Cat {i}", "slug": f"cat-{i}"} for i in range(1, 4)
+        ]
+
+        content_ids = asyncio.run(
+            scaffold.generate_content_clusters(categories, WP_SITE, supabase)
+        )
+
+        supabase.rpc.assert_called_once()
+        name, params = supabase.rpc.call_args.args
+        self.assertEqual(name, "scaffold_content")
+        self.assertEqual(params["p_site_id"], "site-1")
+        self.assertEqual(params["p_plan"]["niche"], "Cat 1")
+        self.assertEqual([row["id"] for row in params["p_rows"]], content_ids)
+        self.assertEqual(len(content_ids), 18)
+        supabase.table.assert_not_called()
+
+    def test_clusters_fall_back_to_bulk_inserts(self):
+        supabase = MagicMock()
+        supabase.rpc.side_effect = Exception("function scaffold_content does not exist")
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = (
+            MagicMock(data=[{"id": "plan-1"}])
+        )
+        categories = [
+            {"id": i, "name": f"Cat {i}", "slug": f"cat-{i}"} for i in range(1, 4)
+        ]
+
+        with patch.object(scaffold, "create_agent_tasks") as mock_tasks:
+            content_ids = asyncio.run(
+                scaffold.generate_content_clusters(categories, WP_SITE, supabase)
+            )
+
+        supabase.table.return_value.insert.assert_called_once()
+        inserted = supabase.table.return_value.insert.call_args.args[0]
+        self.assertEqual(len(inserted), 18)
+        self.assertEqual(content_ids, [row["id"] for row in inserted])
+        pillars = {row["id"] for row in inserted if row["is_pillar"]}
+        self.assertEqual(len(pillars), 3)
+        self.assertTrue(
+            all(row["pillar_id"] in pillars for row in inserted if not row["is_pillar"])
+        )
+        tasks = mock_tasks.call_args.args[0]
+        self.assertEqual([t[1] for t in tasks], content_ids)
+        self.assertEqual(tasks[0][2], {"plan_id": "plan-1"})
+        mock_tasks.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
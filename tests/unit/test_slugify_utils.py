@@ -12,6 +12,12 @@ class TestSlugifyUtils(unittest.TestCase):
         title = "Python & Django @ Scale"
         self.assertEqual(utils.slugify(title), "python-django-scale")
 
+    def test_create_slug_reuses_cached_slug(self):
+        utils.slugify.cache_clear()
+        self.assertEqual(utils.create_slug("Best Yoga Mats"), "best-yoga-mats")
+        self.assertEqual(utils.slugify("Best Yoga Mats"), "best-yoga-mats")
+        self.assertEqual(utils.slugify.cache_info().hits, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
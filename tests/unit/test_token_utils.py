@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+
+from agents.shared import utils
+
+
+class TestTokenUtils(unittest.TestCase):
+    def setUp(self):
+        utils._encoding_for_model.cache_clear()
+        self.addCleanup(utils._encoding_for_model.cache_clear)
+
+    @patch("tiktoken.encoding_for_model")
+    def test_count_tokens_reuses_encoding(self, mock_encoding_for_model):
+        mock_encoding_for_model.return_value.encode.side_effect = str.split
+
+        self.assertEqual(utils.count_tokens("one two three"), 3)
+        self.assertEqual(utils.count_tokens("four five"), 2)
+        mock_encoding_for_model.assert_called_once_with("gpt-4")
+
+    @patch(
+        "tiktoken.encoding_for_model",
+        side_effect=KeyError("unknown model"),
+    )
+    def test_count_tokens_falls_back_for_unknown_model(self, _):
+        self.assertEqual(utils.count_tokens("x" * 40, model="unknown"), 10)
+
+    @patch("tiktoken.encoding_for_model")
+    def test_count_tokens_propagates_encoding_errors(self, mock_encoding_for_model):
+        mock_encoding_for_model.return_value.encode.side_effect = ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            utils.count_tokens("text")
+
+    @patch("tiktoken.encoding_for_model")
+    def test_count_tokens_batch(self, mock_encoding_for_model):
+        mock_encoding_for_model.return_value.encode_ordinary_batch.side_effect = (
+            lambda texts, num_threads: [text.split() for text in texts]
+        )
+
+        self.assertEqual(utils.count_tokens_batch(["a b", "c", ""]), [2, 1, 0])
+        mock_encoding_for_model.return_value.encode_ordinary_batch.assert_called_once()
+
+    @patch("tiktoken.encoding_for_model", side_effect=KeyError("unknown model"))
+    def test_count_tokens_batch_falls_back_for_unknown_model(self, _):
+        self.assertEqual(
+            utils.count_tokens_batch(["x" * 8, "y" * 4], model="unknown"), [2, 1]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,6 +18,7 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import wordpress_publisher_agent
+from agents.exceptions import AgentConfigError, AgentDataError
 
 class TestWordPressPublisherAgent(unittest.TestCase):
     """Test cases for WordPress Publisher Agent."""
@@ -502,9 +503,49 @@ class TestWordPressPublisherAgent(unittest.TestCase):
         
         # Test with missing environment variables
         with patch.dict(os.environ, {}, clear=True):
-            with self.assertRaises(SystemExit):
+            with self.assertRaises(AgentConfigError):
                 wordpress_publisher_agent.get_wordpress_credentials()
 
+    def test_get_content_piece_raises_when_missing(self):
+        """Test that a missing content piece raises instead of exiting."""
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = []
+
+        with self.assertRaisesRegex(AgentDataError, "Content piece with ID missing-id not found"):
+            wordpress_publisher_agent.get_content_piece(mock_supabase, "missing-id")
+
+    @patch('wordpress_publisher_agent.publish_content_piece', return_value=(456, "https://example.com/test-article/"))
+    @patch('wordpress_publisher_agent.get_wordpress_credentials')
+    @patch('wordpress_publisher_agent.get_supabase_client')
+    def test_run_uses_handed_over_image(self, mock_get_supabase, mock_get_wp_creds, mock_publish):
+        """Test that run() publishes the image handed over without re-reading rows."""
+        mock_supabase = MagicMock()
+        mock_get_supabase.return_value = mock_supabase
+        mock_get_wp_creds.return_value = self.wp_credentials
+        content_piece = dict(self.content_piece, keywords=[self.keywords])
+
+        result = wordpress_publisher_agent.run({
+            "content_piece": content_piece,
+            "featured_image": {"image_path": "/tmp/generated.png"},
+        })
+
+        self.assertEqual(result, {
+            "content_id": "test-content-123",
+            "post_id": 456,
+            "post_url": "https://example.com/test-article/",
+        })
+        mock_publish.assert_called_once_with(
+            mock_supabase, self.wp_credentials, content_piece, self.keywords, "/tmp/generated.png", False
+        )
+        mock_supabase.table.assert_not_called()
+
+    @patch('wordpress_publisher_agent.get_wordpress_credentials', side_effect=AgentConfigError("WORDPRESS_URL must be set"))
+    @patch('wordpress_publisher_agent.get_supabase_client')
+    def test_run_raises_on_missing_credentials(self, mock_get_supabase, mock_get_wp_creds):
+        """Test that the in-process entry point raises rather than exiting."""
+        with self.assertRaises(AgentConfigError):
+            wordpress_publisher_agent.run({"content_id": "test-content-123"})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -26,14 +26,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+from agents.exceptions import AgentConfigError, AgentDataError, AgentError
 from agents.shared.markdown_utils import markdown_to_html
-
-try:
-    from supabase import create_client  # noqa: F401
-except ImportError:
-    print("Error: Required packages not installed. Run 'pip install supabase requests'")
-    sys.exit(1)
-
 from agents.shared.utils import get_supabase_client
 
 
@@ -44,10 +38,9 @@ def get_wordpress_credentials():
     wp_app_password = os.getenv("WORDPRESS_APP_PASSWORD")
 
     if not wp_url or not wp_user or not wp_app_password:
-        print(
-            "Error: WORDPRESS_URL, WORDPRESS_USER, and WORDPRESS_APP_PASSWORD environment variables must be set"
+        raise AgentConfigError(
+            "WORDPRESS_URL, WORDPRESS_USER, and WORDPRESS_APP_PASSWORD environment variables must be set"
         )
-        sys.exit(1)
 
     # Ensure the URL ends with a trailing slash
     if not wp_url.endswith("/"):
@@ -70,6 +63,9 @@ def get_content_piece(supabase, content_id=None):
 
     Returns:
         Content piece data as a dictionary
+
+    Raises:
+        AgentDataError: If no matching content piece exists
     """
     if content_id:
         # Get specific content piece by ID
@@ -77,8 +73,7 @@ def get_content_piece(supabase, content_id=None):
             supabase.table("content_pieces").select("*").eq("id", content_id).execute()
         )
         if not result.data:
-            print(f"Error: Content piece with ID {content_id} not found")
-            sys.exit(1)
+            raise AgentDataError(f"Content piece with ID {content_id} not found")
         return result.data[0]
     else:
         # Get the first content piece with status "image_generated"
@@ -90,8 +85,7 @@ def get_content_piece(supabase, content_id=None):
             .execute()
         )
         if not result.data:
-            print("Error: No content pieces with status 'image_generated' found")
-            sys.exit(1)
+            raise AgentDataError("No content pieces with status 'image_generated' found")
         return result.data[0]
 
 
@@ -400,16 +394,113 @@ def parse_arguments():
     return parser.parse_args()
 
 
+def publish_content_piece(
+    supabase, wp_credentials, content_piece, keywords=None, image_path=None, preview=False
+):
+    """
+    Publish a content piece to WordPress and record the result.
+
+    Args:
+        supabase: Supabase client
+        wp_credentials: WordPress API credentials
+        content_piece: Content piece data
+        keywords: Optional keywords data used for tags
+        image_path: Optional path of the featured image to upload
+        preview: If True, create the post without publishing it
+
+    Returns:
+        Tuple of (post_id, post_url)
+    """
+    content_id = content_piece["id"]
+
+    # Upload featured image to WordPress
+    media_id = None
+    if image_path:
+        image_title = content_piece.get("title", "Featured Image")
+        media_id = upload_image_to_wordpress(wp_credentials, image_path, image_title)
+
+    # Create WordPress post
+    post_id, post_url = create_wordpress_post(
+        wp_credentials, content_piece, media_id, keywords, preview
+    )
+
+    # If in preview mode, stop here
+    if preview:
+        print("Preview mode: Post was not published to WordPress")
+        return post_id, post_url
+
+    # Update content piece status
+    if post_id and post_url:
+        update_content_piece_status(supabase, content_id, post_id, post_url)
+        print("WordPress Publisher Agent completed successfully")
+
+    return post_id, post_url
+
+
+def run(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Publish a content piece in-process, reusing data from the previous agent.
+
+    When the image generator hands over its result as ``featured_image`` the
+    content piece, keyword and image lookups are skipped.
+
+    Args:
+        input_data: Dictionary with "content_id" (or a full "content_piece"
+            row), optional "featured_image" with an "image_path", and optional
+            "preview"
+
+    Returns:
+        Dictionary with "content_id", "post_id" and "post_url"
+
+    Raises:
+        AgentError: If credentials or the content piece are missing
+    """
+    supabase = get_supabase_client()
+    wp_credentials = get_wordpress_credentials()
+
+    content_piece = input_data.get("content_piece") or get_content_piece(
+        supabase, input_data.get("content_id")
+    )
+    content_id = content_piece["id"]
+
+    if content_piece.get("keywords") is not None:
+        keywords = content_piece["keywords"][0] if content_piece["keywords"] else None
+    else:
+        keywords = get_content_keywords(supabase, content_id)
+
+    featured_image = input_data.get("featured_image") or {}
+    image_path = featured_image.get("image_path")
+    if not image_path and content_piece.get("featured_image_id"):
+        image_data = get_content_image(supabase, content_piece["featured_image_id"])
+        if image_data:
+            image_path = image_data.get("file_path")
+
+    post_id, post_url = publish_content_piece(
+        supabase,
+        wp_credentials,
+        content_piece,
+        keywords,
+        image_path,
+        input_data.get("preview", False),
+    )
+    return {"content_id": content_id, "post_id": post_id, "post_url": post_url}
+
+
 def main():
     """Main execution function."""
     args = parse_arguments()
 
-    # Initialize clients
-    supabase = get_supabase_client()
-    wp_credentials = get_wordpress_credentials()
+    try:
+        # Initialize clients
+        supabase = get_supabase_client()
+        wp_credentials = get_wordpress_credentials()
+
+        # Get content piece
+        content_piece = get_content_piece(supabase, args.content_id)
+    except AgentError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
 
-    # Get content piece
-    content_piece = get_content_piece(supabase, args.content_id)
     content_id = content_piece["id"]
 
     print(f"Processing content piece: {content_piece['title']} (ID: {content_id})")
@@ -418,7 +509,7 @@ def main():
     keywords = get_content_keywords(supabase, content_id)
 
     # Get featured image if available
-    media_id = None
+    image_path = None
     featured_image_id = content_piece.get("featured_image_id")
 
     if featured_image_id:
@@ -426,29 +517,12 @@ def main():
 
         if image_data:
             image_path = image_data.get("file_path")
-            image_title = content_piece.get("title", "Featured Image")
 
-            if image_path:
-                # Upload image to WordPress
-                media_id = upload_image_to_wordpress(
-                    wp_credentials, image_path, image_title
-                )
-
-    # Create WordPress post
-    post_id, post_url = create_wordpress_post(
-        wp_credentials, content_piece, media_id, keywords, args.preview
+    post_id, post_url = publish_content_piece(
+        supabase, wp_credentials, content_piece, keywords, image_path, args.preview
     )
 
-    # If in preview mode, exit here
-    if args.preview:
-        print("Preview mode: Post was not published to WordPress")
-        return
-
-    # Update content piece status
-    if post_id and post_url:
-        update_content_piece_status(supabase, content_id, post_id, post_url)
-        print("WordPress Publisher Agent completed successfully")
-    else:
+    if not args.preview and not (post_id and post_url):
         print("Error: Failed to publish content to WordPress")
         sys.exit(1)
 